@@ -0,0 +1,108 @@
+"""
+Size and CPU cost of cache value codecs on Teleman-like station pages.
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_cache_codecs.py [--pages 200] [--cache path/to/cache.sqlite3]
+
+With --cache, samples `teleman:station:` pages from a real cache file instead of
+synthetic ones. "zlib-6" is the previous storage path (zlib level 6 for every value).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from tvguide_app.core.cache_codec import ValueCodec, train_zstd_dictionary, zstandard
+
+
+def _synthetic_pages(count: int) -> list[str]:
+    rnd = random.Random(7)
+    titles = ["Wiadomości", "Teleexpress", "M jak miłość", "Sport", "Pogoda", "Film fabularny"]
+    header = (
+        "<html><head><title>Program TV</title>" + "<script src='/s.js'></script>" * 40 + "</head>"
+    )
+    pages = []
+    for i in range(count):
+        rows = []
+        for j in range(rnd.randint(40, 80)):
+            rows.append(
+                f"<li class='item'><em>{j % 24:02d}:{rnd.choice(['00', '15', '30', '45'])}</em>"
+                f"<div class='detail'>"
+                f"<a href='/tv/{rnd.choice(titles).replace(' ', '-')}-{rnd.randint(1, 99999)}'>"
+                f"{rnd.choice(titles)}</a>"
+                f"<p class='genre'>{rnd.choice(['serial', 'film', 'news'])}</p></div></li>"
+            )
+        pages.append(
+            header + f"<body><ul class='station-{i}'>" + "".join(rows) + "</ul></body></html>"
+        )
+    return pages
+
+
+def _real_pages(path: Path, count: int) -> list[str]:
+    codec = ValueCodec()
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT value, codec, dict_id FROM cache_entries"
+        " WHERE key >= 'teleman:station:' AND key < 'teleman:station;' LIMIT ?",
+        (count,),
+    ).fetchall()
+    conn.close()
+    return [codec.decode(value, c, d) for value, c, d in rows if d is None]
+
+
+def _measure(label: str, pages: list[bytes], compress, decompress) -> None:
+    raw_total = sum(len(p) for p in pages)
+    t0 = time.perf_counter()
+    blobs = [compress(p) for p in pages]
+    t1 = time.perf_counter()
+    for b in blobs:
+        decompress(b)
+    t2 = time.perf_counter()
+    stored = sum(len(b) for b in blobs)
+    mb = raw_total / 1e6
+    print(
+        f"{label:11s} ratio={stored / raw_total:6.3f}  stored={stored / 1e6:7.2f} MB"
+        f"  compress={mb / (t1 - t0):7.1f} MB/s  decompress={mb / (t2 - t1):8.1f} MB/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--cache", type=Path)
+    args = parser.parse_args()
+
+    texts = _real_pages(args.cache, args.pages) if args.cache else _synthetic_pages(args.pages)
+    pages = [t.encode("utf-8") for t in texts]
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1e6:.2f} MB")
+
+    _measure("zlib-6", pages, lambda b: zlib.compress(b, 6), zlib.decompress)
+    if zstandard is None:
+        print("zstandard not installed; zstd rows skipped")
+        return
+
+    for level in (1, 3):
+        comp = zstandard.ZstdCompressor(level=level)
+        dec = zstandard.ZstdDecompressor()
+        _measure(f"zstd-{level}", pages, comp.compress, dec.decompress)
+
+    # Train on the first half, measure on the second half (pages not seen in training).
+    half = len(pages) // 2
+    data = train_zstd_dictionary(pages[:half])
+    if data is None:
+        print("dictionary training failed (too few samples)")
+        return
+    d = zstandard.ZstdCompressionDict(data)
+    comp = zstandard.ZstdCompressor(level=3, dict_data=d)
+    dec = zstandard.ZstdDecompressor(dict_data=d)
+    _measure("zstd-3+dict", pages[half:], comp.compress, dec.decompress)
+    _measure("zlib-6", pages[half:], lambda b: zlib.compress(b, 6), zlib.decompress)
+
+
+if __name__ == "__main__":
+    main()
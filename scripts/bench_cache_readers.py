@@ -0,0 +1,74 @@
+"""
+Read throughput of SqliteCache with N concurrent reader threads.
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_cache_readers.py [--entries 2000] [--seconds 2]
+
+The in-memory tier is disabled so every read reaches SQLite; compare the
+"pool" rows (read connection pool) with "single" (one connection + lock).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from tvguide_app.core.cache import SqliteCache
+
+
+def _fill(cache: SqliteCache, entries: int, value_size: int) -> list[str]:
+    keys = [f"bench:{i}" for i in range(entries)]
+    # Mix of small rows and large (compressed) pages, like real station pages.
+    for i, key in enumerate(keys):
+        size = value_size * 40 if i % 10 == 0 else value_size
+        cache.set_text(key, ("<li>Program %d</li>" % i) * (size // 20), ttl_seconds=3600)
+    return keys
+
+
+def _run(cache: SqliteCache, keys: list[str], threads: int, seconds: float) -> float:
+    counts = [0] * threads
+    stop = time.monotonic() + seconds
+
+    def worker(idx: int) -> None:
+        rnd = random.Random(idx)
+        n = 0
+        while time.monotonic() < stop:
+            cache.get_text(rnd.choice(keys))
+            n += 1
+        counts[idx] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return sum(counts) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--value-size", type=int, default=8000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite3"
+        seed = SqliteCache(path, memory_budget_bytes=0)
+        keys = _fill(seed, args.entries, args.value_size)
+        seed.close()
+
+        for label, readers in (("single", 0), ("pool", 8)):
+            cache = SqliteCache(path, memory_budget_bytes=0, read_connections=readers)
+            for threads in (1, 2, 4, 8):
+                rate = _run(cache, keys, threads, args.seconds)
+                print(f"{label:6s} threads={threads}: {rate:10.0f} reads/s")
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Per-request latency with a new thread per fetch (like the GUI's _run_in_thread).
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_http_pool.py [--url https://www.teleman.pl/] [--requests 20]
+
+"session-per-thread" is the previous behaviour (every thread opens its own TCP+TLS
+connection); "shared-pool" mounts the shared HttpTransport. Without --url a local
+HTTP server is used, which shows the overhead but not the TLS handshake cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from tvguide_app.core.http_transport import HttpTransport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on keep-alive.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b"x" * 20_000
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _run(url: str, count: int, new_session) -> list[float]:
+    timings: list[float] = []
+
+    def fetch() -> None:
+        sess = new_session()
+        t0 = time.perf_counter()
+        sess.get(url, timeout=30).raise_for_status()
+        timings.append(time.perf_counter() - t0)
+
+    for _ in range(count):
+        t = threading.Thread(target=fetch)
+        t.start()
+        t.join()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    transport = HttpTransport()
+    for label, factory in (
+        ("session-per-thread", requests.Session),
+        ("shared-pool", transport.new_session),
+    ):
+        timings = _run(url, args.requests, factory)
+        if not timings:
+            print(f"{label:18s} all requests failed")
+            continue
+        print(
+            f"{label:18s} median={statistics.median(timings) * 1000:7.2f} ms"
+            f"  p90={sorted(timings)[int(len(timings) * 0.9) - 1] * 1000:7.2f} ms"
+        )
+    for s in transport.stats():
+        print(f"  {s.host}: {s.requests} requests over {s.connections} connection(s)")
+    transport.close()
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+End-to-end provider benchmark on recorded HTTP traffic (no network needed to replay).
+
+Usage (from the repo root):
+  # once, with network: record what the providers fetch
+  PYTHONPATH=src python scripts/bench_providers.py record bench.cassette.gz [--days 2 --sources 5]
+  # any time, offline: replay with simulated latency/bandwidth
+  PYTHONPATH=src python scripts/bench_providers.py replay bench.cassette.gz \
+      [--latency-ms 40 --bandwidth-kbps 4000] [--pack-path DIR --entrypoint module:function]
+
+Each run uses a fresh cache, so every provider call goes through the transport. The
+same calls must be made when replaying as when recording (same --days/--sources, and
+the recording day as "today"), otherwise the cassette has no answer for them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.cassette import Cassette, CassetteTransport
+from tvguide_app.core.http import HttpClient
+from tvguide_app.core.providers.archive_base import ArchiveProvider
+from tvguide_app.core.providers.base import ScheduleProvider
+from tvguide_app.core.providers.fandom_archive import FandomArchiveProvider
+from tvguide_app.core.providers.polskieradio import PolskieRadioProvider
+from tvguide_app.core.providers.teleman import TelemanProvider
+from tvguide_app.core.rate_limit import HostPolicy, HostRateLimiter
+
+
+def _providers(
+    http: HttpClient, args: argparse.Namespace
+) -> list[ScheduleProvider | ArchiveProvider]:
+    if args.entrypoint:
+        if args.pack_path:
+            sys.path.insert(0, str(args.pack_path))
+        module_name, func_name = args.entrypoint.split(":", 1)
+        return list(getattr(importlib.import_module(module_name), func_name)(http))
+    return [
+        TelemanProvider(http),
+        PolskieRadioProvider(http),
+        FandomArchiveProvider(http, year=args.archive_year),
+    ]
+
+
+def _run_schedule(p: ScheduleProvider, args: argparse.Namespace) -> int:
+    sources = p.list_sources()[: args.sources]
+    days = p.list_days()[: args.days]
+    items = 0
+    for src in sources:
+        for d in days:
+            items += len(p.get_schedule(src, d))
+    return items
+
+
+def _run_archive(p: ArchiveProvider, args: argparse.Namespace) -> int:
+    items = 0
+    days = p.list_days_in_month(args.archive_year, args.archive_month)[: args.days]
+    for d in days:
+        for src in p.list_sources_for_day(d)[: args.sources]:
+            items += len(p.get_schedule(src, d))
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--archive-year", type=int, default=1990)
+    parser.add_argument("--archive-month", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0)
+    parser.add_argument("--pack-path", type=Path)
+    parser.add_argument(
+        "--entrypoint", help="provider pack entrypoint, e.g. pack_tv.providers:load"
+    )
+    args = parser.parse_args()
+
+    if args.mode == "record" and args.cassette.exists():
+        args.cassette.unlink()
+    cassette = Cassette(args.cassette)
+    transport = CassetteTransport(
+        cassette,
+        mode=args.mode,
+        latency_seconds=args.latency_ms / 1000,
+        bandwidth_bytes_per_second=args.bandwidth_kbps * 1000 / 8 or None,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SqliteCache(Path(tmp) / "cache.sqlite3")
+        # Recording keeps the real per-host limits; replaying measures the client, not politeness.
+        if args.mode == "record":
+            limiter = HostRateLimiter()
+        else:
+            limiter = HostRateLimiter(
+                {}, default=HostPolicy(requests_per_second=1e6, burst=10**6, max_concurrent=64)
+            )
+        http = HttpClient(
+            cache, user_agent="programista-bench/0.1", transport=transport, rate_limiter=limiter
+        )
+        print(f"{args.mode}: {args.cassette} ({len(cassette)} exchanges), today={date.today()}")
+        for p in _providers(http, args):
+            t0 = time.perf_counter()
+            if isinstance(p, ArchiveProvider):
+                items = _run_archive(p, args)
+            else:
+                items = _run_schedule(p, args)
+            elapsed = time.perf_counter() - t0
+            print(f"{p.provider_id:16s} items={items:6d}  {elapsed * 1000:9.1f} ms")
+        http.close()
+        cache.close()
+    if args.mode == "record":
+        print(f"saved {len(cassette)} exchanges, {args.cassette.stat().st_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Stored size and decode time of cached schedules: `schedule:v1` JSON vs `schedule:v2`.
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_schedule_codec.py [--days 14 --stations 200]
+
+The dataset is Teleman-like: ~45 items per station-day, titles repeating across days
+and stations. "v1" is the previous format (a list of dicts, "HH:MM" strings parsed
+back with a regex); "v2" is core.schedule_codec. Decode times are given from the JSON
+text (a read that misses the cache's memory tier) and from the already parsed object.
+A memory tier hit skips both: it keeps the decoded ScheduleDay. "v2 lazy" only asks
+for the day's accessibility features, without building ScheduleItem objects.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from typing import Any
+
+from tvguide_app.core.cache_codec import ValueCodec
+from tvguide_app.core.models import AccessibilityFeature, ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.schedule_codec import decode_schedule, encode_schedule
+from tvguide_app.core.util import parse_time_hhmm
+
+_TITLES = [
+    "Wiadomości", "Teleexpress", "Pogoda", "M jak miłość", "Klan", "Fakty", "Panorama",
+    "Dzień dobry TVN", "Pytanie na śniadanie", "Sport", "Na dobre i na złe", "Familiada",
+    "Koło fortuny", "Rolnik szuka żony", "Barwy szczęścia", "Ojciec Mateusz", "Film fabularny",
+]
+
+
+def _dataset(days: int, stations: int) -> list[tuple[Source, date, list[ScheduleItem]]]:
+    rnd = random.Random(7)
+    start_day = date(2024, 1, 1)
+    titles = _TITLES + [f"Serial {i}" for i in range(300)]
+    out = []
+    for s in range(stations):
+        source = Source(
+            provider_id=ProviderId("teleman"), id=SourceId(f"station-{s}"), name=f"Stacja {s}"
+        )
+        for d in range(days):
+            day = start_day + timedelta(days=d)
+            items = []
+            minute = 5 * 60
+            while minute < 24 * 60 - 30:
+                title = rnd.choice(titles)
+                episode = rnd.randint(1, 2000)
+                acc: tuple[AccessibilityFeature, ...] = ("AD", "N") if rnd.random() < 0.1 else ()
+                items.append(
+                    ScheduleItem(
+                        provider_id=ProviderId("teleman"),
+                        source=source,
+                        day=day,
+                        start_time=parse_time_hhmm(f"{minute // 60:02d}:{minute % 60:02d}"),
+                        end_time=None,
+                        title=title,
+                        subtitle=f"odc. {episode}" if rnd.random() < 0.6 else None,
+                        details_ref=f"/tv/{title.replace(' ', '-')}-{episode}",
+                        details_summary="serial obyczajowy" if rnd.random() < 0.5 else None,
+                        accessibility=acc,
+                    )
+                )
+                minute += rnd.choice((15, 20, 25, 30, 45, 60))
+            out.append((source, day, items))
+    return out
+
+
+def _v1_encode(items: list[ScheduleItem]) -> list[dict[str, Any]]:
+    return [
+        {
+            "start": it.start_time.strftime("%H:%M") if it.start_time else None,
+            "end": it.end_time.strftime("%H:%M") if it.end_time else None,
+            "title": it.title,
+            "subtitle": it.subtitle,
+            "details_ref": it.details_ref,
+            "details_summary": it.details_summary,
+            "accessibility": list(it.accessibility) if it.accessibility else [],
+        }
+        for it in items
+    ]
+
+
+def _v1_decode(data: Any, source: Source, day: date) -> list[ScheduleItem]:
+    items = []
+    for raw in data:
+        start_raw = raw.get("start")
+        end_raw = raw.get("end")
+        acc = tuple(x for x in raw.get("accessibility") or [] if x in ("AD", "JM", "N"))
+        items.append(
+            ScheduleItem(
+                provider_id=ProviderId(str(source.provider_id)),
+                source=source,
+                day=day,
+                start_time=parse_time_hhmm(start_raw) if start_raw else None,
+                end_time=parse_time_hhmm(end_raw) if end_raw else None,
+                title=str(raw.get("title") or ""),
+                subtitle=str(raw["subtitle"]) if raw.get("subtitle") is not None else None,
+                details_ref=str(raw["details_ref"]) if raw.get("details_ref") is not None else None,
+                details_summary=str(raw["details_summary"])
+                if raw.get("details_summary") is not None
+                else None,
+                accessibility=acc,  # type: ignore[arg-type]
+            )
+        )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--stations", type=int, default=200)
+    args = parser.parse_args()
+
+    dataset = _dataset(args.days, args.stations)
+    n_items = sum(len(items) for _s, _d, items in dataset)
+    print(f"{len(dataset)} station-days, {n_items} items")
+    codec = ValueCodec()
+
+    v1 = [(s, d, json.dumps(_v1_encode(items), ensure_ascii=False)) for s, d, items in dataset]
+    v2 = [(s, d, json.dumps(encode_schedule(items), ensure_ascii=False)) for s, d, items in dataset]
+    for label, docs in (("v1", v1), ("v2", v2)):
+        raw = sum(len(text.encode("utf-8")) for _s, _d, text in docs)
+        stored = sum(
+            codec.encode(f"schedule:{label}:tv:{i}", text).size_bytes
+            for i, (_s, _d, text) in enumerate(docs)
+        )
+        print(f"{label}: text={raw / 1e6:7.2f} MB  stored (cache codec)={stored / 1e6:6.2f} MB")
+
+    def bench(label: str, decode, docs, *, from_text: bool) -> None:
+        parsed = [(s, d, text if from_text else json.loads(text)) for s, d, text in docs]
+        t0 = time.perf_counter()
+        for source, day, data in parsed:
+            decode(json.loads(data) if from_text else data, source, day)
+        elapsed = time.perf_counter() - t0
+        print(
+            f"decode {label:20s} {elapsed * 1000:8.1f} ms  ({elapsed / n_items * 1e6:.2f} us/item)"
+        )
+
+    def v2_items(data: Any, source: Source, day: date) -> list[ScheduleItem]:
+        return decode_schedule(data, source, day).items()
+
+    def v2_lazy(data: Any, source: Source, day: date) -> frozenset[AccessibilityFeature]:
+        return decode_schedule(data, source, day).accessibility_features()
+
+    # "text": a read that misses the memory tier; "memory": get_json's already decoded object.
+    for from_text, where in ((True, "text"), (False, "memory")):
+        bench(f"v1 from {where}", _v1_decode, v1, from_text=from_text)
+        bench(f"v2 from {where}", v2_items, v2, from_text=from_text)
+        bench(f"v2 lazy from {where}", v2_lazy, v2, from_text=from_text)
+
+    for (_s, _d, items), (s, d, text) in zip(dataset, v2):
+        assert decode_schedule(json.loads(text), s, d).items() == items
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Memory held by two weeks of schedules for many stations, old vs new representation.
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_schedule_memory.py [--days 14 --stations 200]
+
+Uses the dataset of bench_schedule_codec.py. "before" replays how items used to be
+built: a dataclass without __slots__, a new time object per item and a Source copy per
+fetched day; the cache's memory tier kept the parsed `schedule:v2` JSON. "after" is the
+slotted ScheduleItem with shared times and interned sources, and the columnar
+ScheduleDay the memory tier now keeps. Sizes are tracemalloc totals.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from datetime import date
+from datetime import time as dtime
+from typing import Any, Callable
+
+from bench_schedule_codec import _dataset
+
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.providers.favorites import FavoritesProvider
+from tvguide_app.core.schedule_codec import decode_schedule, encode_schedule
+
+
+@dataclass(frozen=True)
+class _LegacySource:
+    provider_id: ProviderId
+    id: SourceId
+    name: str
+
+
+@dataclass(frozen=True)
+class _LegacyItem:
+    provider_id: ProviderId
+    source: _LegacySource
+    day: date
+    start_time: dtime | None
+    end_time: dtime | None
+    title: str
+    subtitle: str | None
+    details_ref: str | None
+    details_summary: str | None
+    accessibility: tuple[str, ...] = ()
+
+
+def _measure(label: str, build: Callable[[], Any], n_items: int) -> Any:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:34s} {size / 1e6:8.2f} MB  ({size / n_items:6.1f} B/item)")
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--stations", type=int, default=200)
+    args = parser.parse_args()
+
+    dataset = _dataset(args.days, args.stations)
+    n_items = sum(len(items) for _s, _d, items in dataset)
+    print(f"{len(dataset)} station-days, {n_items} items")
+    docs = [
+        (s, d, json.dumps(encode_schedule(items), ensure_ascii=False)) for s, d, items in dataset
+    ]
+
+    def legacy_items() -> list[list[_LegacyItem]]:
+        out = []
+        for source, day, text in docs:
+            legacy_source = _LegacySource(source.provider_id, source.id, source.name)
+            out.append(
+                [
+                    _LegacyItem(
+                        provider_id=it.provider_id,
+                        source=legacy_source,
+                        day=day,
+                        start_time=dtime(it.start_time.hour, it.start_time.minute)
+                        if it.start_time
+                        else None,
+                        end_time=dtime(it.end_time.hour, it.end_time.minute)
+                        if it.end_time
+                        else None,
+                        title=it.title,
+                        subtitle=it.subtitle,
+                        details_ref=it.details_ref,
+                        details_summary=it.details_summary,
+                        accessibility=it.accessibility,
+                    )
+                    for it in decode_schedule(json.loads(text), source, day)
+                ]
+            )
+        return out
+
+    def new_items() -> list[list[ScheduleItem]]:
+        out = []
+        for source, day, text in docs:
+            copy = Source(provider_id=source.provider_id, id=source.id, name=source.name)
+            out.append(decode_schedule(json.loads(text), copy, day).items())
+        return out
+
+    print("materialized items:")
+    _measure("  before (dataclass, copies)", legacy_items, n_items)
+    items = _measure("  after (slots, shared)", new_items, n_items)
+
+    print("memory tier, per cached day:")
+    _measure("  before (parsed JSON)", lambda: [json.loads(text) for _s, _d, text in docs], n_items)
+    _measure(
+        "  after (ScheduleDay)",
+        lambda: [decode_schedule(json.loads(text), s, d) for s, d, text in docs],
+        n_items,
+    )
+
+    favorite = Source(
+        provider_id=ProviderId("favorites"), id=SourceId("tv:teleman:x"), name="TV: x"
+    )
+    for label, wrap in (
+        (
+            "dataclasses.replace",
+            lambda it: replace(it, provider_id=ProviderId("favorites"), source=favorite),
+        ),
+        (
+            "FavoritesProvider._wrap_item",
+            lambda it: FavoritesProvider._wrap_item(it, source=favorite),
+        ),
+    ):
+        t0 = time.perf_counter()
+        for day_items in items:
+            [wrap(it) for it in day_items]
+        elapsed = time.perf_counter() - t0
+        print(
+            f"favorites wrap, {label:29s} {elapsed * 1000:7.1f} ms"
+            f"  ({elapsed / n_items * 1e6:.2f} us/item)"
+        )
+
+
+if __name__ == "__main__":
+    main()
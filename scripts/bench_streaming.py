@@ -0,0 +1,112 @@
+"""
+Whole-document vs streaming download+parse of a large XMLTV-like feed.
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_streaming.py [--programmes 60000]
+
+A local HTTP server sends the feed in chunks. "get_text" is the previous path
+(download everything, then ET.fromstring); "iter_text" streams it through
+iter_xml_elements and compresses it into the cache on the fly. Peak memory is
+measured with tracemalloc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.http import HttpClient
+from tvguide_app.core.rate_limit import HostRateLimiter
+from tvguide_app.core.streaming import iter_xml_elements
+
+
+def _feed(programmes: int) -> bytes:
+    rows = [
+        f'<programme start="2024010{1 + i % 7}{i % 24:02d}0000" channel="ch{i % 50}">'
+        f"<title>Program {i}</title><desc>Opis odcinka {i} – serial obyczajowy.</desc></programme>"
+        for i in range(programmes)
+    ]
+    return ('<?xml version="1.0" encoding="UTF-8"?><tv>' + "".join(rows) + "</tv>").encode("utf-8")
+
+
+def _serve(body: bytes) -> tuple[ThreadingHTTPServer, str]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            step = 256 * 1024
+            for i in range(0, len(body), step):
+                self.wfile.write(body[i : i + step])
+                time.sleep(0.01)  # a modest link: ~25 MB/s
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+
+
+def _whole(http: HttpClient, url: str) -> tuple[int, float | None]:
+    root = ET.fromstring(http.get_text(url, cache_key="bench:whole", ttl_seconds=3600))
+    first = None
+    count = 0
+    for _el in root.iter("programme"):
+        if first is None:
+            first = time.perf_counter()
+        count += 1
+    return count, first
+
+
+def _streamed(http: HttpClient, url: str) -> tuple[int, float | None]:
+    first = None
+    count = 0
+    chunks = http.iter_text(url, cache_key="bench:stream", ttl_seconds=3600)
+    for _el in iter_xml_elements(chunks, "programme"):
+        if first is None:
+            first = time.perf_counter()
+        count += 1
+    return count, first
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--programmes", type=int, default=60_000)
+    args = parser.parse_args()
+
+    body = _feed(args.programmes)
+    server, url = _serve(body)
+    print(f"feed: {len(body) / 1e6:.1f} MB, {args.programmes} programmes")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SqliteCache(Path(tmp) / "cache.sqlite3", memory_budget_bytes=0)
+        http = HttpClient(cache, user_agent="bench", rate_limiter=HostRateLimiter({}))
+        for label, fn in (("get_text", _whole), ("iter_text", _streamed)):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            count, first = fn(http, url)
+            total = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            ttfi = (first - t0) * 1000 if first else float("nan")
+            print(
+                f"{label:9s} items={count}  first item={ttfi:8.1f} ms  total={total * 1000:8.1f} ms"
+                f"  peak={peak / 1e6:7.1f} MB"
+            )
+        cache.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Teleman page parsing: BeautifulSoup ("soup") vs the lxml fast path ("lxml").
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_teleman_parser.py [--repeat 50] [--html saved-page.html ...]
+
+Without --html a Teleman-like station page is generated: page chrome (head, scripts,
+the 200-station nav#stations-index, footer) around a ul.stationItems with ~45
+programmes. Both engines must return the same result for every page.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from tvguide_app.core.providers.teleman import (
+    parse_teleman_station_schedule,
+    parse_teleman_stations,
+)
+
+
+def _synthetic_page(seed: int) -> str:
+    rnd = random.Random(seed)
+    head = (
+        "<head><title>Program TV</title>"
+        + "".join(
+            f"<script>var cfg{i} = {{a: {i}, b: 'x'}};</script>"
+            f"<link rel='stylesheet' href='/s{i}.css'>"
+            for i in range(20)
+        )
+        + "</head>"
+    )
+    nav = (
+        "<nav id='stations-index'><ul>"
+        + "".join(
+            f"<li><a href='/program-tv/stacje/Stacja-{i}'>"
+            f"<img src='/logo/{i}.png' alt=''> Stacja {i}</a></li>"
+            for i in range(200)
+        )
+        + "</ul></nav>"
+    )
+    items = []
+    minute = 5 * 60
+    for i in range(45):
+        desc = " ".join(
+            rnd.choice(["serial", "film", "obyczajowy", "Polska", "2024", "odc."])
+            for _ in range(12)
+        )
+        items.append(
+            f"<li id='prog{i}' class='{'' if i % 3 else 'now'}'>"
+            f"<em>{minute // 60:02d}:{minute % 60:02d}</em>"
+            f"<div class='image'><img src='/img/{i}.jpg' alt=''></div>"
+            f"<div class='detail'><a href='/tv/Program-{i}-{rnd.randint(1, 10**6)}'>Program {i}</a>"
+            f"<p class='genre'>serial obyczajowy</p><p>{desc}</p>"
+            f"<div class='icons'><span class='ad'>AD</span><span class='n'>N</span></div>"
+            f"</div></li>"
+        )
+        minute = min(minute + rnd.choice((15, 30, 45, 60)), 24 * 60 - 1)
+    ads = "".join(
+        f"<div class='ad-slot' id='ad{i}'><!-- ad --><iframe src='/ad/{i}'></iframe></div>"
+        for i in range(10)
+    )
+    footer = (
+        "<footer>"
+        + "".join(f"<a href='/info/{i}'>Informacje {i}</a>" for i in range(60))
+        + "</footer>"
+    )
+    main = f"<main><ul class='stationItems'>{''.join(items)}</ul></main>"
+    body = f"<body><header>{nav}</header>{ads}{main}{footer}</body>"
+    return f"<!DOCTYPE html><html lang='pl'>{head}{body}</html>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--html", type=Path, nargs="*", default=[])
+    args = parser.parse_args()
+
+    pages = [p.read_text(encoding="utf-8") for p in args.html] or [
+        _synthetic_page(seed) for seed in range(4)
+    ]
+    print(
+        f"{len(pages)} pages, {sum(len(p) for p in pages) / len(pages) / 1024:.0f} KiB on average"
+    )
+
+    for label, parse in (
+        ("station schedule", parse_teleman_station_schedule),
+        ("stations", parse_teleman_stations),
+    ):
+        results = {}
+        for engine in ("soup", "lxml"):
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                out = [parse(page, engine=engine) for page in pages]
+            elapsed = (time.perf_counter() - t0) / (args.repeat * len(pages))
+            results[engine] = elapsed
+            print(f"{label:17s} {engine:5s} {elapsed * 1000:7.2f} ms/page")
+            normalized = [[vars(x) if hasattr(x, "__dict__") else x for x in res] for res in out]
+            if engine == "soup":
+                expected = normalized
+            else:
+                assert normalized == expected, "engines disagree"
+        print(f"{label:17s} speedup {results['soup'] / results['lxml']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Cost of decoding a large response that declares no charset.
+
+Usage (from the repo root):
+  PYTHONPATH=src python scripts/bench_text_decoding.py [--mb 5]
+
+"apparent_encoding" is the previous path (requests runs charset detection over the
+whole body); "decode_body" sniffs the head and tries strict UTF-8 first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import requests
+
+from tvguide_app.core.text_encoding import decode_body
+
+
+def _payload(mb: float, encoding: str) -> bytes:
+    row = (
+        "<li><em>20:00</em><a href='/tv/wiadomosci'>Wiadomości</a>"
+        " – serial obyczajowy, Polska</li>\n"
+    )
+    text = "<html><body><ul>" + row * int(mb * 1e6 / len(row)) + "</ul></body></html>"
+    return text.encode(encoding)
+
+
+def _old(content: bytes) -> str:
+    resp = requests.Response()
+    resp._content = content  # noqa: SLF001
+    resp.headers["content-type"] = "text/html"
+    resp.encoding = "ISO-8859-1"
+    if resp.apparent_encoding:
+        resp.encoding = resp.apparent_encoding
+    return resp.text
+
+
+def _time(fn, content: bytes) -> tuple[float, str]:
+    t0 = time.perf_counter()
+    out = fn(content)
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for encoding in ("utf-8", "cp1250"):
+        content = _payload(args.mb, encoding)
+        old_s, old_text = _time(_old, content)
+        new_s, new_text = _time(lambda c: decode_body(c, content_type="text/html"), content)
+        same = "same text" if old_text == new_text else "TEXT DIFFERS"
+        print(
+            f"{encoding:7s} {len(content) / 1e6:5.1f} MB  apparent_encoding={old_s * 1000:8.1f} ms"
+            f"  decode_body={new_s * 1000:7.1f} ms  ({same})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from tvguide_app.core.archive_index import ArchiveIndex, last_ended_month
+from tvguide_app.core.models import Source
+from tvguide_app.core.providers.archive_base import ArchiveProvider
+from tvguide_app.core.search_index import SearchIndex
+
+# A month that fails is skipped; each failure in a row doubles the pause before the next one.
+_MAX_RETRY_DELAY_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class CrawlProgress:
+    months_done: int
+    months_total: int
+    year: int | None = None
+    month: int | None = None
+    finished: bool = False
+    # Why `month` failed (it is skipped and crawled again next time), or why the crawl
+    # could not start when no month is given.
+    error: str | None = None
+    # Months skipped so far because they failed.
+    skipped: int = 0
+
+
+class ArchiveCrawler:
+    """
+    Walks the whole archive (year → month → day → channel) on one background thread,
+    newest months first, and records what it finds in an ArchiveIndex; every programme
+    goes to the search index too. Requests go through the provider's HTTP client and so
+    share its per-host rate limit. Months already in the index are skipped, so a crawl
+    that was stopped (or the app closed) resumes where it ended; a month that fails is
+    left out and tried again on the next run.
+    """
+
+    def __init__(
+        self,
+        provider: ArchiveProvider,
+        index: ArchiveIndex,
+        *,
+        search_index: SearchIndex | None = None,
+        on_progress: Callable[[CrawlProgress], None] | None = None,
+        today: Callable[[], date] = date.today,
+        retry_delay_seconds: float = 5.0,
+    ) -> None:
+        self._provider = provider
+        self._index = index
+        self._search_index = search_index
+        self._on_progress = on_progress
+        self._today = today
+        self._retry_delay = max(0.0, float(retry_delay_seconds))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._restart = False
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._thread is not None:
+                if not self._stop.is_set():
+                    return False
+                # Still winding down after stop(): the thread crawls again once it has.
+                self._restart = True
+                return True
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run_thread, name="archive-crawler", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self, *, timeout: float | None = None) -> None:
+        with self._lock:
+            self._restart = False
+            self._stop.set()
+            thread = self._thread
+        if thread is not None and timeout is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def run(self) -> CrawlProgress:
+        """Crawls every month not in the index yet; returns the final progress."""
+        today = self._today()
+        pending = self._pending_months(today)
+        done = 0
+        skipped = 0
+        failures_in_row = 0
+        for year, month in pending:
+            if self._stop.is_set():
+                return CrawlProgress(done, len(pending), skipped=skipped)
+            try:
+                self._crawl_month(year, month)
+            except Exception as e:  # noqa: BLE001
+                if self._stop.is_set():
+                    return CrawlProgress(done, len(pending), skipped=skipped)
+                skipped += 1
+                failures_in_row += 1
+                error = str(e) or "Nieznany błąd."
+                self._report(
+                    CrawlProgress(done, len(pending), year, month, error=error, skipped=skipped)
+                )
+                delay = min(
+                    _MAX_RETRY_DELAY_SECONDS, self._retry_delay * 2 ** (failures_in_row - 1)
+                )
+                if self._stop.wait(delay):
+                    return CrawlProgress(done, len(pending), skipped=skipped)
+                continue
+            if self._stop.is_set():
+                # The month may be incomplete; it is crawled again next time.
+                return CrawlProgress(done, len(pending), skipped=skipped)
+            failures_in_row = 0
+            done += 1
+            self._report(CrawlProgress(done, len(pending), year, month, skipped=skipped))
+
+        if not skipped:
+            self._index.set_complete(last_ended_month(today))
+        progress = CrawlProgress(done, len(pending), finished=True, skipped=skipped)
+        self._report(progress)
+        return progress
+
+    def _run_thread(self) -> None:
+        while True:
+            try:
+                self.run()
+            except Exception as e:  # noqa: BLE001
+                # E.g. the year list could not be fetched; the next start() tries again.
+                self._report(CrawlProgress(0, 0, error=str(e) or "Nieznany błąd."))
+            with self._lock:
+                if not self._restart:
+                    self._thread = None
+                    return
+                self._restart = False
+                self._stop.clear()
+
+    def _pending_months(self, today: date) -> list[tuple[int, int]]:
+        # Only months that have ended: the current one may still get new pages.
+        last = last_ended_month(today)
+        return [
+            (year, month)
+            for year in sorted(self._provider.list_years(), reverse=True)
+            for month in range(12, 0, -1)
+            if (year, month) <= last and not self._index.is_month_crawled(year, month)
+        ]
+
+    def _crawl_month(self, year: int, month: int) -> None:
+        found: dict[date, list[Source]] = {}
+        for day in self._provider.list_days_in_month(year, month):
+            kept: list[Source] = []
+            for source in self._provider.list_sources_for_day(day):
+                if self._stop.is_set():
+                    return
+                items = self._provider.get_schedule(source, day)
+                if not items:
+                    continue
+                kept.append(source)
+                if self._search_index is not None:
+                    self._search_index.add_items("archive", items)
+            if kept:
+                found[day] = kept
+        if not self._stop.is_set():
+            self._index.record_month(year, month, found)
+
+    def _report(self, progress: CrawlProgress) -> None:
+        if self._on_progress is None:
+            return
+        try:
+            self._on_progress(progress)
+        except Exception:  # noqa: BLE001
+            pass
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time as time_module
+from datetime import date
+from pathlib import Path
+from typing import Mapping
+
+from tvguide_app.core.models import ProviderId, Source, SourceId
+
+
+class ArchiveIndex:
+    """
+    Local map of the archive built by the ArchiveCrawler: which months were crawled and
+    which days and channels have a schedule. Crawled months and the populated ones are
+    kept in memory, so the archive tree can ask about them on every redraw.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._init_schema()
+        self._crawled: set[tuple[int, int]] = set()
+        self._populated: set[tuple[int, int]] = set()
+        self._load_months()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM archive_sources")
+            self._conn.execute("DELETE FROM archive_months")
+            self._conn.execute("DELETE FROM archive_meta")
+            self._conn.commit()
+            self._crawled.clear()
+            self._populated.clear()
+
+    def is_month_crawled(self, year: int, month: int) -> bool:
+        with self._lock:
+            return (year, month) in self._crawled
+
+    def is_year_crawled(self, year: int) -> bool:
+        with self._lock:
+            return all((year, m) in self._crawled for m in range(1, 13))
+
+    def is_complete(self, today: date | None = None) -> bool:
+        """
+        True if a full crawl covered every month that has ended by `today`. Months that
+        end after that crawl are not in the index until the crawler has run again.
+        """
+        through = self._get_meta("complete_through")
+        if through is None:
+            return False
+        year, _, month = through.partition("-")
+        return (int(year), int(month)) >= last_ended_month(today or date.today())
+
+    def set_complete(self, through: tuple[int, int]) -> None:
+        """Records that every month up to `through` (year, month) is in the index."""
+        self._set_meta("complete_through", f"{through[0]:04d}-{through[1]:02d}")
+
+    def years(self) -> list[int]:
+        with self._lock:
+            return sorted({y for y, _m in self._populated})
+
+    def months(self, year: int) -> list[int]:
+        with self._lock:
+            return sorted(m for y, m in self._populated if y == year)
+
+    def days(self, year: int, month: int) -> list[date]:
+        prefix = f"{year:04d}-{month:02d}-"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT day FROM archive_sources WHERE day >= ? AND day < ? ORDER BY day",
+                (prefix + "00", prefix + "99"),
+            ).fetchall()
+        return [date.fromisoformat(str(r[0])) for r in rows]
+
+    def sources(self, day: date) -> list[Source]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT provider_id, source_id, name FROM archive_sources"
+                " WHERE day = ? ORDER BY seq",
+                (day.isoformat(),),
+            ).fetchall()
+        return [
+            Source(provider_id=ProviderId(str(pid)), id=SourceId(str(sid)), name=str(name))
+            for pid, sid, name in rows
+        ]
+
+    def record_month(
+        self, year: int, month: int, sources_by_day: Mapping[date, list[Source]]
+    ) -> None:
+        """Replaces what is known about a month; days without sources are not stored."""
+        prefix = f"{year:04d}-{month:02d}-"
+        rows = [
+            (d.isoformat(), seq, str(s.provider_id), str(s.id), s.name)
+            for d, sources in sources_by_day.items()
+            for seq, s in enumerate(sources)
+        ]
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM archive_sources WHERE day >= ? AND day < ?",
+                (prefix + "00", prefix + "99"),
+            )
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO archive_sources(day, seq, provider_id, source_id, name)
+                VALUES(?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO archive_months(year, month, days, crawled_at)
+                VALUES(?, ?, ?, ?)
+                """,
+                (year, month, len({r[0] for r in rows}), int(time_module.time())),
+            )
+            self._conn.commit()
+            self._crawled.add((year, month))
+            if rows:
+                self._populated.add((year, month))
+            else:
+                self._populated.discard((year, month))
+
+    def _get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM archive_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return str(row[0]) if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO archive_meta(key, value) VALUES(?, ?)",
+                (key, value),
+            )
+            self._conn.commit()
+
+    def _load_months(self) -> None:
+        with self._lock:
+            rows = self._conn.execute("SELECT year, month, days FROM archive_months").fetchall()
+            self._crawled = {(int(y), int(m)) for y, m, _d in rows}
+            self._populated = {(int(y), int(m)) for y, m, d in rows if int(d) > 0}
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archive_months (
+                  year INTEGER NOT NULL,
+                  month INTEGER NOT NULL,
+                  days INTEGER NOT NULL,
+                  crawled_at INTEGER NOT NULL,
+                  PRIMARY KEY(year, month)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archive_sources (
+                  day TEXT NOT NULL,
+                  seq INTEGER NOT NULL,
+                  provider_id TEXT NOT NULL,
+                  source_id TEXT NOT NULL,
+                  name TEXT NOT NULL,
+                  PRIMARY KEY(day, seq)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archive_meta (
+                  key TEXT PRIMARY KEY,
+                  value TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+
+def last_ended_month(today: date) -> tuple[int, int]:
+    """(year, month) of the month before `today`'s."""
+    if today.month == 1:
+        return today.year - 1, 12
+    return today.year, today.month - 1
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+from urllib.parse import urlsplit
+
+from tvguide_app.core.cache import StalePolicy
+from tvguide_app.core.http import HttpClient, HttpResponse
+
+T = TypeVar("T")
+
+
+class AsyncHttpClient:
+    """
+    asyncio front end for HttpClient. Fresh cache hits held in memory are answered on the
+    event loop; everything else (SQLite reads included) runs on a small thread pool behind
+    per-host asyncio semaphores sized from the rate limiter's policies. Hundreds of pending
+    fetches are then just waiting coroutines: they hold no thread until their host has a
+    free slot.
+
+    Use one instance per event loop.
+    """
+
+    def __init__(self, http: HttpClient, *, max_workers: int = 8) -> None:
+        self._http = http
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)), thread_name_prefix="async-http"
+        )
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def sync(self) -> HttpClient:
+        return self._http
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def get_response(
+        self,
+        url: str,
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> HttpResponse:
+        if cache_key and not force_refresh:
+            cached = self._http.fresh_response(url, cache_key, memory_only=True)
+            if cached is not None:
+                return cached
+        return await self._run(
+            url,
+            partial(
+                self._http.get_response,
+                url,
+                cache_key=cache_key,
+                ttl_seconds=ttl_seconds,
+                force_refresh=force_refresh,
+                timeout_seconds=timeout_seconds,
+                stale_policy=stale_policy,
+            ),
+        )
+
+    async def get_text(
+        self,
+        url: str,
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> str:
+        resp = await self.get_response(
+            url,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+        )
+        return resp.text
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> Any:
+        if (
+            cache_key
+            and not force_refresh
+            and self._http.fresh_response(url, cache_key, memory_only=True) is not None
+        ):
+            return self._http.get_json(url, cache_key=cache_key, ttl_seconds=ttl_seconds)
+        return await self._run(
+            url,
+            partial(
+                self._http.get_json,
+                url,
+                cache_key=cache_key,
+                ttl_seconds=ttl_seconds,
+                force_refresh=force_refresh,
+                timeout_seconds=timeout_seconds,
+                stale_policy=stale_policy,
+            ),
+        )
+
+    async def post_form_text(
+        self,
+        url: str,
+        data: dict[str, Any],
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> str:
+        if cache_key and not force_refresh:
+            cached = self._http.fresh_response(url, cache_key, memory_only=True)
+            if cached is not None:
+                return cached.text
+        return await self._run(
+            url,
+            partial(
+                self._http.post_form_text,
+                url,
+                data,
+                cache_key=cache_key,
+                ttl_seconds=ttl_seconds,
+                force_refresh=force_refresh,
+                timeout_seconds=timeout_seconds,
+                stale_policy=stale_policy,
+            ),
+        )
+
+    async def _run(self, url: str, fn: Callable[[], T]) -> T:
+        async with self._slot(url):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn)
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        sem = self._host_slots.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(max(1, self._http.host_policy(url).max_concurrent))
+            self._host_slots[host] = sem
+        return sem
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
 import threading
 import time
-import zlib
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
+
+from tvguide_app.core.cache_codec import (
+    CodecUnavailableError,
+    EncodedValue,
+    StreamEncoder,
+    ValueCodec,
+    train_zstd_dictionary,
+)
+from tvguide_app.core.cache_keys import cache_namespace
+from tvguide_app.core.sqlite_pool import ReadConnectionPool
+from tvguide_app.core.write_behind import WriteBehindQueue, WriteOp
+
+
+@dataclass(frozen=True)
+class StalePolicy:
+    # How long after expiry an entry may be served immediately while a background refresh runs.
+    stale_while_revalidate_seconds: int = 0
+    # How long after expiry an entry may be served when the upstream fails.
+    stale_if_error_seconds: int = 0
+
+    def allows_revalidate(self, entry: CacheEntry, now: int) -> bool:
+        return now - entry.expires_at <= self.stale_while_revalidate_seconds
+
+    def allows_error(self, entry: CacheEntry, now: int) -> bool:
+        return now - entry.expires_at <= self.stale_if_error_seconds
+
+
+NO_STALE = StalePolicy()
 
 
 @dataclass(frozen=True)
@@ -16,24 +45,269 @@ class CacheEntry:
     value: str
     fetched_at: int
     expires_at: int
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+
+    def is_expired(self, now: int | None = None) -> bool:
+        return self.expires_at <= (int(time.time()) if now is None else now)
+
+
+def content_hash(text: str) -> str:
+    return content_hash_bytes(text.encode("utf-8"))
+
+
+def content_hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class BackgroundRefresher:
+    """Runs at most one background refresh per cache key at a time."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: set[str] = set()
+
+    def submit(self, key: str, work: Callable[[], Any]) -> bool:
+        with self._lock:
+            if key in self._running:
+                return False
+            self._running.add(key)
+
+        def runner() -> None:
+            try:
+                work()
+            except Exception:  # noqa: BLE001
+                pass
+            finally:
+                with self._lock:
+                    self._running.discard(key)
+
+        threading.Thread(target=runner, daemon=True).start()
+        return True
+
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._running
+
+
+@dataclass(frozen=True)
+class EvictionResult:
+    entries: int
+    bytes: int
+
+
+@dataclass(frozen=True)
+class NamespaceStats:
+    namespace: str
+    entries: int
+    bytes: int
+    expired: int
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    memory_hits: int
+    memory_misses: int
+    memory_entries: int
+    memory_bytes: int
+    memory_budget_bytes: int
+
+
+_NOT_DECODED = object()
+
+T = TypeVar("T")
+
+
+class _MemoryItem:
+    __slots__ = ("entry", "json_value", "decoded", "size")
+
+    def __init__(self, entry: CacheEntry, size: int) -> None:
+        self.entry = entry
+        self.json_value: Any = _NOT_DECODED
+        self.decoded: Any = _NOT_DECODED
+        self.size = size
+
+
+class _MemoryTier:
+    """Bounded LRU of recently used entries (and their decoded JSON) in front of SQLite."""
+
+    def __init__(self, budget_bytes: int) -> None:
+        self._budget = max(0, int(budget_bytes))
+        # A single huge page should not flush everything else out of the tier.
+        self._max_item_bytes = self._budget // 4
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, _MemoryItem] = OrderedDict()
+        self._bytes = 0
+        # Bumped on every write; readers only populate the tier if no write happened
+        # between their SQLite read and the insert (otherwise they could resurrect old data).
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._budget > 0
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    def epoch(self) -> int:
+        with self._lock:
+            return self._epoch
+
+    def get(self, key: str) -> _MemoryItem | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def put(self, entry: CacheEntry, *, epoch: int | None = None) -> _MemoryItem | None:
+        if not self.enabled:
+            return None
+        size = _estimate_text_bytes(entry.value)
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return None
+            self._drop(entry.key)
+            if size > self._max_item_bytes:
+                return None
+            item = _MemoryItem(entry, size)
+            self._items[entry.key] = item
+            self._bytes += size
+            self._evict()
+            return item
+
+    def attach_json(self, item: _MemoryItem, value: Any) -> None:
+        with self._lock:
+            if self._items.get(item.entry.key) is not item or item.json_value is not _NOT_DECODED:
+                return
+            extra = 2 * _estimate_text_bytes(item.entry.value)
+            if item.size + extra > self._max_item_bytes:
+                return
+            item.json_value = value
+            item.size += extra
+            self._bytes += extra
+            self._evict()
+
+    def attach_decoded(self, item: _MemoryItem, value: Any) -> None:
+        with self._lock:
+            if self._items.get(item.entry.key) is not item or item.decoded is not _NOT_DECODED:
+                return
+            # Takes the place of the parsed JSON, which is usually several times larger.
+            extra = _estimate_text_bytes(item.entry.value)
+            if item.json_value is not _NOT_DECODED:
+                item.json_value = _NOT_DECODED
+                extra -= 2 * _estimate_text_bytes(item.entry.value)
+            if item.size + extra > self._max_item_bytes:
+                return
+            item.decoded = value
+            item.size += extra
+            self._bytes += extra
+            self._evict()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._items), self._bytes
+
+    def _drop(self, key: str) -> None:
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+
+    def _evict(self) -> None:
+        while self._bytes > self._budget and self._items:
+            _key, old = self._items.popitem(last=False)
+            self._bytes -= old.size
+
+
+def _estimate_text_bytes(text: str) -> int:
+    # Rough in-memory footprint; good enough for a byte budget.
+    return len(text) + 64
 
 
 class SqliteCache:
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        memory_budget_bytes: int = 32 * 1024 * 1024,
+        write_behind: bool = False,
+        read_connections: int = 4,
+        max_bytes: int | None = None,
+        namespace_quotas: dict[str, int] | None = None,
+        enforce_limits_every_bytes: int | None = None,
+        codec: ValueCodec | None = None,
+    ) -> None:
         self._path = path
+        self._codec = codec or ValueCodec()
+        self._max_bytes = max_bytes
+        self._namespace_quotas = dict(namespace_quotas or {})
+        # Limits are re-applied in the background once this many bytes were written since
+        # the last check (None = only when `enforce_limits()` is called).
+        self._enforce_every_bytes = enforce_limits_every_bytes
+        self._written_since_enforce = 0
+        self._written_lock = threading.Lock()
+        self._enforcing = False
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.RLock()
         self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        # Must come before WAL: once the journal mode is written, a new file keeps auto_vacuum=0.
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
         self._conn.execute("PRAGMA journal_mode=WAL;")
         self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._memory = _MemoryTier(memory_budget_bytes)
+        # Entries queued for the write-behind thread but not committed yet; reads see them.
+        self._pending: dict[str, _PendingWrite] = {}
+        self._pending_lock = threading.Lock()
+        # Last-access times are buffered here and written in batches, so reads stay read-only.
+        self._accessed: dict[str, int] = {}
+        self._accessed_lock = threading.Lock()
         self._init_schema()
+        self._writer = (
+            WriteBehindQueue(self._conn, self._lock, name="cache-writer") if write_behind else None
+        )
+        # Reads use their own connections so they neither serialize on the writer's lock
+        # nor on each other (0 = read through the writer connection).
+        self._readers = (
+            ReadConnectionPool(path, size=read_connections) if read_connections > 0 else None
+        )
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
 
     def close(self) -> None:
+        self._flush_access_times()
+        if self._writer is not None:
+            self._writer.close()
+        if self._readers is not None:
+            self._readers.close()
         with self._lock:
+            self._memory.clear()
             self._conn.close()
 
     def _init_schema(self) -> None:
         with self._lock:
+            self._enable_incremental_vacuum()
             self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS cache_entries (
@@ -50,72 +324,688 @@ class SqliteCache:
                 ON cache_entries(expires_at)
                 """
             )
+            # Columns added after the first release; older cache files are migrated in place.
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+            for column, decl in (
+                ("etag", "TEXT"),
+                ("last_modified", "TEXT"),
+                ("content_hash", "TEXT"),
+                ("size_bytes", "INTEGER"),
+                ("accessed_at", "INTEGER"),
+                # NULL codec: legacy row, zlib-compressed if stored as bytes.
+                ("codec", "TEXT"),
+                ("dict_id", "INTEGER"),
+                ("namespace", "TEXT"),
+            ):
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE cache_entries ADD COLUMN {column} {decl}")
+            if "namespace" not in existing:
+                keys = [row[0] for row in self._conn.execute("SELECT key FROM cache_entries")]
+                self._conn.executemany(
+                    "UPDATE cache_entries SET namespace = ? WHERE key = ?",
+                    [(cache_namespace(key), key) for key in keys],
+                )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_cache_entries_namespace
+                ON cache_entries(namespace)
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at
+                ON cache_entries(accessed_at)
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_dicts (
+                  id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  prefix TEXT NOT NULL,
+                  data BLOB NOT NULL,
+                  created_at INTEGER NOT NULL
+                )
+                """
+            )
             self._conn.commit()
+            for dict_id, prefix, data in self._conn.execute(
+                "SELECT id, prefix, data FROM cache_dicts"
+            ):
+                self._codec.add_dictionary(int(dict_id), prefix, bytes(data))
 
-    def prune_expired(self) -> int:
-        now = int(time.time())
+    def _enable_incremental_vacuum(self) -> None:
+        # Without auto_vacuum, deleted pages are only reused, never returned to the OS.
+        mode = self._conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if mode == 2:
+            return
+        has_tables = self._conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+        if has_tables:
+            # Existing files only switch modes after a full rebuild (one-time cost).
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def _release_free_pages(self) -> None:
+        # The pragma frees one page per step, and execute() steps a statement without result
+        # columns only once; executescript() runs it to the end. Callers have committed already.
+        self._conn.executescript("PRAGMA incremental_vacuum;")
+
+    def stats(self) -> CacheStats:
+        entries, used = self._memory.stats()
+        return CacheStats(
+            memory_hits=self._memory.hits,
+            memory_misses=self._memory.misses,
+            memory_entries=entries,
+            memory_bytes=used,
+            memory_budget_bytes=self._memory.budget_bytes,
+        )
+
+    def prune_expired(self, *, grace_seconds: int = 0) -> int:
+        # Entries with HTTP validators stay useful after expiry (a 304 revalidates them
+        # without a full download), so callers may keep them around for a grace period.
+        cutoff = int(time.time()) - max(0, int(grace_seconds))
+        self.flush()
         with self._lock:
-            cur = self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            cur = self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (cutoff,))
             self._conn.commit()
+            self._memory.clear()
             return cur.rowcount
 
     def clear(self) -> None:
+        self.flush()
+        with self._accessed_lock:
+            self._accessed.clear()
         with self._lock:
             self._conn.execute("DELETE FROM cache_entries")
             self._conn.commit()
+            self._memory.clear()
+            self._release_free_pages()
 
-    def get_text(self, key: str) -> str | None:
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Deletes every entry whose key starts with `prefix`; returns the number removed."""
+        if not prefix:
+            raise ValueError("Empty prefix; use clear() to drop everything.")
+        where, params = _prefix_clause(prefix)
+        return self._delete_where(where, params)
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """
+        Deletes a namespace (see `cache_namespace`) and its sub-namespaces, so
+        "teleman" covers "teleman:station" and "teleman:show".
+        """
+        lower = namespace + ":"
+        upper = namespace + ";"
+        return self._delete_where(
+            " WHERE namespace = ? OR (namespace >= ? AND namespace < ?)",
+            (namespace, lower, upper),
+        )
+
+    def _delete_where(self, where: str, params: tuple[str, ...]) -> int:
+        self.flush()
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM cache_entries{where}", params)
+            self._conn.commit()
+            self._memory.clear()
+            if cur.rowcount:
+                self._release_free_pages()
+            return cur.rowcount
+
+    def namespace_stats(self) -> list[NamespaceStats]:
+        """Entry count and stored size per namespace, largest first."""
+        self.flush()
         now = int(time.time())
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT namespace, COUNT(*), COALESCE(SUM({_SIZE_SQL}), 0),
+                       SUM(expires_at <= ?)
+                FROM cache_entries
+                GROUP BY namespace
+                ORDER BY 3 DESC
+                """,
+                (now,),
+            ).fetchall()
+        return [
+            NamespaceStats(
+                namespace=namespace or "",
+                entries=int(entries),
+                bytes=int(size),
+                expired=int(expired or 0),
+            )
+            for namespace, entries, size, expired in rows
+        ]
+
+    def disk_usage(self, prefix: str | None = None) -> int:
+        """Total stored payload size in bytes, optionally for keys starting with `prefix`."""
+        self.flush()
+        where, params = _prefix_clause(prefix)
         with self._lock:
             row = self._conn.execute(
-                "SELECT value, expires_at FROM cache_entries WHERE key = ?",
-                (key,),
+                f"SELECT COALESCE(SUM({_SIZE_SQL}), 0) FROM cache_entries{where}", params
             ).fetchone()
-            if not row:
-                return None
-            value, expires_at = row
-            if expires_at <= now:
-                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        return int(row[0])
+
+    def train_dictionary(
+        self,
+        prefix: str,
+        *,
+        max_samples: int = 400,
+        dict_size: int = 64 * 1024,
+    ) -> int | None:
+        """
+        Trains a zstd dictionary on cached values under `prefix` (e.g. Teleman station pages,
+        which share most of their markup) and uses it for new writes with that prefix.
+        Returns the dictionary id, or None if zstd is unavailable or there are too few samples.
+        """
+        if not self._codec.uses_zstd:
+            return None
+        self.flush()
+        where, params = _prefix_clause(prefix)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT value, codec, dict_id FROM cache_entries{where}
+                ORDER BY fetched_at DESC LIMIT ?
+                """,
+                (*params, int(max_samples)),
+            ).fetchall()
+        samples: list[bytes] = []
+        for value, codec, dict_id in rows:
+            try:
+                samples.append(self._codec.decode(value, codec, dict_id).encode("utf-8"))
+            except CodecUnavailableError:
+                continue
+        data = train_zstd_dictionary(samples, dict_size=dict_size)
+        if data is None:
+            return None
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO cache_dicts(prefix, data, created_at) VALUES(?, ?, ?)",
+                (prefix, data, int(time.time())),
+            )
+            self._conn.commit()
+            dict_id = int(cur.lastrowid)
+        self._codec.add_dictionary(dict_id, prefix, data)
+        return dict_id
+
+    def has_dictionary(self, prefix: str) -> bool:
+        return prefix in self._codec.dictionary_prefixes()
+
+    def enforce_limits(self) -> EvictionResult:
+        """
+        Evicts entries until every namespace quota and `max_bytes` are satisfied. Expired
+        entries go first, then the least recently used ones.
+        """
+        with self._written_lock:
+            self._written_since_enforce = 0
+        if self._max_bytes is None and not self._namespace_quotas:
+            return EvictionResult(0, 0)
+        self._flush_access_times()
+        self.flush()
+        entries = 0
+        freed = 0
+        with self._lock:
+            limits: list[tuple[str | None, int]] = list(self._namespace_quotas.items())
+            if self._max_bytes is not None:
+                limits.append((None, self._max_bytes))
+            for prefix, limit in limits:
+                n, size = self._evict_over_limit(prefix, max(0, int(limit)))
+                entries += n
+                freed += size
+            if entries:
                 self._conn.commit()
-                return None
-            if isinstance(value, (bytes, bytearray, memoryview)):
-                raw = bytes(value)
-                try:
-                    raw = zlib.decompress(raw)
-                except Exception:  # noqa: BLE001
-                    pass
-                return raw.decode("utf-8", errors="replace")
-            return str(value)
-
-    def set_text(self, key: str, value: str, *, ttl_seconds: int) -> None:
+                self._memory.clear()
+                self._release_free_pages()
+        return EvictionResult(entries, freed)
+
+    def _evict_over_limit(self, prefix: str | None, limit: int) -> tuple[int, int]:
+        where, params = _prefix_clause(prefix)
+        used = int(
+            self._conn.execute(
+                f"SELECT COALESCE(SUM({_SIZE_SQL}), 0) FROM cache_entries{where}", params
+            ).fetchone()[0]
+        )
+        excess = used - limit
+        if excess <= 0:
+            return 0, 0
         now = int(time.time())
-        expires_at = now + int(ttl_seconds)
-        payload: str | bytes
-        # Large HTML/JSON payloads can be several MB (e.g. TVP), making SQLite writes slow.
-        # Compress them to keep the UI responsive.
-        if len(value) >= 200_000:
-            payload = zlib.compress(value.encode("utf-8"), level=6)
-        else:
-            payload = value
+        victims: list[tuple[str]] = []
+        freed = 0
+        rows = self._conn.execute(
+            f"""
+            SELECT key, {_SIZE_SQL} FROM cache_entries{where}
+            ORDER BY expires_at > ?, COALESCE(accessed_at, fetched_at)
+            """,
+            (*params, now),
+        )
+        for key, size in rows:
+            victims.append((key,))
+            freed += int(size or 0)
+            if freed >= excess:
+                break
+        rows.close()
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+        return len(victims), freed
+
+    def get_text(self, key: str) -> str | None:
+        entry = self.get_entry(key)
+        if entry is None or entry.is_expired():
+            # Keep the row: its validators are needed for conditional revalidation.
+            return None
+        return entry.value
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        """Returns the stored entry even if it has already expired."""
+        item = self._lookup(key)
+        return item.entry if item is not None else None
+
+    def peek_entry(self, key: str) -> CacheEntry | None:
+        """The entry if it is queued for writing or in the memory tier; never reads SQLite."""
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            # A streamed value would have to be decompressed first.
+            return pending.entry if pending.streamed is None else None
+        item = self._memory.get(key)
+        return item.entry if item is not None else None
+
+    def _lookup(self, key: str) -> _MemoryItem | None:
+        item = self._lookup_uncounted(key)
+        if item is not None:
+            self._record_access(key)
+        return item
+
+    def _record_access(self, key: str) -> None:
+        with self._accessed_lock:
+            self._accessed[key] = int(time.time())
+            full = len(self._accessed) >= _ACCESS_FLUSH_THRESHOLD
+        if full:
+            self._flush_access_times()
+
+    def _flush_access_times(self) -> None:
+        with self._accessed_lock:
+            if not self._accessed:
+                return
+            batch = [(ts, key) for key, ts in self._accessed.items()]
+            self._accessed.clear()
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", batch)
+
+        if self._writer is not None:
+            self._writer.submit(write)
+            return
         with self._lock:
-            self._conn.execute(
+            write(self._conn)
+            self._conn.commit()
+
+    def _lookup_uncounted(self, key: str) -> _MemoryItem | None:
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return _MemoryItem(pending.read(self._codec), 0)
+
+        item = self._memory.get(key)
+        if item is not None:
+            return item
+
+        epoch = self._memory.epoch()
+        row = self._read_row(key)
+        if not row:
+            return None
+        value, fetched_at, expires_at, etag, last_modified, stored_hash, codec, dict_id = row
+        try:
+            text = self._codec.decode(value, codec, dict_id)
+        except CodecUnavailableError:
+            # E.g. a zstd row read by an install without zstandard: treat it as a miss.
+            return None
+        entry = CacheEntry(
+            key=key,
+            value=text,
+            fetched_at=int(fetched_at),
+            expires_at=int(expires_at),
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=stored_hash,
+        )
+        return self._memory.put(entry, epoch=epoch) or _MemoryItem(entry, 0)
+
+    def _read_row(self, key: str) -> tuple | None:
+        sql = """
+            SELECT value, fetched_at, expires_at, etag, last_modified, content_hash, codec, dict_id
+            FROM cache_entries WHERE key = ?
+        """
+        if self._readers is None:
+            with self._lock:
+                return self._conn.execute(sql, (key,)).fetchone()
+        with self._readers.connection() as conn:
+            return conn.execute(sql, (key,)).fetchone()
+
+    def set_text(
+        self,
+        key: str,
+        value: str,
+        *,
+        ttl_seconds: int,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        now = int(time.time())
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            fetched_at=now,
+            expires_at=now + int(ttl_seconds),
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash(value),
+        )
+        # Large HTML/JSON payloads can be several MB (e.g. TVP); compressed rows keep
+        # SQLite writes fast and the file small.
+        encoded = self._codec.encode(key, value)
+        self._write(entry, _upsert_op(entry, encoded))
+        self._count_written(encoded.size_bytes)
+
+    def set_bytes(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        ttl_seconds: int,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Stores a UTF-8 body (e.g. JSON) as it came off the wire, without decoding it to
+        text first. Like a streamed value, it is not kept in the memory tier.
+        """
+        now = int(time.time())
+        entry = CacheEntry(
+            key=key,
+            value="",
+            fetched_at=now,
+            expires_at=now + int(ttl_seconds),
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash_bytes(data),
+        )
+        encoded = self._codec.encode_bytes(key, data)
+        self._write(entry, _upsert_op(entry, encoded), streamed=encoded)
+        self._count_written(encoded.size_bytes)
+
+    def stream_writer(
+        self,
+        key: str,
+        *,
+        ttl_seconds: int,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheStreamWriter:
+        """
+        Writes a value chunk by chunk, compressing as data arrives. Nothing is stored until
+        `commit()`; the value is not kept in the memory tier.
+        """
+        return CacheStreamWriter(
+            self,
+            key,
+            self._codec.stream_encoder(key),
+            ttl_seconds=ttl_seconds,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def _commit_stream(self, entry: CacheEntry, encoded: EncodedValue) -> None:
+        self._write(entry, _upsert_op(entry, encoded), streamed=encoded)
+        self._count_written(encoded.size_bytes)
+
+    def _count_written(self, size: int) -> None:
+        if self._enforce_every_bytes is None:
+            return
+        with self._written_lock:
+            self._written_since_enforce += size
+            if self._enforcing or self._written_since_enforce < self._enforce_every_bytes:
+                return
+            self._enforcing = True
+        threading.Thread(target=self._enforce_limits_while_due, daemon=True).start()
+
+    def _enforce_limits_while_due(self) -> None:
+        # One thread at a time; writes made during a run are picked up by the next loop.
+        due = True
+        try:
+            while due:
+                self.enforce_limits()
+                with self._written_lock:
+                    due = self._written_since_enforce >= (self._enforce_every_bytes or 0)
+                    self._enforcing = due
+        except Exception:  # noqa: BLE001
+            with self._written_lock:
+                self._enforcing = False
+
+    def _write(
+        self,
+        entry: CacheEntry,
+        write: WriteOp,
+        *,
+        streamed: EncodedValue | None = None,
+    ) -> None:
+        """
+        `streamed` is the stored form of a value that only exists encoded (`entry.value` is
+        empty); such values stay out of the memory tier.
+        """
+        self._memory.invalidate(entry.key)
+        if self._writer is None:
+            with self._lock:
+                write(self._conn)
+                self._conn.commit()
+            self._write_through(entry, streamed)
+            return
+
+        pending = _PendingWrite(entry, streamed)
+        with self._pending_lock:
+            self._pending[entry.key] = pending
+        if streamed is None:
+            # Before queueing, so a failed write can take it back.
+            self._memory.put(entry)
+
+        def done(error: BaseException | None) -> None:
+            # Only now can pooled readers see the row; until then they read the old one.
+            with self._pending_lock:
+                ours = self._pending.get(entry.key) is pending
+                if ours:
+                    del self._pending[entry.key]
+            if error is not None:
+                # Not on disk after all: drop the write-through copy too.
+                self._memory.invalidate(entry.key)
+            elif ours:
+                self._write_through(entry, streamed)
+
+        self._writer.submit(write, on_done=done)
+
+    def _write_through(self, entry: CacheEntry, streamed: EncodedValue | None) -> None:
+        # A reader that took the epoch after the first invalidate may have read the row
+        # before the commit and put the old value back; the second bump fences it out.
+        self._memory.invalidate(entry.key)
+        if streamed is None:
+            # Write-through: the next read of this key is served from memory.
+            self._memory.put(entry)
+
+    def touch(
+        self,
+        key: str,
+        *,
+        ttl_seconds: int,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> bool:
+        """Extends the lifetime of an unchanged entry without rewriting its value."""
+        current = self.get_entry(key)
+        if current is None:
+            return False
+        now = int(time.time())
+        entry = replace(
+            current,
+            fetched_at=now,
+            expires_at=now + int(ttl_seconds),
+            etag=etag or current.etag,
+            last_modified=last_modified or current.last_modified,
+        )
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.execute(
                 """
-                INSERT INTO cache_entries(key, value, fetched_at, expires_at)
-                VALUES(?, ?, ?, ?)
-                ON CONFLICT(key) DO UPDATE SET
-                  value=excluded.value,
-                  fetched_at=excluded.fetched_at,
-                  expires_at=excluded.expires_at
+                UPDATE cache_entries SET
+                  fetched_at = ?,
+                  expires_at = ?,
+                  etag = COALESCE(?, etag),
+                  last_modified = COALESCE(?, last_modified)
+                WHERE key = ?
                 """,
-                (key, payload, now, expires_at),
+                (entry.fetched_at, entry.expires_at, etag, last_modified, key),
             )
-            self._conn.commit()
+
+        self._write(entry, write)
+        return True
 
     def get_json(self, key: str) -> Any | None:
-        text = self.get_text(key)
-        if text is None:
+        # The decoded object is shared between callers; treat it as read-only.
+        item = self._lookup(key)
+        if item is None or item.entry.is_expired():
             return None
-        return json.loads(text)
+        if item.json_value is not _NOT_DECODED:
+            return item.json_value
+        value = json.loads(item.entry.value)
+        self._memory.attach_json(item, value)
+        return value
+
+    def get_decoded(self, key: str, decode: Callable[[Any], T | None]) -> T | None:
+        """
+        `decode(get_json(key))`, with the result kept in the memory tier in place of the
+        parsed JSON. Every caller of a key must decode it the same way.
+        """
+        item = self._lookup(key)
+        if item is None or item.entry.is_expired():
+            return None
+        if item.decoded is not _NOT_DECODED:
+            return item.decoded
+        data = (
+            item.json_value if item.json_value is not _NOT_DECODED else json.loads(item.entry.value)
+        )
+        value = decode(data)
+        if value is not None:
+            self._memory.attach_decoded(item, value)
+        return value
 
     def set_json(self, key: str, value: Any, *, ttl_seconds: int) -> None:
         self.set_text(key, json.dumps(value, ensure_ascii=False), ttl_seconds=ttl_seconds)
+
+
+class _PendingWrite:
+    __slots__ = ("entry", "streamed")
+
+    def __init__(self, entry: CacheEntry, streamed: EncodedValue | None) -> None:
+        self.entry = entry
+        self.streamed = streamed
+
+    def read(self, codec: ValueCodec) -> CacheEntry:
+        if self.streamed is None:
+            return self.entry
+        # Streamed values are only decoded if read back before the writer commits them.
+        value = codec.decode(self.streamed.payload, self.streamed.codec, self.streamed.dict_id)
+        return replace(self.entry, value=value)
+
+
+class CacheStreamWriter:
+    def __init__(
+        self,
+        cache: SqliteCache,
+        key: str,
+        encoder: StreamEncoder,
+        *,
+        ttl_seconds: int,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        self._cache = cache
+        self._key = key
+        self._encoder = encoder
+        self._ttl_seconds = int(ttl_seconds)
+        self._etag = etag
+        self._last_modified = last_modified
+        # Same digest as content_hash(), computed incrementally.
+        self._hash = hashlib.blake2b(digest_size=16)
+        self._done = False
+
+    def write(self, text: str) -> None:
+        raw = text.encode("utf-8")
+        self._hash.update(raw)
+        self._encoder.write(raw)
+
+    def commit(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        now = int(time.time())
+        entry = CacheEntry(
+            key=self._key,
+            value="",
+            fetched_at=now,
+            expires_at=now + self._ttl_seconds,
+            etag=self._etag,
+            last_modified=self._last_modified,
+            content_hash=self._hash.hexdigest(),
+        )
+        self._cache._commit_stream(entry, self._encoder.finish())  # noqa: SLF001
+
+
+def _upsert_op(entry: CacheEntry, encoded: EncodedValue) -> WriteOp:
+    namespace = cache_namespace(entry.key)
+
+    def write(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            INSERT INTO cache_entries(
+              key, value, fetched_at, expires_at, etag, last_modified, content_hash,
+              size_bytes, accessed_at, codec, dict_id, namespace
+            )
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+              value=excluded.value,
+              fetched_at=excluded.fetched_at,
+              expires_at=excluded.expires_at,
+              etag=excluded.etag,
+              last_modified=excluded.last_modified,
+              content_hash=excluded.content_hash,
+              size_bytes=excluded.size_bytes,
+              accessed_at=excluded.accessed_at,
+              codec=excluded.codec,
+              dict_id=excluded.dict_id
+            """,
+            (
+                entry.key,
+                encoded.payload,
+                entry.fetched_at,
+                entry.expires_at,
+                entry.etag,
+                entry.last_modified,
+                entry.content_hash,
+                encoded.size_bytes,
+                entry.fetched_at,
+                encoded.codec,
+                encoded.dict_id,
+                namespace,
+            ),
+        )
+
+    return write
+
+
+# Rows written before size tracking have NULL size_bytes.
+_SIZE_SQL = "COALESCE(size_bytes, length(CAST(value AS BLOB)))"
+
+_ACCESS_FLUSH_THRESHOLD = 512
+
+
+def _prefix_clause(prefix: str | None) -> tuple[str, tuple[str, ...]]:
+    if not prefix:
+        return "", ()
+    # A key range (rather than LIKE) lets SQLite use the primary key index.
+    return " WHERE key >= ? AND key < ?", (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from tvguide_app.core.cache_keys import cache_namespace
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install programista[zstd]
+    zstandard = None
+
+
+CODEC_TEXT = "text"
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+CODEC_ZSTD_DICT = "zstd-dict"
+
+
+class CodecUnavailableError(RuntimeError):
+    pass
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+@dataclass(frozen=True)
+class EncodedValue:
+    payload: str | bytes
+    codec: str
+    dict_id: int | None = None
+
+    @property
+    def size_bytes(self) -> int:
+        if isinstance(self.payload, bytes):
+            return len(self.payload)
+        return len(self.payload.encode("utf-8"))
+
+
+class StreamEncoder:
+    """Compresses a value chunk by chunk, so it never has to exist in memory as a whole."""
+
+    def __init__(self, compressor: Any, codec: str, dict_id: int | None = None) -> None:
+        self._compressor = compressor
+        self._codec = codec
+        self._dict_id = dict_id
+        self._parts: list[bytes] = []
+        self.raw_bytes = 0
+
+    def write(self, raw: bytes) -> None:
+        self.raw_bytes += len(raw)
+        out = self._compressor.compress(raw)
+        if out:
+            self._parts.append(out)
+
+    def finish(self) -> EncodedValue:
+        self._parts.append(self._compressor.flush())
+        return EncodedValue(b"".join(self._parts), self._codec, self._dict_id)
+
+
+@dataclass
+class _Bucket:
+    # Moving average of compressed/raw size for a group of keys.
+    ratio: float = 0.5
+    skipped: int = 0
+
+
+@dataclass
+class _Dictionary:
+    dict_id: int
+    prefix: str
+    data: bytes
+    _compiled: Any = field(default=None, repr=False)
+
+    def compiled(self) -> Any:
+        if self._compiled is None:
+            self._compiled = zstandard.ZstdCompressionDict(self.data)
+        return self._compiled
+
+
+class ValueCodec:
+    """
+    Chooses how a cache value is stored. Values below `min_bytes` stay plain text; larger
+    ones are compressed (zstd when available, zlib otherwise) and kept compressed only if
+    that saves at least `min_saving`. Key groups that keep failing that test are probed
+    only occasionally, so incompressible data does not pay for compression on every write.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_bytes: int = 2048,
+        min_saving: float = 0.1,
+        zstd_level: int = 3,
+        zlib_level: int = 6,
+        use_zstd: bool = True,
+        probe_every: int = 16,
+    ) -> None:
+        self._min_bytes = max(0, int(min_bytes))
+        self._min_saving = float(min_saving)
+        self._zstd_level = int(zstd_level)
+        self._zlib_level = int(zlib_level)
+        self._use_zstd = bool(use_zstd) and zstandard is not None
+        self._probe_every = max(1, int(probe_every))
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+        self._dicts: dict[int, _Dictionary] = {}
+        self._dict_for_prefix: dict[str, int] = {}
+        self._local = threading.local()
+
+    @property
+    def uses_zstd(self) -> bool:
+        return self._use_zstd
+
+    def add_dictionary(self, dict_id: int, prefix: str, data: bytes) -> None:
+        with self._lock:
+            self._dicts[dict_id] = _Dictionary(dict_id, prefix, data)
+            current = self._dict_for_prefix.get(prefix)
+            if current is None or dict_id > current:
+                self._dict_for_prefix[prefix] = dict_id
+
+    def dictionary_prefixes(self) -> set[str]:
+        with self._lock:
+            return set(self._dict_for_prefix)
+
+    def encode(self, key: str, text: str) -> EncodedValue:
+        encoded = self.encode_bytes(key, text.encode("utf-8"))
+        if encoded.codec == CODEC_TEXT:
+            return EncodedValue(text, CODEC_TEXT)
+        return encoded
+
+    def encode_bytes(self, key: str, raw: bytes) -> EncodedValue:
+        """`encode` for a value that is already UTF-8; an uncompressed one stays bytes."""
+        if len(raw) < self._min_bytes:
+            return EncodedValue(raw, CODEC_TEXT)
+
+        bucket_name = cache_namespace(key)
+        with self._lock:
+            bucket = self._buckets.setdefault(bucket_name, _Bucket())
+            if bucket.ratio > 1.0 - self._min_saving and bucket.skipped < self._probe_every:
+                bucket.skipped += 1
+                return EncodedValue(raw, CODEC_TEXT)
+            bucket.skipped = 0
+
+        encoded = self._compress(key, raw)
+        ratio = len(encoded.payload) / len(raw)
+        with self._lock:
+            bucket.ratio = bucket.ratio * 0.75 + ratio * 0.25
+        if ratio > 1.0 - self._min_saving:
+            return EncodedValue(raw, CODEC_TEXT)
+        return encoded
+
+    def stream_encoder(self, key: str) -> StreamEncoder:
+        if not self._use_zstd:
+            return StreamEncoder(zlib.compressobj(self._zlib_level), CODEC_ZLIB)
+        dict_id = self._dictionary_for(key)
+        if dict_id is None:
+            cctx = zstandard.ZstdCompressor(level=self._zstd_level)
+            return StreamEncoder(cctx.compressobj(), CODEC_ZSTD)
+        cctx = zstandard.ZstdCompressor(
+            level=self._zstd_level, dict_data=self._dictionary(dict_id).compiled()
+        )
+        return StreamEncoder(cctx.compressobj(), CODEC_ZSTD_DICT, dict_id)
+
+    def decode(self, payload: Any, codec: str | None, dict_id: int | None = None) -> str:
+        if codec is None:
+            return _decode_legacy(payload)
+        if codec == CODEC_TEXT and isinstance(payload, str):
+            return payload
+        return self.decode_bytes(payload, codec, dict_id).decode("utf-8", errors="replace")
+
+    def decode_bytes(self, payload: Any, codec: str, dict_id: int | None = None) -> bytes:
+        """The stored value as UTF-8 bytes, without decoding it to text."""
+        if codec == CODEC_TEXT:
+            if isinstance(payload, str):
+                return payload.encode("utf-8")
+            return bytes(payload)
+        raw = bytes(payload)
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(raw)
+        if codec in (CODEC_ZSTD, CODEC_ZSTD_DICT):
+            if zstandard is None:
+                raise CodecUnavailableError("zstandard is not installed")
+            dec = self._decompressor(dict_id if codec == CODEC_ZSTD_DICT else None)
+            try:
+                return dec.decompress(raw)
+            except zstandard.ZstdError:
+                # Streamed values are written without a content size in the frame header.
+                return dec.decompressobj().decompress(raw)
+        raise CodecUnavailableError(f"Unknown cache codec: {codec}")
+
+    def _compress(self, key: str, raw: bytes) -> EncodedValue:
+        if not self._use_zstd:
+            return EncodedValue(zlib.compress(raw, level=self._zlib_level), CODEC_ZLIB)
+        dict_id = self._dictionary_for(key)
+        payload = self._compressor(dict_id).compress(raw)
+        if dict_id is None:
+            return EncodedValue(payload, CODEC_ZSTD)
+        return EncodedValue(payload, CODEC_ZSTD_DICT, dict_id)
+
+    def _dictionary_for(self, key: str) -> int | None:
+        with self._lock:
+            best: str | None = None
+            for prefix in self._dict_for_prefix:
+                if key.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                    best = prefix
+            return self._dict_for_prefix[best] if best is not None else None
+
+    # zstd (de)compressor objects are not thread-safe; keep one per thread and dictionary.
+    def _compressor(self, dict_id: int | None) -> Any:
+        cache = getattr(self._local, "compressors", None)
+        if cache is None:
+            cache = self._local.compressors = {}
+        comp = cache.get(dict_id)
+        if comp is None:
+            if dict_id is None:
+                comp = zstandard.ZstdCompressor(level=self._zstd_level)
+            else:
+                comp = zstandard.ZstdCompressor(
+                    level=self._zstd_level, dict_data=self._dictionary(dict_id).compiled()
+                )
+            cache[dict_id] = comp
+        return comp
+
+    def _decompressor(self, dict_id: int | None) -> Any:
+        cache = getattr(self._local, "decompressors", None)
+        if cache is None:
+            cache = self._local.decompressors = {}
+        dec = cache.get(dict_id)
+        if dec is None:
+            if dict_id is None:
+                dec = zstandard.ZstdDecompressor()
+            else:
+                dec = zstandard.ZstdDecompressor(dict_data=self._dictionary(dict_id).compiled())
+            cache[dict_id] = dec
+        return dec
+
+    def _dictionary(self, dict_id: int) -> _Dictionary:
+        with self._lock:
+            d = self._dicts.get(dict_id)
+        if d is None:
+            raise CodecUnavailableError(f"Missing compression dictionary {dict_id}")
+        return d
+
+
+def train_zstd_dictionary(samples: list[bytes], *, dict_size: int = 64 * 1024) -> bytes | None:
+    if zstandard is None or len(samples) < 8:
+        return None
+    try:
+        return zstandard.train_dictionary(dict_size, samples).as_bytes()
+    except zstandard.ZstdError:
+        return None
+
+
+def _decode_legacy(value: Any) -> str:
+    # Rows written before the codec column: large values were zlib-compressed bytes.
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        try:
+            raw = zlib.decompress(raw)
+        except Exception:  # noqa: BLE001
+            pass
+        return raw.decode("utf-8", errors="replace")
+    return str(value)
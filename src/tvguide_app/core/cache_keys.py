@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import re
+
+_VERSION_RE = re.compile(r"v\d+")
+
+
+def cache_namespace(key: str) -> str:
+    """
+    Groups cache keys for invalidation and size reporting, e.g.
+    "teleman:station:tvp1:2024-01-01" -> "teleman:station" and
+    "schedule:v1:tv:teleman:tvp1:2024-01-01" -> "schedule:v1:tv" (a version segment
+    does not count as a level).
+    """
+    parts = key.split(":", 3)
+    depth = 3 if len(parts) > 2 and _VERSION_RE.fullmatch(parts[1]) else 2
+    return ":".join(parts[:depth])
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from http.client import responses
+from pathlib import Path
+from typing import Any, Callable, Literal
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from tvguide_app.core.http_transport import HttpTransport, PoolStats
+
+CASSETTE_VERSION = 1
+
+CassetteMode = Literal["record", "replay"]
+
+# The stored body is already decoded, so these no longer describe it.
+_DROPPED_RESPONSE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+# Request headers worth keeping; the rest (User-Agent, Accept-*) are the same for every call.
+_KEPT_REQUEST_HEADERS = ("If-None-Match", "If-Modified-Since", "Content-Type")
+
+
+class CassetteMissError(requests.ConnectionError):
+    """Raised in replay mode for a request the cassette has no answer for."""
+
+
+@dataclass(frozen=True)
+class CassetteEntry:
+    method: str
+    url: str
+    # Encoded form data of a POST ("" for GETs).
+    request_body: str
+    request_headers: dict[str, str]
+    status: int
+    headers: dict[str, str]
+    content: bytes
+    # Time the real server took to answer, for reference when choosing replay latency.
+    elapsed_seconds: float = 0.0
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return (self.method, self.url, self.request_body)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "request_body": self.request_body,
+            "request_headers": self.request_headers,
+            "status": self.status,
+            "headers": self.headers,
+            "content": base64.b64encode(self.content).decode("ascii"),
+            "elapsed": round(self.elapsed_seconds, 4),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> CassetteEntry:
+        return cls(
+            method=str(data["method"]),
+            url=str(data["url"]),
+            request_body=str(data.get("request_body") or ""),
+            request_headers=dict(data.get("request_headers") or {}),
+            status=int(data["status"]),
+            headers=dict(data.get("headers") or {}),
+            content=base64.b64decode(data.get("content") or ""),
+            elapsed_seconds=float(data.get("elapsed") or 0.0),
+        )
+
+
+class Cassette:
+    """
+    Recorded HTTP exchanges in a gzip-compressed JSON-lines file. Repeated requests are
+    answered in recording order; once those run out the last answer is repeated.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: list[CassetteEntry] = []
+        self._by_key: dict[tuple[str, str, str], list[CassetteEntry]] = {}
+        self._played: dict[tuple[str, str, str], int] = {}
+        if self._path.exists():
+            self._load()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def add(self, entry: CassetteEntry) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self._by_key.setdefault(entry.key, []).append(entry)
+
+    def find(self, method: str, url: str, request_body: str = "") -> CassetteEntry | None:
+        key = (method.upper(), url, request_body)
+        with self._lock:
+            candidates = self._by_key.get(key)
+            if not candidates:
+                return None
+            idx = self._played.get(key, 0)
+            self._played[key] = idx + 1
+            return candidates[min(idx, len(candidates) - 1)]
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._played.clear()
+
+    def save(self) -> None:
+        with self._lock:
+            entries = list(self._entries)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry.to_json(), ensure_ascii=False) + "\n")
+        os.replace(tmp, self._path)
+
+    def _load(self) -> None:
+        with gzip.open(self._path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {header.get('version')!r}")
+            for line in f:
+                if line.strip():
+                    self.add(CassetteEntry.from_json(json.loads(line)))
+
+
+class RecordingAdapter(HTTPAdapter):
+    """A normal pooled adapter that also writes every exchange into a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._cassette = cassette
+
+    def send(
+        self, request: requests.PreparedRequest, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        started = time.monotonic()
+        resp = super().send(request, *args, **kwargs)
+        # Reading the body here keeps it replayable for streamed responses too.
+        content = resp.content
+        self._cassette.add(
+            CassetteEntry(
+                method=str(request.method or "GET").upper(),
+                url=str(request.url),
+                request_body=_request_body(request),
+                request_headers={
+                    name: str(request.headers[name])
+                    for name in _KEPT_REQUEST_HEADERS
+                    if name in request.headers
+                },
+                status=resp.status_code,
+                headers={
+                    k: v
+                    for k, v in resp.headers.items()
+                    if k.lower() not in _DROPPED_RESPONSE_HEADERS
+                },
+                content=content,
+                elapsed_seconds=time.monotonic() - started,
+            )
+        )
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers requests from a cassette without touching the network. `latency_seconds` is
+    added before the response starts and the body is delivered no faster than
+    `bandwidth_bytes_per_second`, also when it is streamed.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        latency_seconds: float = 0.0,
+        bandwidth_bytes_per_second: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        super().__init__()
+        self._cassette = cassette
+        self._latency = max(0.0, float(latency_seconds))
+        self._bandwidth = bandwidth_bytes_per_second
+        self._sleep = sleep
+
+    def send(
+        self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any
+    ) -> requests.Response:
+        method = str(request.method or "GET").upper()
+        entry = self._cassette.find(method, str(request.url), _request_body(request))
+        if entry is None:
+            raise CassetteMissError(
+                f"No recorded response for {method} {request.url}", request=request
+            )
+        if self._latency:
+            self._sleep(self._latency)
+
+        resp = requests.Response()
+        resp.status_code = entry.status
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = str(request.url)
+        resp.request = request
+        resp.connection = self
+        resp.reason = responses.get(entry.status, "")
+        # Session.send reads the body right away unless stream=True, as with a real adapter.
+        resp.raw = _ThrottledBody(entry.content, self._bandwidth, self._sleep)
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+class CassetteTransport(HttpTransport):
+    """
+    HttpTransport that records real traffic into `cassette` or replays it offline, so
+    providers and packs can be benchmarked end to end without a network.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        mode: CassetteMode = "replay",
+        latency_seconds: float = 0.0,
+        bandwidth_bytes_per_second: float | None = None,
+        pool_size: int = 4,
+    ) -> None:
+        super().__init__(pool_size=pool_size)
+        self._cassette = cassette
+        self._mode = mode
+        if mode == "record":
+            self._cassette_adapter: BaseAdapter = RecordingAdapter(
+                cassette, pool_connections=16, pool_maxsize=max(1, int(pool_size))
+            )
+        elif mode == "replay":
+            self._cassette_adapter = ReplayAdapter(
+                cassette,
+                latency_seconds=latency_seconds,
+                bandwidth_bytes_per_second=bandwidth_bytes_per_second,
+            )
+        else:
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+
+    @property
+    def cassette(self) -> Cassette:
+        return self._cassette
+
+    def new_session(self, headers: dict[str, str] | None = None) -> requests.Session:
+        sess = requests.Session()
+        if headers:
+            sess.headers.update(headers)
+        sess.mount("https://", self._cassette_adapter)
+        sess.mount("http://", self._cassette_adapter)
+        return sess
+
+    def stats(self) -> list[PoolStats]:
+        return []
+
+    def close(self) -> None:
+        self._cassette_adapter.close()
+        super().close()
+        if self._mode == "record":
+            self._cassette.save()
+
+
+class _ThrottledBody(io.RawIOBase):
+    def __init__(
+        self, content: bytes, bandwidth: float | None, sleep: Callable[[float], None]
+    ) -> None:
+        self._buf = io.BytesIO(content)
+        self._bandwidth = bandwidth
+        self._sleep = sleep
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._buf.read(size)
+        if data and self._bandwidth:
+            self._sleep(len(data) / self._bandwidth)
+        return data
+
+
+def _request_body(request: requests.PreparedRequest) -> str:
+    body = request.body
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return str(body)
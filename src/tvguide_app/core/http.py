@@ -1,13 +1,45 @@
 from __future__ import annotations
 
+import codecs
+import json
 import time
 import threading
+from urllib.parse import urlsplit
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterator, TypeVar
 
 import requests
 
-from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.cache import (
+    NO_STALE,
+    BackgroundRefresher,
+    CacheEntry,
+    SqliteCache,
+    StalePolicy,
+    content_hash,
+    content_hash_bytes,
+)
+from tvguide_app.core.http_transport import HttpTransport, PoolStats
+from tvguide_app.core.rate_limit import HostLimitStats, HostPolicy, HostRateLimiter
+from tvguide_app.core.retry import (
+    NO_RETRY,
+    CircuitBreaker,
+    CircuitStats,
+    RetryPolicy,
+    retry_after_seconds,
+)
+from tvguide_app.core.single_flight import SingleFlight, SingleFlightStats
+from tvguide_app.core.text_encoding import (
+    charset_from_content_type,
+    decode_body,
+    sniff_declared_encoding,
+)
+
+T = TypeVar("T")
+
+# Parse results are keyed by content, so they never go stale; this only bounds how long
+# results for pages nobody asks for any more are kept.
+_PARSED_TTL_SECONDS = 30 * 24 * 3600
 
 
 @dataclass(frozen=True)
@@ -15,23 +47,97 @@ class HttpResponse:
     url: str
     status_code: int
     text: str
+    from_cache: bool = False
+    # True when an expired cache entry was served (stale-while-revalidate / stale-if-error).
+    stale: bool = False
+    # The undecoded body of a network response fetched with `raw=True` (then `text` is empty).
+    content: bytes | None = None
 
 
 class HttpClient:
-    def __init__(self, cache: SqliteCache, *, user_agent: str) -> None:
+    def __init__(
+        self,
+        cache: SqliteCache,
+        *,
+        user_agent: str,
+        stale_policy: StalePolicy = NO_STALE,
+        transport: HttpTransport | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        # Form POSTs are only retried when the caller knows they are safe to repeat.
+        post_retry_policy: RetryPolicy = NO_RETRY,
+        circuit_breaker: CircuitBreaker | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
         self._cache = cache
+        self._transport = transport or HttpTransport()
+        self._limiter = rate_limiter or HostRateLimiter()
+        self._retry_policies = {"GET": retry_policy, "POST": post_retry_policy}
+        self._breaker = circuit_breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._encoding_hints: dict[str, str] = {}
         self._local = threading.local()
         self._session_headers = {
             "User-Agent": user_agent,
             "Accept-Language": "pl,en;q=0.8",
         }
+        self._stale_policy = stale_policy
+        self._refresher = BackgroundRefresher()
+        self._flight: SingleFlight[HttpResponse] = SingleFlight()
+
+    def coalescing_stats(self) -> SingleFlightStats:
+        return self._flight.stats()
+
+    def pool_stats(self) -> list[PoolStats]:
+        return self._transport.stats()
+
+    def rate_limit_stats(self) -> list[HostLimitStats]:
+        return self._limiter.stats()
+
+    def circuit_stats(self) -> list[CircuitStats]:
+        return self._breaker.stats()
+
+    def host_policy(self, url: str) -> HostPolicy:
+        return self._limiter.policy_for(url)
+
+    def fresh_response(
+        self,
+        url: str,
+        cache_key: str,
+        *,
+        memory_only: bool = False,
+    ) -> HttpResponse | None:
+        """
+        The cached response for `cache_key` if it has not expired; never touches the network.
+        With `memory_only`, only entries held in memory count (no SQLite read either).
+        """
+        entry = (
+            self._cache.peek_entry(cache_key) if memory_only else self._cache.get_entry(cache_key)
+        )
+        if entry is None or entry.is_expired():
+            return None
+        return HttpResponse(url=url, status_code=200, text=entry.value, from_cache=True)
+
+    def set_encoding_hint(self, host: str, encoding: str | None) -> None:
+        """
+        Encoding to assume for `host` when a response declares none (no charset in the
+        header, no BOM or meta tag), e.g. for a site known to serve windows-1250.
+        """
+        host = host.lower()
+        if encoding:
+            self._encoding_hints[host] = encoding
+        else:
+            self._encoding_hints.pop(host, None)
+
+    def close(self) -> None:
+        self._transport.close()
 
     def _get_session(self) -> requests.Session:
         # requests.Session is not guaranteed to be thread-safe, so keep one session per thread.
+        # Sessions are cheap: their connection pools are shared through the transport.
         sess = getattr(self._local, "session", None)
         if sess is None:
-            sess = requests.Session()
-            sess.headers.update(self._session_headers)
+            sess = self._transport.new_session(self._session_headers)
             self._local.session = sess
         return sess
 
@@ -43,20 +149,218 @@ class HttpClient:
         ttl_seconds: int | None = None,
         force_refresh: bool = False,
         timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
     ) -> str:
+        return self.get_response(
+            url,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+        ).text
+
+    def get_response(
+        self,
+        url: str,
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> HttpResponse:
+        return self._request(
+            "GET",
+            url,
+            None,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+        )
+
+    def get_bytes(self, url: str, *, timeout_seconds: float = 15.0) -> bytes:
+        """Raw body, with no text decoding at all (not cached)."""
+        resp = self._send("GET", url, None, {}, timeout_seconds)
+        resp.raise_for_status()
+        return resp.content
+
+    def iter_text(
+        self,
+        url: str,
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 30.0,
+        stale_policy: StalePolicy | None = None,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[str]:
+        """
+        Streams a GET response as decoded text chunks, for feeds too big to hold (and
+        parse) as one string; see core.streaming for incremental XML/JSON parsing.
+        With a cache key the body is compressed into the cache while it arrives and
+        stored once it has been read completely; a fresh cached copy is replayed instead.
+        """
+        policy = stale_policy or self._stale_policy
+        entry = self._cache.get_entry(cache_key) if cache_key else None
+        if entry is not None and not force_refresh and not entry.is_expired():
+            yield from _slices(entry.value, chunk_size)
+            return
+
+        headers = _conditional_headers(entry) if ttl_seconds is not None else {}
+        try:
+            resp = self._send("GET", url, None, headers, timeout_seconds, stream=True)
+            if resp.status_code != 304:
+                try:
+                    resp.raise_for_status()
+                except requests.HTTPError:
+                    resp.close()
+                    raise
+        except requests.RequestException:
+            if entry is not None and policy.allows_error(entry, int(time.time())):
+                yield from _slices(entry.value, chunk_size)
+                return
+            raise
+
+        with resp:
+            if resp.status_code == 304 and entry is not None:
+                if cache_key and ttl_seconds is not None:
+                    self._cache.touch(
+                        cache_key,
+                        ttl_seconds=ttl_seconds,
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
+                    )
+                yield from _slices(entry.value, chunk_size)
+                return
+
+            writer = None
+            if cache_key and ttl_seconds is not None:
+                writer = self._cache.stream_writer(
+                    cache_key,
+                    ttl_seconds=ttl_seconds,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+            decoder = None
+            for chunk in resp.iter_content(chunk_size):
+                if not chunk:
+                    continue
+                if decoder is None:
+                    decoder = self._stream_decoder(resp, chunk)
+                text = decoder.decode(chunk)
+                if text:
+                    if writer is not None:
+                        writer.write(text)
+                    yield text
+            tail = decoder.decode(b"", final=True) if decoder is not None else ""
+            if tail:
+                if writer is not None:
+                    writer.write(tail)
+                yield tail
+            # Only a completely read body is cached; an abandoned stream stores nothing.
+            if writer is not None:
+                writer.commit()
+
+    def get_json(
+        self,
+        url: str,
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> Any:
+        """
+        Decoded JSON. A fresh cached document is served from the cache's memory tier
+        without parsing it again; treat the result as read-only.
+        """
         if cache_key and not force_refresh:
-            cached = self._cache.get_text(cache_key)
+            cached = self._cache.get_json(cache_key)
+            if cached is not None:
+                return cached
+        resp = self._request(
+            "GET",
+            url,
+            None,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+            raw=True,
+        )
+        if resp.content is not None:
+            # Straight from the network: parse the bytes, the text is never decoded.
+            return json.loads(resp.content)
+        if cache_key and not resp.stale:
+            # Parse once through the cache so later calls share the decoded object.
+            cached = self._cache.get_json(cache_key)
             if cached is not None:
                 return cached
+        return json.loads(resp.text)
 
-        resp = self._get_session().get(url, timeout=timeout_seconds)
-        resp.raise_for_status()
-        _ensure_reasonable_text_encoding(resp)
-        text = resp.text
+    def get_parsed(
+        self,
+        url: str,
+        parser_fn: Callable[[str], T],
+        parser_version: int,
+        *,
+        encode: Callable[[T], Any] = lambda value: value,
+        decode: Callable[[Any], T] = lambda data: data,
+        data: dict[str, Any] | None = None,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> T:
+        """
+        `parser_fn(text)` of the page at `url` (a form POST when `data` is given), memoized
+        by the page's content hash in the cache: on disk as `encode(result)` JSON, and
+        decoded in the memory tier. An unchanged page is not parsed again, even after it
+        was refetched. `parser_fn` must be a named function; bump `parser_version` whenever
+        its output changes. The result is shared between callers; treat it as read-only.
+        """
+        resp = self._request(
+            "GET" if data is None else "POST",
+            url,
+            data,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+        )
+        parsed_key = (
+            f"parsed:{parser_fn.__module__}.{parser_fn.__qualname__}:"
+            f"{int(parser_version)}:{self._content_digest(cache_key, resp.text)}"
+        )
+        try:
+            cached = self._cache.get_decoded(parsed_key, decode)
+        except Exception:  # noqa: BLE001
+            # Unreadable memo (e.g. written by a buggy encoder): parse again.
+            cached = None
+        if cached is not None:
+            return cached
 
-        if cache_key and ttl_seconds is not None:
-            self._cache.set_text(cache_key, text, ttl_seconds=ttl_seconds)
-        return text
+        value = parser_fn(resp.text)
+        try:
+            self._cache.set_json(parsed_key, encode(value), ttl_seconds=_PARSED_TTL_SECONDS)
+        except Exception:  # noqa: BLE001
+            pass
+        return value
+
+    def _content_digest(self, cache_key: str | None, text: str) -> str:
+        # The cache already stores the hash of every entry; only hash uncached bodies.
+        entry = self._cache.get_entry(cache_key) if cache_key else None
+        if entry is not None and entry.content_hash and entry.value == text:
+            return entry.content_hash
+        return content_hash(text)
 
     def post_form_text(
         self,
@@ -67,33 +371,297 @@ class HttpClient:
         ttl_seconds: int | None = None,
         force_refresh: bool = False,
         timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
     ) -> str:
-        if cache_key and not force_refresh:
-            cached = self._cache.get_text(cache_key)
-            if cached is not None:
-                return cached
+        return self.post_form_response(
+            url,
+            data,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+        ).text
+
+    def post_form_response(
+        self,
+        url: str,
+        data: dict[str, Any],
+        *,
+        cache_key: str | None = None,
+        ttl_seconds: int | None = None,
+        force_refresh: bool = False,
+        timeout_seconds: float = 15.0,
+        stale_policy: StalePolicy | None = None,
+    ) -> HttpResponse:
+        return self._request(
+            "POST",
+            url,
+            data,
+            cache_key=cache_key,
+            ttl_seconds=ttl_seconds,
+            force_refresh=force_refresh,
+            timeout_seconds=timeout_seconds,
+            stale_policy=stale_policy,
+        )
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        *,
+        cache_key: str | None,
+        ttl_seconds: int | None,
+        force_refresh: bool,
+        timeout_seconds: float,
+        stale_policy: StalePolicy | None,
+        raw: bool = False,
+    ) -> HttpResponse:
+        policy = stale_policy or self._stale_policy
+        now = int(time.time())
+        entry = self._cache.get_entry(cache_key) if cache_key else None
+
+        if entry is not None and not force_refresh:
+            if not entry.is_expired(now):
+                return HttpResponse(url=url, status_code=200, text=entry.value, from_cache=True)
+            if ttl_seconds is not None and policy.allows_revalidate(entry, now):
+                self._refresher.submit(
+                    cache_key,
+                    lambda: self._fetch_once(
+                        method,
+                        url,
+                        data,
+                        cache_key=cache_key,
+                        ttl_seconds=ttl_seconds,
+                        timeout_seconds=timeout_seconds,
+                        entry=entry,
+                        force_refresh=True,
+                        raw=raw,
+                    ),
+                )
+                return HttpResponse(
+                    url=url, status_code=200, text=entry.value, from_cache=True, stale=True
+                )
+
+        try:
+            return self._fetch_once(
+                method,
+                url,
+                data,
+                cache_key=cache_key,
+                ttl_seconds=ttl_seconds,
+                timeout_seconds=timeout_seconds,
+                entry=entry if ttl_seconds is not None else None,
+                force_refresh=force_refresh,
+                raw=raw,
+            )
+        except requests.RequestException:
+            if entry is not None and policy.allows_error(entry, int(time.time())):
+                return HttpResponse(
+                    url=url, status_code=200, text=entry.value, from_cache=True, stale=True
+                )
+            raise
+
+    def _fetch_once(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        *,
+        cache_key: str | None,
+        ttl_seconds: int | None,
+        timeout_seconds: float,
+        entry: CacheEntry | None,
+        force_refresh: bool,
+        raw: bool = False,
+    ) -> HttpResponse:
+        """Runs `_fetch`, sharing one network request between identical concurrent calls."""
+
+        def fetch() -> HttpResponse:
+            if cache_key and not force_refresh:
+                # Another caller may have just finished the same fetch.
+                current = self._cache.get_entry(cache_key)
+                if current is not None and not current.is_expired():
+                    return HttpResponse(
+                        url=url, status_code=200, text=current.value, from_cache=True
+                    )
+            return self._fetch(
+                method,
+                url,
+                data,
+                cache_key=cache_key,
+                ttl_seconds=ttl_seconds,
+                timeout_seconds=timeout_seconds,
+                entry=entry,
+                raw=raw,
+            )
+
+        if cache_key:
+            flight_key = f"{method} {cache_key}"
+        elif method == "GET":
+            flight_key = f"GET {url}"
+        else:
+            # Uncached POSTs may differ in their form data; never merge them.
+            return fetch()
+        if force_refresh:
+            flight_key += " force"
+        if raw:
+            # Callers that want text must not be handed an undecoded response.
+            flight_key += " raw"
+        return self._flight.do(flight_key, fetch)
+
+    def _fetch(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        *,
+        cache_key: str | None,
+        ttl_seconds: int | None,
+        timeout_seconds: float,
+        entry: CacheEntry | None,
+        raw: bool = False,
+    ) -> HttpResponse:
+        # An expired (or force-refreshed) entry is still useful: its validators let the
+        # server answer with a bodyless 304 when the page has not changed.
+        headers = _conditional_headers(entry) if method == "GET" else {}
+
+        resp = self._send(method, url, data, headers, timeout_seconds)
+
+        if resp.status_code == 304 and entry is not None and cache_key and ttl_seconds is not None:
+            self._cache.touch(
+                cache_key,
+                ttl_seconds=ttl_seconds,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+            return HttpResponse(url=url, status_code=304, text=entry.value, from_cache=True)
 
-        resp = self._get_session().post(url, data=data, timeout=timeout_seconds)
         resp.raise_for_status()
-        _ensure_reasonable_text_encoding(resp)
-        text = resp.text
+        content = resp.content if raw else None
+        text = "" if content is not None else self._decode(resp)
 
         if cache_key and ttl_seconds is not None:
-            self._cache.set_text(cache_key, text, ttl_seconds=ttl_seconds)
-        return text
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            body_hash = content_hash_bytes(content) if content is not None else content_hash(text)
+            if entry is not None and entry.content_hash and entry.content_hash == body_hash:
+                # Same body as before (server without validators): skip rewriting the blob.
+                self._cache.touch(
+                    cache_key, ttl_seconds=ttl_seconds, etag=etag, last_modified=last_modified
+                )
+            elif content is not None:
+                # JSON is UTF-8; the cache keeps the bytes so the text is never decoded here.
+                self._cache.set_bytes(
+                    cache_key,
+                    content,
+                    ttl_seconds=ttl_seconds,
+                    etag=etag,
+                    last_modified=last_modified,
+                )
+            else:
+                self._cache.set_text(
+                    cache_key,
+                    text,
+                    ttl_seconds=ttl_seconds,
+                    etag=etag,
+                    last_modified=last_modified,
+                )
+        return HttpResponse(url=url, status_code=resp.status_code, text=text, content=content)
+
+    def _decode(self, resp: requests.Response) -> str:
+        host = (urlsplit(resp.url or "").hostname or "").lower()
+        return decode_body(
+            resp.content,
+            content_type=resp.headers.get("content-type"),
+            hint=self._encoding_hints.get(host)
+            or self._encoding_hints.get(host.removeprefix("www.")),
+        )
+
+    def _stream_decoder(
+        self, resp: requests.Response, first_chunk: bytes
+    ) -> codecs.IncrementalDecoder:
+        # No whole-body detection is possible here: declared encodings and the host hint
+        # decide, otherwise UTF-8.
+        host = (urlsplit(resp.url or "").hostname or "").lower()
+        encoding = (
+            charset_from_content_type(resp.headers.get("content-type"))
+            or sniff_declared_encoding(first_chunk)
+            or self._encoding_hints.get(host)
+            or self._encoding_hints.get(host.removeprefix("www."))
+            or "utf-8"
+        )
+        try:
+            return codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        headers: dict[str, str],
+        timeout_seconds: float,
+        *,
+        stream: bool = False,
+    ) -> requests.Response:
+        policy = self._retry_policies.get(method, NO_RETRY)
+        attempt = 0
+        while True:
+            attempt += 1
+            # Fails fast (CircuitOpenError) while the host is known to be down.
+            self._breaker.before_request(url)
+            sess = self._get_session()
+            try:
+                with self._limiter.slot(url):
+                    if method == "GET":
+                        resp = sess.get(
+                            url, headers=headers or None, timeout=timeout_seconds, stream=stream
+                        )
+                    else:
+                        resp = sess.post(url, data=data, timeout=timeout_seconds)
+            except (requests.ConnectionError, requests.Timeout):
+                self._breaker.record_failure(url)
+                if attempt >= policy.max_attempts:
+                    raise
+                self._sleep(policy.backoff(attempt))
+                continue
+
+            if resp.status_code >= 500:
+                self._breaker.record_failure(url)
+            else:
+                self._breaker.record_success(url)
+            if resp.status_code not in policy.retry_statuses or attempt >= policy.max_attempts:
+                return resp
+            wait = retry_after_seconds(resp.headers.get("Retry-After"))
+            if wait is None:
+                wait = policy.backoff(attempt)
+            elif wait > policy.max_retry_after_seconds:
+                return resp
+            # Give the pooled connection back; a streamed body would otherwise hold it.
+            resp.close()
+            self._sleep(wait)
 
     @staticmethod
     def polite_delay(seconds: float) -> None:
-        if seconds <= 0:
-            return
-        time.sleep(seconds)
+        # Kept for provider packs written against the old API. Requests are now paced
+        # per host by the rate limiter, so there is nothing to sleep for here.
+        return None
+
+
+def _conditional_headers(entry: CacheEntry | None) -> dict[str, str]:
+    if entry is None:
+        return {}
+    headers: dict[str, str] = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
 
 
-def _ensure_reasonable_text_encoding(resp: requests.Response) -> None:
-    content_type = (resp.headers.get("content-type") or "").lower()
-    if "charset=" in content_type:
-        return
-    # requests defaults to ISO-8859-1 for many text/* responses with missing charset;
-    # prefer detected encoding in that case to avoid mojibake (e.g. Polsat modules).
-    if (resp.encoding or "").lower() == "iso-8859-1" and resp.apparent_encoding:
-        resp.encoding = resp.apparent_encoding
+def _slices(text: str, size: int) -> Iterator[str]:
+    for i in range(0, len(text), max(1, size)):
+        yield text[i : i + size]
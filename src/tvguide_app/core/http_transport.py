@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    host: str
+    # Connections opened so far; with keep-alive this stays far below `requests`.
+    connections: int
+    requests: int
+    idle: int
+    maxsize: int
+
+
+class HttpTransport:
+    """
+    Connection pools shared by all `requests.Session`s mounted on it. Sessions stay per
+    thread (cookies and headers are not thread-safe), but the urllib3 pools behind them
+    are, so short-lived worker threads reuse keep-alive connections instead of opening a
+    new TCP+TLS connection per fetch.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = 4,
+        host_pool_sizes: dict[str, int] | None = None,
+        max_hosts: int = 16,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._default = self._adapter(pool_size, max_hosts)
+        self._hosts: dict[str, HTTPAdapter] = {
+            host: self._adapter(size, 2) for host, size in (host_pool_sizes or {}).items()
+        }
+        self._closed = False
+
+    @staticmethod
+    def _adapter(pool_size: int, pools: int) -> HTTPAdapter:
+        # pool_block=False: a burst above the pool size still goes through, the extra
+        # connections are just not kept afterwards.
+        return HTTPAdapter(pool_connections=max(1, pools), pool_maxsize=max(1, int(pool_size)))
+
+    def new_session(self, headers: dict[str, str] | None = None) -> requests.Session:
+        sess = requests.Session()
+        if headers:
+            sess.headers.update(headers)
+        sess.mount("https://", self._default)
+        sess.mount("http://", self._default)
+        for host, adapter in self._hosts.items():
+            sess.mount(f"https://{host}/", adapter)
+            sess.mount(f"http://{host}/", adapter)
+        return sess
+
+    def stats(self) -> list[PoolStats]:
+        out: list[PoolStats] = []
+        for adapter in (self._default, *self._hosts.values()):
+            out.extend(_adapter_stats(adapter))
+        return sorted(out, key=lambda s: s.host)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._default.close()
+        for adapter in self._hosts.values():
+            adapter.close()
+
+
+def _adapter_stats(adapter: HTTPAdapter) -> list[PoolStats]:
+    manager: Any = adapter.poolmanager
+    pools = manager.pools
+    out: list[PoolStats] = []
+    with pools.lock:
+        items = list(pools._container.items())  # noqa: SLF001
+    for _key, pool in items:
+        idle_queue = getattr(pool, "pool", None)
+        idle = 0
+        if idle_queue is not None:
+            # Unused slots are stored as None; only real connections count as idle.
+            with idle_queue.mutex:
+                idle = sum(1 for conn in idle_queue.queue if conn is not None)
+        out.append(
+            PoolStats(
+                host=f"{pool.scheme}://{pool.host}",
+                connections=int(getattr(pool, "num_connections", 0)),
+                requests=int(getattr(pool, "num_requests", 0)),
+                idle=idle,
+                maxsize=int(getattr(idle_queue, "maxsize", 0) or 0),
+            )
+        )
+    return out
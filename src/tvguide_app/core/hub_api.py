@@ -7,6 +7,7 @@ from datetime import date
 
 import requests
 
+from tvguide_app.core.rate_limit import HostRateLimiter
 from tvguide_app.core.search_index import SearchKind, SearchResult
 from tvguide_app.core.settings import SettingsStore
 
@@ -29,17 +30,23 @@ class HubClient:
         base_url: str = DEFAULT_HUB_BASE_URL,
         app_version: str = "0.0.0",
         user_agent: str = "programista/desktop",
+        rate_limiter: HostRateLimiter | None = None,
     ) -> None:
         self._settings = settings_store
         self._base_url = (base_url or DEFAULT_HUB_BASE_URL).rstrip("/")
         self._app_version = app_version
         self._session = requests.Session()
         self._session.headers.update({"User-Agent": user_agent})
+        self._limiter = rate_limiter or HostRateLimiter()
 
     @property
     def base_url(self) -> str:
         return self._base_url
 
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        with self._limiter.slot(url):
+            return self._session.post(url, **kwargs)
+
     def get_api_key(self) -> str | None:
         return self._settings.get_hub_api_key()
 
@@ -62,7 +69,7 @@ class HubClient:
             "platform": f"{platform.system()} {platform.release()} ({platform.machine()})",
         }
         try:
-            resp = self._session.post(
+            resp = self._post(
                 f"{self._base_url}/register",
                 json=payload,
                 timeout=10.0,
@@ -108,7 +115,7 @@ class HubClient:
         headers = {API_KEY_HEADER: api_key}
 
         try:
-            resp = self._session.post(
+            resp = self._post(
                 f"{self._base_url}/search",
                 json=payload,
                 headers=headers,
@@ -128,7 +135,7 @@ class HubClient:
                 resp.raise_for_status()
             headers = {API_KEY_HEADER: api_key}
             try:
-                resp = self._session.post(
+                resp = self._post(
                     f"{self._base_url}/search",
                     json=payload,
                     headers=headers,
@@ -229,7 +236,7 @@ class HubClient:
         payload = {"provider_id": provider_id, "details_ref": details_ref}
         headers = {API_KEY_HEADER: api_key}
 
-        resp = self._session.post(
+        resp = self._post(
             f"{self._base_url}/details",
             json=payload,
             headers=headers,
@@ -241,7 +248,7 @@ class HubClient:
             if not api_key:
                 return None
             headers = {API_KEY_HEADER: api_key}
-            resp = self._session.post(
+            resp = self._post(
                 f"{self._base_url}/details",
                 json=payload,
                 headers=headers,
@@ -16,14 +16,23 @@ ACCESSIBILITY_FEATURE_LABELS: dict[AccessibilityFeature, str] = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Source:
     provider_id: ProviderId
     id: SourceId
     name: str
 
 
-@dataclass(frozen=True)
+# Sources are few (one per station) but referenced by every schedule item.
+_SOURCES: dict[Source, Source] = {}
+
+
+def intern_source(source: Source) -> Source:
+    """The canonical instance equal to `source`, so equal sources share one object."""
+    return _SOURCES.setdefault(source, source)
+
+
+@dataclass(frozen=True, slots=True)
 class ScheduleItem:
     provider_id: ProviderId
     source: Source
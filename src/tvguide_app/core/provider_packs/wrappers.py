@@ -92,6 +92,18 @@ class CompositeScheduleProvider(ScheduleProvider):
             return []
         return p.get_schedule(source, day, force_refresh=force_refresh)
 
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        p = self._by_id.get(str(source.provider_id))
+        if not p:
+            return []
+        return await p.get_schedule_async(source, day, force_refresh=force_refresh)
+
     def get_item_details(self, item: ScheduleItem, *, force_refresh: bool = False) -> str:
         p = self._by_id.get(str(item.provider_id))
         if not p:
@@ -144,6 +156,15 @@ class ReloadableScheduleProvider(ScheduleProvider):
     ) -> list[ScheduleItem]:
         return self._get().get_schedule(source, day, force_refresh=force_refresh)
 
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        return await self._get().get_schedule_async(source, day, force_refresh=force_refresh)
+
     def get_item_details(self, item: ScheduleItem, *, force_refresh: bool = False) -> str:
         return self._get().get_item_details(item, force_refresh=force_refresh)
 
@@ -232,6 +253,18 @@ class CompositeArchiveProvider(ArchiveProvider):
             return []
         return p.get_schedule(source, day, force_refresh=force_refresh)
 
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        p = self._by_id.get(str(source.provider_id))
+        if not p:
+            return []
+        return await p.get_schedule_async(source, day, force_refresh=force_refresh)
+
 
 class ReloadableArchiveProvider(ArchiveProvider):
     def __init__(self, delegate: ArchiveProvider) -> None:
@@ -277,3 +310,12 @@ class ReloadableArchiveProvider(ArchiveProvider):
         force_refresh: bool = False,
     ) -> list[ScheduleItem]:
         return self._get().get_schedule(source, day, force_refresh=force_refresh)
+
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        return await self._get().get_schedule_async(source, day, force_refresh=force_refresh)
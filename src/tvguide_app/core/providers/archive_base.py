@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import date
 
@@ -39,3 +40,18 @@ class ArchiveProvider(ABC):
         force_refresh: bool = False,
     ) -> list[ScheduleItem]: ...
 
+    # Async variants; see ScheduleProvider.
+
+    async def list_sources_for_day_async(
+        self, day: date, *, force_refresh: bool = False
+    ) -> list[Source]:
+        return await asyncio.to_thread(self.list_sources_for_day, day, force_refresh=force_refresh)
+
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        return await asyncio.to_thread(self.get_schedule, source, day, force_refresh=force_refresh)
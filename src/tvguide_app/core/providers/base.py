@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import date
 
@@ -33,3 +34,21 @@ class ScheduleProvider(ABC):
     @abstractmethod
     def get_item_details(self, item: ScheduleItem, *, force_refresh: bool = False) -> str: ...
 
+    # Async variants. The defaults are the sync adapter: they run the blocking method in a
+    # worker thread, so existing packs work unchanged; a pack may override them with a
+    # native implementation on AsyncHttpClient.
+
+    async def list_sources_async(self, *, force_refresh: bool = False) -> list[Source]:
+        return await asyncio.to_thread(self.list_sources, force_refresh=force_refresh)
+
+    async def list_days_async(self, *, force_refresh: bool = False) -> list[date]:
+        return await asyncio.to_thread(self.list_days, force_refresh=force_refresh)
+
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        return await asyncio.to_thread(self.get_schedule, source, day, force_refresh=force_refresh)
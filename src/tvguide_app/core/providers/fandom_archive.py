@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import re
+import threading
+import time as time_module
+from collections import OrderedDict
 from datetime import date, time
+from functools import cached_property
 from urllib.parse import urlencode
 
+from tvguide_app.core.cache import content_hash
 from tvguide_app.core.http import HttpClient
 from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
 from tvguide_app.core.providers.archive_base import ArchiveProvider
 from tvguide_app.core.providers.base import ScheduleProvider
+from tvguide_app.core.providers.fandom_days import FandomDayIndex
+from tvguide_app.core.single_flight import SingleFlight
 from tvguide_app.core.util import (
     POLISH_MONTHS_GENITIVE,
     clean_text,
@@ -20,6 +27,22 @@ FANDOM_API = "https://staratelewizja.fandom.com/pl/api.php"
 MIN_ARCHIVE_YEAR = 1950
 DEFAULT_SINGLE_CHANNEL_SOURCE_NAME = "TVP 1"
 
+# The MediaWiki API limit for titles per query (for clients without apihighlimits).
+_TITLES_PER_QUERY = 50
+_WIKITEXT_TTL_SECONDS = 30 * 24 * 3600
+# Titles a batch fetch found missing are remembered for less time than page contents.
+_MISSING_WIKITEXT_TTL_SECONDS = 7 * 24 * 3600
+
+# The index of existing day pages is built once, then updated from the wiki's logs.
+_DAY_INDEX_KEY = "fandom:dayindex:v1"
+_DAY_INDEX_TTL_SECONDS = 365 * 24 * 3600
+_DAY_INDEX_REFRESH_SECONDS = 24 * 3600
+# Day page titles start with the day number ("1 Marca 1985", "01 Marca 1985").
+_DAY_TITLE_PREFIXES = tuple("0123456789")
+
+# Parsed day pages kept in memory, keyed by the hash of their wikitext (i.e. per revision).
+_DAY_PAGE_CACHE_SIZE = 32
+
 
 def date_to_fandom_page_title_candidates(d: date) -> list[str]:
     """
@@ -45,6 +68,12 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
     def __init__(self, http: HttpClient, *, year: int) -> None:
         self._http = http
         self._year = year
+        self._day_pages: OrderedDict[str, FandomDayPage] = OrderedDict()
+        self._day_pages_lock = threading.Lock()
+        self._day_index: FandomDayIndex | None = None
+        self._day_index_lock = threading.Lock()
+        self._day_index_updating = False
+        self._day_index_flight: SingleFlight[FandomDayIndex] = SingleFlight()
 
     @property
     def provider_id(self) -> str:
@@ -62,7 +91,14 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
         return self._year
 
     def list_years(self) -> list[int]:
-        # Keep a simple, deterministic year range; not all years have pages.
+        # Called from the GUI thread: use the day index only if it is already local.
+        index = self._day_index
+        if index is None:
+            cache = self._http._cache  # noqa: SLF001
+            index = FandomDayIndex.from_json(cache.get_json(_DAY_INDEX_KEY))
+        if index is not None and len(index):
+            return index.years()
+        # Not discovered yet; keep a simple, deterministic year range.
         current_year = date.today().year
         return list(range(MIN_ARCHIVE_YEAR, current_year + 1))
 
@@ -73,27 +109,7 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
         *,
         force_refresh: bool = False,
     ) -> list[date]:
-        existing: set[date] = set()
-        month_days = self._iter_month_days(year, month)
-
-        titles: list[str] = []
-        for d in month_days:
-            titles.extend(date_to_fandom_page_title_candidates(d))
-
-        for page in self._query_pages_info(
-            titles,
-            cache_scope=f"v2:{year}:{month:02d}",
-            force_refresh=force_refresh,
-        ):
-            if page.get("missing"):
-                continue
-            title = page.get("title")
-            if isinstance(title, str):
-                parsed = self._page_title_to_date(title)
-                if parsed:
-                    existing.add(parsed)
-
-        return sorted(existing)
+        return self._get_day_index(force_refresh=force_refresh).days_in_month(year, month)
 
     def list_sources(self, *, force_refresh: bool = False) -> list[Source]:
         year = self._year
@@ -110,37 +126,7 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
         return sources
 
     def list_days(self, *, force_refresh: bool = False) -> list[date]:
-        year = self._year
-        cache_key = f"fandom:days:v2:{year}"
-        cached = self._http._cache.get_json(cache_key) if not force_refresh else None  # noqa: SLF001
-        if isinstance(cached, list):
-            return [date.fromisoformat(x) for x in cached]
-
-        existing: set[date] = set()
-        for month in range(1, 13):
-            month_days = self._iter_month_days(year, month)
-            titles: list[str] = []
-            for d in month_days:
-                titles.extend(date_to_fandom_page_title_candidates(d))
-            for page in self._query_pages_info(
-                titles,
-                cache_scope=f"v2:{year}:{month:02d}",
-                force_refresh=force_refresh,
-            ):
-                if not page.get("missing"):
-                    title = page.get("title")
-                    if isinstance(title, str):
-                        parsed = self._page_title_to_date(title)
-                        if parsed:
-                            existing.add(parsed)
-
-        existing_sorted = sorted(existing)
-        self._http._cache.set_json(  # noqa: SLF001
-            cache_key,
-            [d.isoformat() for d in existing_sorted],
-            ttl_seconds=7 * 24 * 3600,
-        )
-        return existing_sorted
+        return self._get_day_index(force_refresh=force_refresh).days_in_year(self._year)
 
     def get_schedule(
         self,
@@ -149,16 +135,7 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
         *,
         force_refresh: bool = False,
     ) -> list[ScheduleItem]:
-        wikitext = self._get_day_wikitext(day, force_refresh=force_refresh)
-        items_text = extract_channel_schedule_from_wikitext(wikitext, source.name)
-        parsed: list[tuple[time | None, str, str | None, str]] = []
-        for entry in split_schedule_entries(items_text):
-            start, rest = parse_entry_start_and_rest(entry)
-            if not rest:
-                continue
-            title, subtitle = split_title_subtitle(rest)
-            parsed.append((start, title, subtitle, rest))
-
+        parsed = self._get_day_page(day, force_refresh=force_refresh).entries(source.name)
         items: list[ScheduleItem] = []
         for idx, (start, title, subtitle, rest) in enumerate(parsed):
             end_time = None
@@ -208,8 +185,7 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
         return days
 
     def list_sources_for_day(self, day: date, *, force_refresh: bool = False) -> list[Source]:
-        wikitext = self._get_day_wikitext(day, force_refresh=force_refresh)
-        channel_names = extract_channels_from_wikitext(wikitext)
+        channel_names = self._get_day_page(day, force_refresh=force_refresh).channels
         return [
             Source(
                 provider_id=ProviderId(self.provider_id),
@@ -219,10 +195,73 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
             for name in channel_names
         ]
 
+    def _get_day_page(self, day: date, *, force_refresh: bool) -> FandomDayPage:
+        # Opening several channels of one day parses the page once.
+        wikitext = self._get_day_wikitext(day, force_refresh=force_refresh)
+        key = content_hash(wikitext)
+        with self._day_pages_lock:
+            page = self._day_pages.get(key)
+            if page is not None:
+                self._day_pages.move_to_end(key)
+                return page
+        page = FandomDayPage(wikitext)
+        with self._day_pages_lock:
+            self._day_pages[key] = page
+            while len(self._day_pages) > _DAY_PAGE_CACHE_SIZE:
+                self._day_pages.popitem(last=False)
+        return page
+
+    def prefetch_month(self, year: int, month: int, *, force_refresh: bool = False) -> list[date]:
+        """
+        Loads the wikitext of every day page of a month into the cache with a few batched
+        queries (instead of a request per title variant and day). Returns the days that
+        have a page.
+        """
+        titles_by_day = {
+            d: date_to_fandom_page_title_candidates(d) for d in self._iter_month_days(year, month)
+        }
+        cache = self._http._cache  # noqa: SLF001
+        contents: dict[str, str] = {}
+        pending: list[str] = []
+        for titles in titles_by_day.values():
+            for n, title in enumerate(titles):
+                cached = cache.get_text(f"fandom:wikitext:{title}") if not force_refresh else None
+                if cached is None:
+                    pending.extend(titles[n:])
+                    break
+                contents[title] = cached
+                if cached:
+                    break
+
+        if pending:
+            fetched = self._fetch_wikitexts(pending)
+            for title in pending:
+                content = fetched.get(title, "")
+                cache.set_text(
+                    f"fandom:wikitext:{title}",
+                    content,
+                    ttl_seconds=_WIKITEXT_TTL_SECONDS if content else _MISSING_WIKITEXT_TTL_SECONDS,
+                )
+                contents[title] = content
+
+        return [d for d, titles in titles_by_day.items() if any(contents.get(t) for t in titles)]
+
     def _get_day_wikitext(self, day: date, *, force_refresh: bool) -> str:
+        candidates = date_to_fandom_page_title_candidates(day)
+        cache = self._http._cache  # noqa: SLF001
+        if not force_refresh:
+            for title in candidates:
+                cached = cache.get_text(f"fandom:wikitext:{title}")
+                if cached is None:
+                    # Days of a month are usually opened one after another; load them all at once.
+                    self.prefetch_month(day.year, day.month)
+                    break
+                if cached:
+                    break
+
         # Prefer titles with leading zeros (common on this wiki), but fall back
         # to a non-zero variant if needed.
-        for title in date_to_fandom_page_title_candidates(day):
+        for title in candidates:
             wikitext = self._get_page_wikitext(title, force_refresh=force_refresh)
             if wikitext:
                 return wikitext
@@ -353,37 +392,186 @@ class FandomArchiveProvider(ScheduleProvider, ArchiveProvider):
         content = revs[0].get("slots", {}).get("main", {}).get("content")
         if not isinstance(content, str):
             return ""
-        self._http._cache.set_text(cache_key, content, ttl_seconds=30 * 24 * 3600)  # noqa: SLF001
+        cache = self._http._cache  # noqa: SLF001
+        cache.set_text(cache_key, content, ttl_seconds=_WIKITEXT_TTL_SECONDS)
         return content
 
-    def _query_pages_info(
-        self,
-        titles: list[str],
-        *,
-        cache_scope: str,
-        force_refresh: bool,
-    ) -> list[dict]:
-        pages: list[dict] = []
-        batch_size = 50
-        for i in range(0, len(titles), batch_size):
-            batch = titles[i : i + batch_size]
+    def _fetch_wikitexts(self, titles: list[str]) -> dict[str, str]:
+        """Current wikitext of each existing page among `titles`, following redirects."""
+        contents: dict[str, str] = {}
+        for i in range(0, len(titles), _TITLES_PER_QUERY):
+            batch = titles[i : i + _TITLES_PER_QUERY]
+            aliases: dict[str, str] = {}
+            by_title: dict[str, str] = {}
+            cont: dict[str, str] = {}
+            while True:
+                query = {
+                    "action": "query",
+                    "format": "json",
+                    "redirects": 1,
+                    "prop": "revisions",
+                    "rvprop": "content",
+                    "rvslots": "main",
+                    "formatversion": 2,
+                    "titles": "|".join(batch),
+                    **cont,
+                }
+                # Not cached as a whole: the per-title entries filled from it are.
+                data = json_loads(self._http.get_text(f"{FANDOM_API}?{urlencode(query)}"))
+                q = data.get("query", {})
+                for alias in (*q.get("normalized", []), *q.get("redirects", [])):
+                    if isinstance(alias.get("from"), str) and isinstance(alias.get("to"), str):
+                        aliases[alias["from"]] = alias["to"]
+                for page in q.get("pages", []):
+                    revs = page.get("revisions") or []
+                    content = (
+                        revs[0].get("slots", {}).get("main", {}).get("content") if revs else None
+                    )
+                    if isinstance(page.get("title"), str) and isinstance(content, str):
+                        by_title[page["title"]] = content
+
+                # Large batches come back in parts ("rvcontinue").
+                next_cont = data.get("continue")
+                if not isinstance(next_cont, dict) or not next_cont:
+                    break
+                cont = {str(k): str(v) for k, v in next_cont.items()}
+
+            for title in batch:
+                target = title
+                for _ in range(5):  # normalized -> redirect -> (double) redirect
+                    if target not in aliases:
+                        break
+                    target = aliases[target]
+                if target in by_title:
+                    contents[title] = by_title[target]
+        return contents
+
+    def _get_day_index(self, *, force_refresh: bool) -> FandomDayIndex:
+        # The lock only guards the in-memory index; the network work runs outside it so a
+        # slow listing never blocks callers that already have an index to serve.
+        with self._day_index_lock:
+            index = self._day_index
+            if index is None:
+                cached = self._http._cache.get_json(_DAY_INDEX_KEY)  # noqa: SLF001
+                index = FandomDayIndex.from_json(cached)
+                if index is not None and index.timestamp is not None:
+                    self._day_index = index
+        if index is None or index.timestamp is None:
+            # Everyone waiting for the first index shares a single walk over all pages.
+            return self._day_index_flight.do(
+                "build", lambda: self._store_day_index(self._build_day_index())
+            )
+        age = time_module.time() - index.checked_at
+        if not force_refresh and age <= _DAY_INDEX_REFRESH_SECONDS:
+            return index
+        with self._day_index_lock:
+            if self._day_index_updating:
+                # Another caller is already applying the log; serve the index we have.
+                return index
+            self._day_index_updating = True
+        try:
+            return self._store_day_index(self._update_day_index(index))
+        except Exception:  # noqa: BLE001
+            # Keep serving the index we have; the next call tries again.
+            return index
+        finally:
+            with self._day_index_lock:
+                self._day_index_updating = False
+
+    def _store_day_index(self, index: FandomDayIndex) -> FandomDayIndex:
+        with self._day_index_lock:
+            self._http._cache.set_json(  # noqa: SLF001
+                _DAY_INDEX_KEY,
+                index.to_json(),
+                ttl_seconds=_DAY_INDEX_TTL_SECONDS,
+            )
+            self._day_index = index
+        return index
+
+    def _build_day_index(self) -> FandomDayIndex:
+        # One listing of all titles that start with a digit covers every year; the
+        # timestamp of its first request is where later log updates start from.
+        index = FandomDayIndex()
+        for prefix in _DAY_TITLE_PREFIXES:
+            cont: dict[str, str] = {}
+            while True:
+                query = {
+                    "action": "query",
+                    "format": "json",
+                    "formatversion": 2,
+                    "list": "allpages",
+                    "apnamespace": 0,
+                    "apprefix": prefix,
+                    "aplimit": "max",
+                    "curtimestamp": 1,
+                    **cont,
+                }
+                data = json_loads(self._http.get_text(f"{FANDOM_API}?{urlencode(query)}"))
+                if index.timestamp is None and isinstance(data.get("curtimestamp"), str):
+                    index.timestamp = data["curtimestamp"]
+                for page in data.get("query", {}).get("allpages", []):
+                    d = self._day_page_title_to_date(page.get("title"))
+                    if d:
+                        index.add(d)
+                next_cont = data.get("continue")
+                if not isinstance(next_cont, dict) or not next_cont:
+                    break
+                cont = {str(k): str(v) for k, v in next_cont.items()}
+        index.checked_at = time_module.time()
+        return index
+
+    def _update_day_index(self, index: FandomDayIndex) -> FandomDayIndex:
+        """Applies page creations, deletions and moves logged since the index was built."""
+        updated = index.copy()
+        cont: dict[str, str] = {}
+        while True:
             query = {
                 "action": "query",
                 "format": "json",
-                "prop": "info",
                 "formatversion": 2,
-                "titles": "|".join(batch),
+                "list": "logevents",
+                "lenamespace": 0,
+                "leprop": "title|type|details",
+                "ledir": "newer",
+                "lestart": index.timestamp,
+                "lelimit": "max",
+                "curtimestamp": 1,
+                **cont,
             }
-            url = f"{FANDOM_API}?{urlencode(query)}"
-            text = self._http.get_text(
-                url,
-                cache_key=f"fandom:pageinfo:{cache_scope}:{i}",
-                ttl_seconds=7 * 24 * 3600,
-                force_refresh=force_refresh,
-            )
-            data = json_loads(text)
-            pages.extend(data.get("query", {}).get("pages", []))
-        return pages
+            data = json_loads(self._http.get_text(f"{FANDOM_API}?{urlencode(query)}"))
+            if not cont and isinstance(data.get("curtimestamp"), str):
+                updated.timestamp = data["curtimestamp"]
+            for event in data.get("query", {}).get("logevents", []):
+                kind = (event.get("type"), event.get("action"))
+                d = self._day_page_title_to_date(event.get("title"))
+                if kind in {("create", "create"), ("delete", "restore")} and d:
+                    updated.add(d)
+                elif kind == ("delete", "delete") and d:
+                    updated.discard(d)
+                elif event.get("type") == "move":
+                    params = event.get("params") or {}
+                    if d and params.get("suppressredirect"):
+                        updated.discard(d)
+                    # After the discard: a move may only change how the day is spelled.
+                    target = self._day_page_title_to_date(params.get("target_title"))
+                    if target:
+                        updated.add(target)
+            next_cont = data.get("continue")
+            if not isinstance(next_cont, dict) or not next_cont:
+                break
+            cont = {str(k): str(v) for k, v in next_cont.items()}
+        updated.checked_at = time_module.time()
+        return updated
+
+    @classmethod
+    def _day_page_title_to_date(cls, title: object) -> date | None:
+        # Only the spellings a day lookup tries count, or the day would open empty.
+        if not isinstance(title, str):
+            return None
+        d = cls._page_title_to_date(title)
+        if d is None or title not in date_to_fandom_page_title_candidates(d):
+            return None
+        return d
 
     @staticmethod
     def _iter_month_days(year: int, month: int) -> list[date]:
@@ -446,6 +634,11 @@ def json_loads(text: str) -> dict:
     return data
 
 
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+# Accept "18.10", "18:10" and also editorially broken "18 10".
+_TIME_START_RE = re.compile(r"^\s*\d{1,2}(?:[:.]|\s)\d{2}\b")
+
+
 def strip_wiki_markup(text: str) -> str:
     if not text:
         return ""
@@ -480,19 +673,17 @@ def is_default_single_channel_name(name: str) -> bool:
 def extract_time_lines_from_wikitext(wikitext: str) -> list[str]:
     if not wikitext:
         return []
+    return _time_lines(_clean_page_lines(wikitext)[1])
 
-    normalized = re.sub(r"<br\s*/?>", "\n", wikitext, flags=re.IGNORECASE)
-    time_start_re = re.compile(r"^\s*\d{1,2}(?:[:.]|\s)\d{2}\b")
 
-    lines: list[str] = []
-    for raw_line in normalized.splitlines():
-        line = clean_text(strip_wiki_markup(raw_line))
-        if not line:
-            continue
-        if not time_start_re.match(line):
-            continue
-        lines.append(line)
-    return lines
+def _time_lines(clean_lines: list[str]) -> list[str]:
+    return [line for line in clean_lines if line and _TIME_START_RE.match(line)]
+
+
+def _clean_page_lines(wikitext: str) -> tuple[list[str], list[str]]:
+    """Raw lines (with <br> as line breaks) and their markup-free text."""
+    raw_lines = _BR_RE.sub("\n", wikitext).splitlines()
+    return raw_lines, [clean_text(strip_wiki_markup(x)) for x in raw_lines]
 
 
 def extract_channels_from_category_links(wikitext: str) -> list[str]:
@@ -580,23 +771,21 @@ def split_wikitext_plain_channel_sections(wikitext: str) -> list[tuple[str, str]
     """
     if not wikitext:
         return []
-
     # Normalize <br> into newlines so both variants work:
     # - "TVP 1<br />07.00 ..."<br />
     # - "TVP 1" on its own line, programmes below.
-    normalized = re.sub(r"<br\s*/?>", "\n", wikitext, flags=re.IGNORECASE)
+    raw_lines, clean_lines = _clean_page_lines(wikitext)
+    return _plain_channel_sections(raw_lines, clean_lines)
+
 
-    # Accept "18.10", "18:10" and also editorially broken "18 10".
-    time_start_re = re.compile(r"^\s*\d{1,2}(?:[:.]|\s)\d{2}\b")
+def _plain_channel_sections(raw_lines: list[str], clean_lines: list[str]) -> list[tuple[str, str]]:
+    time_start_re = _TIME_START_RE
     date_dot_re = re.compile(r"\b\d{1,2}\.\d{1,2}\.\d{4}\b")
     weekday_re = re.compile(
         r"\b(poniedzia[łl]ek|wtorek|środa|sroda|czwartek|piątek|piatek|sobota|niedziela)\b",
         re.IGNORECASE,
     )
 
-    raw_lines = normalized.splitlines()
-    clean_lines = [clean_text(strip_wiki_markup(x)) for x in raw_lines]
-
     pairs: list[tuple[str, str]] = []
     current_channel: str | None = None
     current_lines: list[str] = []
@@ -667,110 +856,135 @@ def extract_channel_schedule_from_wikitext(wikitext: str, channel_name: str) ->
     """
     Returns raw schedule text block for a channel from a day page wikitext.
     """
-    if not wikitext:
-        return ""
+    return FandomDayPage(wikitext).channel_block(channel_name)
 
-    target_key = _channel_key(channel_name)
 
-    heading_re = re.compile(r"^(?P<eq>={3,6})\s*(?P<title>.*?)\s*(?P=eq)\s*$")
+def extract_channels_from_wikitext(wikitext: str) -> list[str]:
+    return list(FandomDayPage(wikitext).channels)
 
-    collecting = False
-    collected: list[str] = []
 
-    for line in wikitext.splitlines():
-        m = heading_re.match(line.strip())
-        if m:
-            heading_title = strip_wiki_markup(m.group("title"))
-            heading_title_norm = heading_title.casefold().strip()
+_HEADING_RE = re.compile(r"^(?P<eq>={3,6})\s*(?P<title>.*?)\s*(?P=eq)\s*$")
+_NON_CHANNEL_HEADING_MARKERS = ("plik:", "file:", ".png", ".jpg", ".svg")
 
-            # Ignore headings that look like file markers or are empty.
-            if not heading_title_norm or any(
-                x in heading_title_norm for x in ("plik:", "file:", ".png", ".jpg", ".svg")
-            ):
-                continue
+# (start, title, subtitle, full entry text) of one programme.
+DayPageEntry = tuple[time | None, str, str | None, str]
 
-            current_channel = heading_title
-            collecting = _channel_key(current_channel) == target_key
-            continue
 
-        if collecting:
-            collected.append(line)
-
-    block = "\n".join(collected).strip()
-    if block:
-        return block
-
-    # Fallback for older page formats without headings.
-    channels = extract_channels_from_category_links(wikitext)
-    blocks = split_wikitext_file_blocks(wikitext)
-    if not channels or not blocks:
-        # Another fallback for plain-text sections (no headings/categories).
-        pairs = split_wikitext_plain_channel_sections(wikitext)
-        for ch, b in pairs:
-            if _channel_key(ch) == target_key:
-                return b
-
-        # If the page contains schedule entries but no channel labels, assume
-        # a single default channel ("TVP 1") for historical schedules.
-        if is_default_single_channel_name(channel_name):
-            time_lines = extract_time_lines_from_wikitext(wikitext)
-            if time_lines:
-                return "\n".join(time_lines)
-        return ""
+class FandomDayPage:
+    """
+    An archive day page parsed for all of its channels. Heading sections (the current
+    format) are split in one pass over the page; the fallbacks for older formats are
+    worked out on first use, once per page, and so is each channel's entry list.
+    """
 
-    idx = next((i for i, c in enumerate(channels) if _channel_key(c) == target_key), None)
-    if idx is None:
-        return ""
-    if idx >= len(blocks):
-        return ""
-    return blocks[idx]
+    def __init__(self, wikitext: str) -> None:
+        self._wikitext = wikitext or ""
+        heading_channels: list[str] = []
+        seen: set[str] = set()
+        sections: dict[str, list[str]] = {}
+        current: list[str] | None = None
+        for line in self._wikitext.splitlines():
+            m = _HEADING_RE.match(line.strip())
+            if m:
+                heading_title = strip_wiki_markup(m.group("title"))
+                heading_title_norm = heading_title.casefold().strip()
+                # Ignore headings that look like file markers or are empty.
+                if not heading_title_norm or any(
+                    x in heading_title_norm for x in _NON_CHANNEL_HEADING_MARKERS
+                ):
+                    continue
+                current = sections.setdefault(_channel_key(heading_title), [])
+                if heading_title_norm not in seen:
+                    seen.add(heading_title_norm)
+                    heading_channels.append(heading_title)
+                continue
+            if current is not None:
+                current.append(line)
+        self._heading_channels = heading_channels
+        self._heading_blocks = {key: "\n".join(lines).strip() for key, lines in sections.items()}
+        self._entries: dict[str, list[DayPageEntry]] = {}
+
+    @cached_property
+    def channels(self) -> tuple[str, ...]:
+        if self._heading_channels:
+            return tuple(self._heading_channels)
+        if self._category_channels:
+            return tuple(self._category_channels)
+        if not self._plain_sections:
+            return (DEFAULT_SINGLE_CHANNEL_SOURCE_NAME,) if self._time_lines else ()
+        seen: set[str] = set()
+        result: list[str] = []
+        for ch, _block in self._plain_sections:
+            norm = ch.casefold().strip()
+            if not norm or norm in seen:
+                continue
+            seen.add(norm)
+            result.append(ch)
+        return tuple(result)
+
+    def channel_block(self, channel_name: str) -> str:
+        target_key = _channel_key(channel_name)
+        block = self._heading_blocks.get(target_key, "")
+        if block or not self._wikitext:
+            return block
+
+        # Fallback for older page formats without headings.
+        channels = self._category_channels
+        blocks = self._file_blocks
+        if not channels or not blocks:
+            # Another fallback for plain-text sections (no headings/categories).
+            for ch, b in self._plain_sections:
+                if _channel_key(ch) == target_key:
+                    return b
+
+            # If the page contains schedule entries but no channel labels, assume
+            # a single default channel ("TVP 1") for historical schedules.
+            if is_default_single_channel_name(channel_name) and self._time_lines:
+                return "\n".join(self._time_lines)
+            return ""
 
+        idx = next((i for i, c in enumerate(channels) if _channel_key(c) == target_key), None)
+        if idx is None or idx >= len(blocks):
+            return ""
+        return blocks[idx]
+
+    def entries(self, channel_name: str) -> list[DayPageEntry]:
+        """Parsed programmes of a channel; shared between callers, treat as read-only."""
+        key = _channel_key(channel_name)
+        cached = self._entries.get(key)
+        if cached is None:
+            cached = []
+            for entry in split_schedule_entries(self.channel_block(channel_name)):
+                start, rest = parse_entry_start_and_rest(entry)
+                if not rest:
+                    continue
+                title, subtitle = split_title_subtitle(rest)
+                cached.append((start, title, subtitle, rest))
+            self._entries[key] = cached
+        return cached
 
-def extract_channels_from_wikitext(wikitext: str) -> list[str]:
-    if not wikitext:
-        return []
+    def all_entries(self) -> dict[str, list[DayPageEntry]]:
+        return {channel: self.entries(channel) for channel in self.channels}
 
-    heading_re = re.compile(r"^(?P<eq>={3,6})\s*(?P<title>.*?)\s*(?P=eq)\s*$")
+    @cached_property
+    def _category_channels(self) -> list[str]:
+        return extract_channels_from_category_links(self._wikitext)
 
-    seen: set[str] = set()
-    channels: list[str] = []
-    for line in wikitext.splitlines():
-        m = heading_re.match(line.strip())
-        if not m:
-            continue
-        heading_title = strip_wiki_markup(m.group("title"))
-        heading_title_norm = heading_title.casefold().strip()
-        if not heading_title_norm:
-            continue
-        if any(x in heading_title_norm for x in ("plik:", "file:", ".png", ".jpg", ".svg")):
-            continue
-        if heading_title_norm in seen:
-            continue
-        seen.add(heading_title_norm)
-        channels.append(heading_title)
-    if channels:
-        return channels
-
-    cat_channels = extract_channels_from_category_links(wikitext)
-    if cat_channels:
-        return cat_channels
-
-    pairs = split_wikitext_plain_channel_sections(wikitext)
-    if not pairs:
-        time_lines = extract_time_lines_from_wikitext(wikitext)
-        if time_lines:
-            return [DEFAULT_SINGLE_CHANNEL_SOURCE_NAME]
-        return []
+    @cached_property
+    def _file_blocks(self) -> list[str]:
+        return split_wikitext_file_blocks(self._wikitext)
 
-    seen: set[str] = set()
-    result: list[str] = []
-    for ch, _block in pairs:
-        norm = ch.casefold().strip()
-        if not norm or norm in seen:
-            continue
-        seen.add(norm)
-        result.append(ch)
-    return result
+    @cached_property
+    def _clean_lines(self) -> tuple[list[str], list[str]]:
+        return _clean_page_lines(self._wikitext)
+
+    @cached_property
+    def _plain_sections(self) -> list[tuple[str, str]]:
+        return _plain_channel_sections(*self._clean_lines) if self._wikitext else []
+
+    @cached_property
+    def _time_lines(self) -> list[str]:
+        return _time_lines(self._clean_lines[1]) if self._wikitext else []
 
 
 def split_schedule_entries(channel_block: str) -> list[str]:
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+_INDEX_VERSION = 1
+
+
+class FandomDayIndex:
+    """
+    Days that have an archive page: one bitmap per year (bit n = day n + 1 of the year),
+    plus the wiki timestamp the index is current as of, so it can be updated from the
+    wiki's logs instead of being rebuilt.
+    """
+
+    __slots__ = ("_years", "timestamp", "checked_at")
+
+    def __init__(
+        self,
+        years: dict[int, int] | None = None,
+        *,
+        timestamp: str | None = None,
+        checked_at: float = 0.0,
+    ) -> None:
+        self._years: dict[int, int] = dict(years or {})
+        self.timestamp = timestamp
+        self.checked_at = checked_at
+
+    @classmethod
+    def from_days(cls, days: Iterable[date], *, timestamp: str | None = None) -> FandomDayIndex:
+        index = cls(timestamp=timestamp)
+        for d in days:
+            index.add(d)
+        return index
+
+    def copy(self) -> FandomDayIndex:
+        return FandomDayIndex(self._years, timestamp=self.timestamp, checked_at=self.checked_at)
+
+    def add(self, d: date) -> None:
+        self._years[d.year] = self._years.get(d.year, 0) | (1 << _bit(d))
+
+    def discard(self, d: date) -> None:
+        bits = self._years.get(d.year, 0) & ~(1 << _bit(d))
+        if bits:
+            self._years[d.year] = bits
+        else:
+            self._years.pop(d.year, None)
+
+    def __contains__(self, d: object) -> bool:
+        return isinstance(d, date) and bool(self._years.get(d.year, 0) >> _bit(d) & 1)
+
+    def __len__(self) -> int:
+        return sum(bits.bit_count() for bits in self._years.values())
+
+    def years(self) -> list[int]:
+        return sorted(self._years)
+
+    def days_in_year(self, year: int) -> list[date]:
+        bits = self._years.get(year, 0)
+        first = date(year, 1, 1)
+        days: list[date] = []
+        n = 0
+        while bits:
+            if bits & 1:
+                days.append(first + timedelta(days=n))
+            bits >>= 1
+            n += 1
+        return days
+
+    def days_in_month(self, year: int, month: int) -> list[date]:
+        return [d for d in self.days_in_year(year) if d.month == month]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "v": _INDEX_VERSION,
+            "ts": self.timestamp,
+            "checked": self.checked_at,
+            "years": {str(y): format(bits, "x") for y, bits in sorted(self._years.items())},
+        }
+
+    @classmethod
+    def from_json(cls, data: Any) -> FandomDayIndex | None:
+        if not isinstance(data, dict) or data.get("v") != _INDEX_VERSION:
+            return None
+        try:
+            years = {int(y): int(bits, 16) for y, bits in data["years"].items()}
+            ts = data.get("ts")
+            return cls(
+                years,
+                timestamp=ts if isinstance(ts, str) else None,
+                checked_at=float(data.get("checked") or 0.0),
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+
+def _bit(d: date) -> int:
+    return d.timetuple().tm_yday - 1
@@ -10,9 +10,11 @@ from tvguide_app.core.favorites import (
     decode_favorite_source_id,
     encode_favorite_source_id,
 )
-from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId, intern_source
 from tvguide_app.core.providers.base import ScheduleProvider
 
+_FAVORITES_ID = ProviderId("favorites")
+
 
 class FavoritesProvider(ScheduleProvider):
     def __init__(
@@ -91,16 +93,34 @@ class FavoritesProvider(ScheduleProvider):
     def _ref_to_original_source(self, ref: FavoriteRef, *, preferred_name: str) -> Source:
         entry = self._store.get(ref)
         name = entry.name if entry else preferred_name
-        return Source(provider_id=ProviderId(ref.provider_id), id=SourceId(ref.source_id), name=name)
+        source = Source(
+            provider_id=ProviderId(ref.provider_id), id=SourceId(ref.source_id), name=name
+        )
+        return intern_source(source)
 
     @staticmethod
     def _wrap_item(item: ScheduleItem, *, source: Source) -> ScheduleItem:
-        return replace(item, provider_id=ProviderId("favorites"), source=source)
+        # Called for every item of a day; dataclasses.replace() walks fields() and is ~1.6x slower.
+        return ScheduleItem(
+            provider_id=_FAVORITES_ID,
+            source=source,
+            day=item.day,
+            start_time=item.start_time,
+            end_time=item.end_time,
+            title=item.title,
+            subtitle=item.subtitle,
+            details_ref=item.details_ref,
+            details_summary=item.details_summary,
+            accessibility=item.accessibility,
+        )
 
     def _entry_to_source(self, entry: FavoriteEntry) -> Source:
         label_prefix = "TV: " if entry.kind == "tv" else "Radio: "
         encoded_id = encode_favorite_source_id(entry)
-        return Source(provider_id=ProviderId("favorites"), id=SourceId(encoded_id), name=f"{label_prefix}{entry.name}")
+        source = Source(
+            provider_id=_FAVORITES_ID, id=SourceId(encoded_id), name=f"{label_prefix}{entry.name}"
+        )
+        return intern_source(source)
 
     def _delegate_for_ref(self, ref: FavoriteRef) -> ScheduleProvider | None:
         if ref.kind == "tv":
@@ -11,7 +11,13 @@ from bs4 import BeautifulSoup
 from tvguide_app.core.http import HttpClient
 from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
 from tvguide_app.core.providers.base import ScheduleProvider
-from tvguide_app.core.util import clean_multiline_text, clean_text, parse_time_hhmm
+from tvguide_app.core.util import (
+    clean_multiline_text,
+    clean_text,
+    minute_of_day,
+    parse_time_hhmm,
+    time_from_minute,
+)
 
 
 PR_BASE = "https://www.polskieradio.pl"
@@ -115,16 +121,19 @@ class PolskieRadioProvider(ScheduleProvider):
         ) or item.title
 
     def _get_multischedule(self, day: date, *, force_refresh: bool) -> dict[str, list[_PrItem]]:
+        # One page holds every channel: it is parsed once and shared by all six of them.
         day_s = day.isoformat()
-        cache_key = f"pr:multischedule:{day_s}"
-        html = self._http.post_form_text(
+        return self._http.get_parsed(
             PR_MULTISCHEDULE_URL,
+            _parse_multischedule,
+            _MULTISCHEDULE_PARSER_VERSION,
+            encode=_encode_multischedule,
+            decode=_decode_multischedule,
             data={"selectedDate": day_s},
-            cache_key=cache_key,
+            cache_key=f"pr:multischedule:{day_s}",
             ttl_seconds=60 * 30,
             force_refresh=force_refresh,
         )
-        return parse_pr_multischedule_html(html, day, PR_CHANNELS)
 
 
 @dataclass(frozen=True)
@@ -134,6 +143,35 @@ class _PrItem:
     details_ref: str | None
 
 
+_MULTISCHEDULE_PARSER_VERSION = 1
+
+
+def _parse_multischedule(html: str) -> dict[str, list[_PrItem]]:
+    # The result does not depend on the day; the page is what gets memoized.
+    return parse_pr_multischedule_html(html, date.min, PR_CHANNELS)
+
+
+def _encode_multischedule(by_channel: dict[str, list[_PrItem]]) -> dict[str, list[list[object]]]:
+    return {
+        channel: [[minute_of_day(it.start_time), it.title, it.details_ref] for it in items]
+        for channel, items in by_channel.items()
+    }
+
+
+def _decode_multischedule(data: dict[str, list[list[object]]]) -> dict[str, list[_PrItem]]:
+    return {
+        str(channel): [
+            _PrItem(
+                start_time=time_from_minute(start),  # type: ignore[arg-type]
+                title=str(title),
+                details_ref=ref,  # type: ignore[arg-type]
+            )
+            for start, title, ref in rows
+        ]
+        for channel, rows in data.items()
+    }
+
+
 def parse_details_ref(details_ref: str) -> dict[str, str]:
     # details_ref format: "{scheduleId}|{programmeId}|{startTime}|{selectedDate}"
     schedule_id, programme_id, start_time, selected_date = details_ref.split("|", 3)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import re
 from datetime import date, time
+from typing import Callable, Literal
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
+from lxml import etree
 
+from tvguide_app.core.async_http import AsyncHttpClient
 from tvguide_app.core.http import HttpClient
 from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
 from tvguide_app.core.providers.base import ScheduleProvider
@@ -14,10 +18,17 @@ from tvguide_app.core.util import clean_text, parse_time_hhmm
 
 TELEMAN_BASE = "https://www.teleman.pl"
 
+_STATIONS_PARSER_VERSION = 1
+
+# "lxml" is the fast path; "soup" is the original BeautifulSoup implementation, kept as
+# the reference the fast path is checked against.
+TelemanParserEngine = Literal["lxml", "soup"]
+
 
 class TelemanProvider(ScheduleProvider):
-    def __init__(self, http: HttpClient) -> None:
+    def __init__(self, http: HttpClient, *, async_http: AsyncHttpClient | None = None) -> None:
         self._http = http
+        self._async_http = async_http
 
     @property
     def provider_id(self) -> str:
@@ -28,13 +39,16 @@ class TelemanProvider(ScheduleProvider):
         return "Telewizja"
 
     def list_sources(self, *, force_refresh: bool = False) -> list[Source]:
-        html = self._http.get_text(
+        # The homepage rarely changes; its station list is parsed once per version of it.
+        stations = self._http.get_parsed(
             TELEMAN_BASE + "/",
+            parse_teleman_stations,
+            _STATIONS_PARSER_VERSION,
+            decode=lambda data: [(str(slug), str(name)) for slug, name in data],
             cache_key="teleman:home",
             ttl_seconds=7 * 24 * 3600,
             force_refresh=force_refresh,
         )
-        stations = parse_teleman_stations(html)
         return [
             Source(provider_id=ProviderId(self.provider_id), id=SourceId(slug), name=name)
             for slug, name in stations
@@ -52,14 +66,35 @@ class TelemanProvider(ScheduleProvider):
         *,
         force_refresh: bool = False,
     ) -> list[ScheduleItem]:
-        url = f"{TELEMAN_BASE}/program-tv/stacje/{source.id}?date={day.isoformat()}"
-        cache_key = f"teleman:station:{source.id}:{day.isoformat()}"
+        url, cache_key = _station_page(source, day)
         html = self._http.get_text(
             url,
             cache_key=cache_key,
             ttl_seconds=60 * 60,
             force_refresh=force_refresh,
         )
+        return self._schedule_items(source, day, html)
+
+    async def get_schedule_async(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        if self._async_http is None:
+            return await super().get_schedule_async(source, day, force_refresh=force_refresh)
+        url, cache_key = _station_page(source, day)
+        html = await self._async_http.get_text(
+            url,
+            cache_key=cache_key,
+            ttl_seconds=60 * 60,
+            force_refresh=force_refresh,
+        )
+        # Parsing is CPU-bound; keep it off the event loop.
+        return await asyncio.to_thread(self._schedule_items, source, day, html)
+
+    def _schedule_items(self, source: Source, day: date, html: str) -> list[ScheduleItem]:
         parsed_items = parse_teleman_station_schedule(html)
         items: list[ScheduleItem] = []
         for it in parsed_items:
@@ -92,6 +127,11 @@ class TelemanProvider(ScheduleProvider):
         return parse_teleman_show_details(html) or (item.details_summary or item.title)
 
 
+def _station_page(source: Source, day: date) -> tuple[str, str]:
+    url = f"{TELEMAN_BASE}/program-tv/stacje/{source.id}?date={day.isoformat()}"
+    return url, f"teleman:station:{source.id}:{day.isoformat()}"
+
+
 class _TelemanParsedItem:
     def __init__(
         self,
@@ -111,7 +151,35 @@ class _TelemanParsedItem:
         self.details_ref = details_ref
 
 
-def parse_teleman_stations(html: str) -> list[tuple[str, str]]:
+def parse_teleman_stations(
+    html: str, *, engine: TelemanParserEngine = "lxml"
+) -> list[tuple[str, str]]:
+    stations = _stations_lxml(html) if engine == "lxml" else _stations_soup(html)
+    # Deduplicate by slug.
+    seen: set[str] = set()
+    out: list[tuple[str, str]] = []
+    for slug, name in stations:
+        if slug in seen:
+            continue
+        seen.add(slug)
+        out.append((slug, name))
+    return out
+
+
+def parse_teleman_station_schedule(
+    html: str,
+    *,
+    engine: TelemanParserEngine = "lxml",
+) -> list[_TelemanParsedItem]:
+    items = _station_schedule_lxml(html) if engine == "lxml" else _station_schedule_soup(html)
+    # Infer end time from next start time.
+    for i in range(len(items) - 1):
+        if items[i].start_time and items[i + 1].start_time:
+            items[i].end_time = items[i + 1].start_time  # type: ignore[attr-defined]
+    return items
+
+
+def _stations_soup(html: str) -> list[tuple[str, str]]:
     soup = BeautifulSoup(html, "lxml")
     nav = soup.select_one("nav#stations-index")
     if not nav:
@@ -125,18 +193,10 @@ def parse_teleman_stations(html: str) -> list[tuple[str, str]]:
         name = clean_text(a.get_text(" "))
         if slug and name:
             stations.append((slug, name))
-    # Deduplicate by slug.
-    seen: set[str] = set()
-    out: list[tuple[str, str]] = []
-    for slug, name in stations:
-        if slug in seen:
-            continue
-        seen.add(slug)
-        out.append((slug, name))
-    return out
+    return stations
 
 
-def parse_teleman_station_schedule(html: str) -> list[_TelemanParsedItem]:
+def _station_schedule_soup(html: str) -> list[_TelemanParsedItem]:
     soup = BeautifulSoup(html, "lxml")
     ul = soup.select_one("ul.stationItems")
     if not ul:
@@ -176,14 +236,112 @@ def parse_teleman_station_schedule(html: str) -> list[_TelemanParsedItem]:
                 details_ref=href,
             )
         )
+    return items
 
-    # Infer end time from next start time.
-    for i in range(len(items) - 1):
-        if items[i].start_time and items[i + 1].start_time:
-            items[i].end_time = items[i + 1].start_time  # type: ignore[attr-defined]
+
+# The "lxml" engine walks libxml2's tree directly: same parser as BeautifulSoup's "lxml"
+# builder, so the same tree, without building a Python object per node. The selectors
+# below mirror the soup ones step by step (first match in document order, descendants).
+
+
+def _stations_lxml(html: str) -> list[tuple[str, str]]:
+    nav = _first(_lxml_root(html), "nav", lambda el: el.get("id") == "stations-index")
+    if nav is None:
+        return []
+    stations: list[tuple[str, str]] = []
+    for a in nav.iter("a"):
+        href = a.get("href")
+        if not href or not href.startswith("/program-tv/stacje/"):
+            continue
+        slug = href.rsplit("/", 1)[-1]
+        name = clean_text(_lxml_text(a))
+        if slug and name:
+            stations.append((slug, name))
+    return stations
+
+
+def _station_schedule_lxml(html: str) -> list[_TelemanParsedItem]:
+    ul = _first(_lxml_root(html), "ul", lambda el: _has_class(el, "stationItems"))
+    if ul is None:
+        return []
+
+    items: list[_TelemanParsedItem] = []
+    for li in ul.iter("li"):
+        if not (li.get("id") or "").startswith("prog"):
+            continue
+        em = _first(li, "em")
+        start = parse_time_hhmm(clean_text(_lxml_text(em))) if em is not None else None
+
+        detail = _first(li, "div", lambda el: _has_class(el, "detail"))
+        if detail is None:
+            continue
+        a = _first(detail, "a", lambda el: el.get("href") is not None)
+        title = clean_text(_lxml_text(a)) if a is not None else ""
+        href = a.get("href") if a is not None else None
+
+        subtitle = None
+        summary = None
+        genre_seen = False
+        for p in detail.iter("p"):
+            if _has_class(p, "genre"):
+                if not genre_seen:
+                    genre_seen = True
+                    subtitle = clean_text(_lxml_text(p))
+                continue
+            if not summary:
+                summary = clean_text(_lxml_text(p))
+
+        items.append(
+            _TelemanParsedItem(
+                start_time=start,
+                end_time=None,
+                title=title or (summary or ""),
+                subtitle=subtitle,
+                summary=summary,
+                details_ref=href,
+            )
+        )
     return items
 
 
+def _lxml_root(html: str) -> etree._Element | None:
+    try:
+        return etree.HTML(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration.
+        return etree.HTML(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+
+
+def _first(
+    root: etree._Element | None,
+    tag: str,
+    pred: Callable[[etree._Element], bool] | None = None,
+) -> etree._Element | None:
+    if root is None:
+        return None
+    for el in root.iter(tag):
+        if el is not root and (pred is None or pred(el)):
+            return el
+    return None
+
+
+def _has_class(el: etree._Element, name: str) -> bool:
+    return name in (el.get("class") or "").split()
+
+
+# get_text(" ") of BeautifulSoup: text nodes joined by spaces, without comments and without
+# the strings it files under script/style/template and ruby annotations.
+_TEXT_NODES = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]",
+    smart_strings=False,
+)
+
+
+def _lxml_text(el: etree._Element) -> str:
+    return " ".join(_TEXT_NODES(el))
+
+
 def parse_teleman_show_details(html: str) -> str:
     soup = BeautifulSoup(html, "lxml")
     sections = []
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    # Sustained request rate and how many requests may go out back-to-back.
+    requests_per_second: float
+    burst: int
+    # Requests to the host in flight at the same time.
+    max_concurrent: int
+
+
+DEFAULT_POLICY = HostPolicy(requests_per_second=5.0, burst=10, max_concurrent=4)
+
+DEFAULT_HOST_POLICIES: dict[str, HostPolicy] = {
+    "teleman.pl": HostPolicy(requests_per_second=4.0, burst=8, max_concurrent=4),
+    "polskieradio.pl": HostPolicy(requests_per_second=4.0, burst=8, max_concurrent=3),
+    # MediaWiki API etiquette: keep bulk reads serial-ish.
+    "staratelewizja.fandom.com": HostPolicy(requests_per_second=2.0, burst=4, max_concurrent=2),
+    "tyflo.eu.org": HostPolicy(requests_per_second=2.0, burst=4, max_concurrent=2),
+}
+
+
+@dataclass(frozen=True)
+class HostLimitStats:
+    host: str
+    requests: int
+    # Total time callers spent waiting for a token or a free slot.
+    waited_seconds: float
+    active: int
+    max_concurrent: int
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = max(0.001, float(requests_per_second))
+        self._burst = max(1, int(burst))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self._burst)
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1.0
+            # A negative balance queues callers fairly: each one waits for its own token.
+            return max(0.0, -self._tokens / self._rate)
+
+
+class _HostState:
+    def __init__(self, policy: HostPolicy) -> None:
+        self.policy = policy
+        self.bucket = TokenBucket(policy.requests_per_second, policy.burst)
+        self.slots = threading.BoundedSemaphore(max(1, policy.max_concurrent))
+        self.requests = 0
+        self.waited = 0.0
+        self.active = 0
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket plus a concurrency cap. Every outgoing request takes a `slot`,
+    so parallel warm-ups and prefetchers pace themselves instead of sleeping by hand.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, HostPolicy] | None = None,
+        *,
+        default: HostPolicy = DEFAULT_POLICY,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._policies = dict(DEFAULT_HOST_POLICIES if policies is None else policies)
+        self._default = default
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _HostState] = {}
+
+    def set_policy(self, host: str, policy: HostPolicy) -> None:
+        with self._lock:
+            self._policies[host] = policy
+            self._hosts.pop(host, None)
+            self._hosts.pop(f"www.{host}", None)
+
+    def policy_for(self, url: str) -> HostPolicy:
+        return self._state(_host_of(url)).policy
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        state = self._state(_host_of(url))
+        started = time.monotonic()
+        state.slots.acquire()
+        try:
+            delay = state.bucket.reserve()
+            if delay > 0:
+                self._sleep(delay)
+            with self._lock:
+                state.requests += 1
+                state.active += 1
+                state.waited += time.monotonic() - started
+            try:
+                yield
+            finally:
+                with self._lock:
+                    state.active -= 1
+        finally:
+            state.slots.release()
+
+    def stats(self) -> list[HostLimitStats]:
+        with self._lock:
+            return [
+                HostLimitStats(
+                    host=host,
+                    requests=s.requests,
+                    waited_seconds=s.waited,
+                    active=s.active,
+                    max_concurrent=s.policy.max_concurrent,
+                )
+                for host, s in sorted(self._hosts.items())
+            ]
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                policy = self._policies.get(host) or self._policies.get(host.removeprefix("www."))
+                state = _HostState(policy or self._default)
+                self._hosts[host] = state
+            return state
+
+
+def _host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable
+from urllib.parse import urlsplit
+
+import requests
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    # Total attempts including the first one; 1 disables retries.
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    # A Retry-After longer than this is not waited for; the error is raised instead.
+    max_retry_after_seconds: float = 30.0
+
+    def backoff(self, attempt: int, rnd: random.Random | None = None) -> float:
+        """Full-jitter exponential backoff after the given (1-based) failed attempt."""
+        cap = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (attempt - 1)))
+        return (rnd or random).uniform(0.0, cap)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+@dataclass(frozen=True)
+class CircuitStats:
+    host: str
+    state: str
+    consecutive_failures: int
+    # Requests rejected without a network call while the circuit was open.
+    rejected: int
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: float | None = None
+        # When the half-open probe was let through (None: no probe in flight).
+        self.probe_started: float | None = None
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after `failure_threshold` consecutive failures (connection errors,
+    timeouts, 5xx) the host is considered down and requests fail immediately for
+    `reset_seconds`. Then one probe request is let through; success closes the circuit.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = max(1, int(failure_threshold))
+        self._reset = float(reset_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: dict[str, _Circuit] = {}
+
+    def before_request(self, url: str) -> None:
+        host = _host_of(url)
+        with self._lock:
+            c = self._circuits.get(host)
+            if c is None or c.opened_at is None:
+                return
+            now = self._clock()
+            probe_lost = c.probe_started is not None and now - c.probe_started >= self._reset
+            if now - c.opened_at >= self._reset and (c.probe_started is None or probe_lost):
+                # Half-open: let a single probe through.
+                c.probe_started = now
+                return
+            c.rejected += 1
+        raise CircuitOpenError(f"{host} jest chwilowo niedostępny (zbyt wiele błędów).")
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            c = self._circuits.get(_host_of(url))
+            if c is not None:
+                c.failures = 0
+                c.opened_at = None
+                c.probe_started = None
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            c = self._circuits.setdefault(_host_of(url), _Circuit())
+            c.failures += 1
+            if c.probe_started is not None or c.failures >= self._threshold:
+                c.opened_at = self._clock()
+                c.probe_started = None
+
+    def stats(self) -> list[CircuitStats]:
+        now = self._clock()
+        with self._lock:
+            out = []
+            for host, c in sorted(self._circuits.items()):
+                if c.opened_at is None:
+                    state = "closed"
+                elif c.probe_started is not None or now - c.opened_at >= self._reset:
+                    state = "half-open"
+                else:
+                    state = "open"
+                out.append(CircuitStats(host, state, c.failures, c.rejected))
+            return out
+
+
+def retry_after_seconds(value: str | None, *, now: datetime | None = None) -> float | None:
+    """Parses a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def _host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
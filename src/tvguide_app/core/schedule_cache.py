@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import json
+import time
+from dataclasses import dataclass
 from datetime import date
-from typing import Any, Literal
+from typing import Callable, Literal
 
-from tvguide_app.core.cache import SqliteCache
-from tvguide_app.core.models import AccessibilityFeature, ProviderId, ScheduleItem, Source
+from tvguide_app.core.cache import NO_STALE, BackgroundRefresher, SqliteCache, StalePolicy
+from tvguide_app.core.models import ScheduleItem, Source
 from tvguide_app.core.providers.archive_base import ArchiveProvider
 from tvguide_app.core.providers.base import ScheduleProvider
-from tvguide_app.core.util import parse_time_hhmm
+from tvguide_app.core.schedule_codec import decode_schedule, encode_schedule
+from tvguide_app.core.schedule_day import ScheduleDay
+from tvguide_app.core.schedule_store import ScheduleStore
+from tvguide_app.core.single_flight import SingleFlight, SingleFlightStats
 
 
 ScheduleCacheKind = Literal["tv", "radio", "tv_accessibility", "archive"]
 
 
+@dataclass(frozen=True)
+class ScheduleResult:
+    items: list[ScheduleItem]
+    # True when an expired cached schedule was returned (refresh in background or upstream error).
+    stale: bool = False
+    # True when that was because fetching a fresh schedule failed.
+    refresh_failed: bool = False
+
+
 class CachedScheduleProvider(ScheduleProvider):
     def __init__(
         self,
@@ -21,11 +36,20 @@ class CachedScheduleProvider(ScheduleProvider):
         *,
         kind: ScheduleCacheKind,
         ttl_seconds: int,
+        stale_policy: StalePolicy = NO_STALE,
+        schedule_store: ScheduleStore | None = None,
     ) -> None:
         self._delegate = delegate
         self._cache = cache
+        self._store = schedule_store
         self._kind = kind
         self._ttl_seconds = int(ttl_seconds)
+        self._stale_policy = stale_policy
+        self._refresher = BackgroundRefresher()
+        self._flight: SingleFlight[list[ScheduleItem]] = SingleFlight()
+
+    def coalescing_stats(self) -> SingleFlightStats:
+        return self._flight.stats()
 
     @property
     def provider_id(self) -> str:
@@ -56,19 +80,32 @@ class CachedScheduleProvider(ScheduleProvider):
         *,
         force_refresh: bool = False,
     ) -> list[ScheduleItem]:
-        key = _schedule_cache_key(self._kind, source, day)
-        if not force_refresh:
-            cached = self._cache.get_json(key)
-            decoded = _decode_schedule_items(cached, source, day)
-            if decoded is not None:
-                return decoded
-
-        items = self._delegate.get_schedule(source, day, force_refresh=force_refresh)
-        try:
-            self._cache.set_json(key, _encode_schedule_items(items), ttl_seconds=self._ttl_seconds)
-        except Exception:  # noqa: BLE001
-            pass
-        return items
+        return self.get_schedule_result(source, day, force_refresh=force_refresh).items
+
+    def get_schedule_result(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> ScheduleResult:
+        result = _get_cached_schedule(
+            self._cache,
+            _schedule_cache_key(self._kind, source, day),
+            source,
+            day,
+            fetch=lambda force: self._delegate.get_schedule(source, day, force_refresh=force),
+            ttl_seconds=self._ttl_seconds,
+            stale_policy=self._stale_policy,
+            refresher=self._refresher,
+            flight=self._flight,
+            force_refresh=force_refresh,
+            on_fetched=lambda items: _store_schedule(self._store, self._kind, source, day, items),
+        )
+        if self._store is not None and not self._store.has_day(self._kind, source, day):
+            # Cached before the store existed (or pruned from it): backfill from the cache.
+            _store_schedule(self._store, self._kind, source, day, result.items)
+        return result
 
     def get_item_details(self, item: ScheduleItem, *, force_refresh: bool = False) -> str:
         return self._delegate.get_item_details(item, force_refresh=force_refresh)
@@ -81,10 +118,19 @@ class CachedArchiveProvider(ArchiveProvider):
         cache: SqliteCache,
         *,
         ttl_seconds: int,
+        stale_policy: StalePolicy = NO_STALE,
+        schedule_store: ScheduleStore | None = None,
     ) -> None:
         self._delegate = delegate
         self._cache = cache
+        self._store = schedule_store
         self._ttl_seconds = int(ttl_seconds)
+        self._stale_policy = stale_policy
+        self._refresher = BackgroundRefresher()
+        self._flight: SingleFlight[list[ScheduleItem]] = SingleFlight()
+
+    def coalescing_stats(self) -> SingleFlightStats:
+        return self._flight.stats()
 
     @property
     def provider_id(self) -> str:
@@ -116,84 +162,124 @@ class CachedArchiveProvider(ArchiveProvider):
         *,
         force_refresh: bool = False,
     ) -> list[ScheduleItem]:
-        key = _schedule_cache_key("archive", source, day)
-        if not force_refresh:
-            cached = self._cache.get_json(key)
-            decoded = _decode_schedule_items(cached, source, day)
-            if decoded is not None:
-                return decoded
-
-        items = self._delegate.get_schedule(source, day, force_refresh=force_refresh)
+        return self.get_schedule_result(source, day, force_refresh=force_refresh).items
+
+    def get_schedule_result(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> ScheduleResult:
+        result = _get_cached_schedule(
+            self._cache,
+            _schedule_cache_key("archive", source, day),
+            source,
+            day,
+            fetch=lambda force: self._delegate.get_schedule(source, day, force_refresh=force),
+            ttl_seconds=self._ttl_seconds,
+            stale_policy=self._stale_policy,
+            refresher=self._refresher,
+            flight=self._flight,
+            force_refresh=force_refresh,
+            on_fetched=lambda items: _store_schedule(self._store, "archive", source, day, items),
+        )
+        if self._store is not None and not self._store.has_day("archive", source, day):
+            # Cached before the store existed (or pruned from it): backfill from the cache.
+            _store_schedule(self._store, "archive", source, day, result.items)
+        return result
+
+
+def _get_cached_schedule(
+    cache: SqliteCache,
+    key: str,
+    source: Source,
+    day: date,
+    *,
+    fetch: Callable[[bool], list[ScheduleItem]],
+    ttl_seconds: int,
+    stale_policy: StalePolicy,
+    refresher: BackgroundRefresher,
+    flight: SingleFlight[list[ScheduleItem]],
+    force_refresh: bool,
+    on_fetched: Callable[[list[ScheduleItem]], None] | None = None,
+) -> ScheduleResult:
+    def decode(data: object) -> ScheduleDay | None:
+        return decode_schedule(data, source, day)
+
+    def cached_day() -> ScheduleDay | None:
+        # The memory tier keeps the columnar day rather than the parsed JSON.
+        packed = cache.get_decoded(key, decode)
+        if packed is not None and packed.source != source:
+            packed = packed.with_source(source)
+        return packed
+
+    def fetch_and_store(force: bool) -> list[ScheduleItem]:
+        if not force:
+            # Another caller may have just finished the same fetch.
+            fresh = cached_day()
+            if fresh is not None:
+                return fresh.items()
+        items = fetch(force)
         try:
-            self._cache.set_json(key, _encode_schedule_items(items), ttl_seconds=self._ttl_seconds)
+            cache.set_json(key, encode_schedule(items), ttl_seconds=ttl_seconds)
         except Exception:  # noqa: BLE001
             pass
+        if on_fetched is not None:
+            on_fetched(items)
         return items
 
+    def fetch_once(force: bool) -> list[ScheduleItem]:
+        # Concurrent requests for the same schedule share one fetch and parse; a forced
+        # refresh never settles for a plain fetch that may answer from the cache.
+        return flight.do(f"{key} force" if force else key, lambda: fetch_and_store(force))
+
+    def refresh() -> None:
+        fetch_once(False)
+
+    now = int(time.time())
+    entry = cache.get_entry(key)
+    stale_items: list[ScheduleItem] | None = None
+    if entry is not None:
+        try:
+            packed = decode(json.loads(entry.value)) if entry.is_expired(now) else cached_day()
+            decoded = packed.items() if packed is not None else None
+        except ValueError:
+            decoded = None
+        if decoded is not None:
+            if not force_refresh and not entry.is_expired(now):
+                return ScheduleResult(items=decoded)
+            if not force_refresh and stale_policy.allows_revalidate(entry, now):
+                refresher.submit(key, refresh)
+                return ScheduleResult(items=decoded, stale=True)
+            if stale_policy.allows_error(entry, now):
+                stale_items = decoded
+
+    try:
+        items = fetch_once(force_refresh)
+    except Exception:
+        if stale_items is not None:
+            return ScheduleResult(items=stale_items, stale=True, refresh_failed=True)
+        raise
+    return ScheduleResult(items=items)
+
+
+def _store_schedule(
+    store: ScheduleStore | None,
+    kind: ScheduleCacheKind,
+    source: Source,
+    day: date,
+    items: list[ScheduleItem],
+) -> None:
+    if store is None:
+        return
+    try:
+        store.replace_day(kind, source, day, items)
+    except Exception:  # noqa: BLE001
+        pass
+
 
 def _schedule_cache_key(kind: ScheduleCacheKind, source: Source, day: date) -> str:
     pid = getattr(source.provider_id, "value", source.provider_id)
     sid = getattr(source.id, "value", source.id)
-    return f"schedule:v1:{kind}:{pid}:{sid}:{day.isoformat()}"
-
-
-def _encode_schedule_items(items: list[ScheduleItem]) -> list[dict[str, Any]]:
-    out: list[dict[str, Any]] = []
-    for it in items:
-        out.append(
-            {
-                "start": it.start_time.strftime("%H:%M") if it.start_time else None,
-                "end": it.end_time.strftime("%H:%M") if it.end_time else None,
-                "title": it.title,
-                "subtitle": it.subtitle,
-                "details_ref": it.details_ref,
-                "details_summary": it.details_summary,
-                "accessibility": list(it.accessibility) if it.accessibility else [],
-            }
-        )
-    return out
-
-
-def _decode_schedule_items(data: Any, source: Source, day: date) -> list[ScheduleItem] | None:
-    if not isinstance(data, list):
-        return None
-
-    items: list[ScheduleItem] = []
-    for raw in data:
-        if not isinstance(raw, dict):
-            continue
-        title = str(raw.get("title") or "")
-        if not title:
-            continue
-
-        start_raw = raw.get("start")
-        end_raw = raw.get("end")
-        start = parse_time_hhmm(str(start_raw)) if isinstance(start_raw, str) and start_raw else None
-        end = parse_time_hhmm(str(end_raw)) if isinstance(end_raw, str) and end_raw else None
-
-        acc_raw = raw.get("accessibility")
-        acc: tuple[AccessibilityFeature, ...] = ()
-        if isinstance(acc_raw, list):
-            parsed: list[AccessibilityFeature] = []
-            for x in acc_raw:
-                if x in ("AD", "JM", "N"):
-                    parsed.append(x)  # type: ignore[arg-type]
-            acc = tuple(parsed)
-
-        items.append(
-            ScheduleItem(
-                provider_id=ProviderId(str(getattr(source.provider_id, "value", source.provider_id))),
-                source=source,
-                day=day,
-                start_time=start,
-                end_time=end,
-                title=title,
-                subtitle=str(raw.get("subtitle")) if raw.get("subtitle") is not None else None,
-                details_ref=str(raw.get("details_ref")) if raw.get("details_ref") is not None else None,
-                details_summary=str(raw.get("details_summary")) if raw.get("details_summary") is not None else None,
-                accessibility=acc,
-            )
-        )
-
-    return items
-
+    return f"schedule:v2:{kind}:{pid}:{sid}:{day.isoformat()}"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from array import array
+from datetime import date, time
+from typing import Any, Iterable
+
+from tvguide_app.core.models import ScheduleItem, Source
+from tvguide_app.core.schedule_day import NO_MINUTE, ScheduleDay, accessibility_mask
+from tvguide_app.core.util import minute_of_day
+
+SCHEDULE_FORMAT_VERSION = 2
+
+# Row layout: start and end as minute of day, then string-table indexes, then a bitmask.
+_START, _END, _TITLE, _SUBTITLE, _DETAILS_REF, _DETAILS_SUMMARY, _ACCESSIBILITY = range(7)
+_ROW = 7
+_DAY_MINUTES = 24 * 60
+
+
+def encode_schedule(items: Iterable[ScheduleItem]) -> dict[str, Any]:
+    """
+    Compact `schedule:v2` form of a day's schedule: every distinct string is stored
+    once, and each item is a row of small ints (minutes of day, string indexes and an
+    accessibility bitmask) in one flat list.
+    """
+    # Index 0 stands for None.
+    strings: list[str | None] = [None]
+    index: dict[str, int] = {}
+
+    def intern(value: str | None) -> int:
+        if value is None:
+            return 0
+        idx = index.get(value)
+        if idx is None:
+            idx = len(strings)
+            index[value] = idx
+            strings.append(value)
+        return idx
+
+    rows: list[int] = []
+    for it in items:
+        rows.extend(
+            (
+                _minute_of_day(it.start_time),
+                _minute_of_day(it.end_time),
+                intern(it.title),
+                intern(it.subtitle),
+                intern(it.details_ref),
+                intern(it.details_summary),
+                accessibility_mask(it.accessibility),
+            )
+        )
+
+    # Plain JSON ints rather than base64-packed bytes: the cache compresses values, and
+    # base64 hides their redundancy from the compressor (stored size grew by a third).
+    return {"v": SCHEDULE_FORMAT_VERSION, "s": strings, "r": rows}
+
+
+def decode_schedule(data: Any, source: Source, day: date) -> ScheduleDay | None:
+    """None if `data` is not a valid `schedule:v2` document."""
+    if not isinstance(data, dict) or data.get("v") != SCHEDULE_FORMAT_VERSION:
+        return None
+    strings = data.get("s")
+    if not isinstance(strings, list) or not strings:
+        return None
+    rows = data.get("r")
+    if not isinstance(rows, list):
+        return None
+    try:
+        # Checks that every value is a non-negative int, at C speed.
+        array("L", rows)
+    except (TypeError, OverflowError):
+        return None
+    if len(rows) % _ROW:
+        return None
+    # Range checks up front, so ScheduleDay can index the string table blindly.
+    if rows:
+        for col in (_START, _END):
+            if any(m >= _DAY_MINUTES and m != NO_MINUTE for m in rows[col::_ROW]):
+                return None
+        for col in (_TITLE, _SUBTITLE, _DETAILS_REF, _DETAILS_SUMMARY):
+            if max(rows[col::_ROW]) >= len(strings):
+                return None
+    try:
+        return ScheduleDay(
+            source,
+            day,
+            strings,
+            starts=rows[_START::_ROW],
+            ends=rows[_END::_ROW],
+            titles=rows[_TITLE::_ROW],
+            subtitles=rows[_SUBTITLE::_ROW],
+            details_refs=rows[_DETAILS_REF::_ROW],
+            details_summaries=rows[_DETAILS_SUMMARY::_ROW],
+            features=rows[_ACCESSIBILITY::_ROW],
+        )
+    except (TypeError, OverflowError):
+        return None
+
+
+def _minute_of_day(t: time | None) -> int:
+    m = minute_of_day(t)
+    return NO_MINUTE if m is None else m
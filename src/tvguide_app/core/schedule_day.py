@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import date, time
+from typing import Iterable, Iterator, overload
+
+from tvguide_app.core.models import (
+    AccessibilityFeature,
+    ProviderId,
+    ScheduleItem,
+    Source,
+    intern_source,
+)
+from tvguide_app.core.util import TIMES_OF_DAY, minute_of_day
+
+NO_MINUTE = 0xFFFF
+
+_FEATURE_BITS: dict[str, int] = {"AD": 1, "JM": 2, "N": 4}
+_FEATURES_BY_MASK: tuple[tuple[AccessibilityFeature, ...], ...] = tuple(
+    tuple(f for f, bit in _FEATURE_BITS.items() if mask & bit)  # type: ignore[misc]
+    for mask in range(8)
+)
+
+
+class ScheduleDay(Sequence[ScheduleItem]):
+    """
+    Columnar schedule of one source and day. Times are minute-of-day ints and masks in
+    arrays, strings are indexes into one table (index 0 is None), and ScheduleItem
+    objects are only built on access. `items()` gives the list the GUI works with.
+    """
+
+    __slots__ = (
+        "source",
+        "day",
+        "_provider_id",
+        "_strings",
+        "_starts",
+        "_ends",
+        "_titles",
+        "_subtitles",
+        "_details_refs",
+        "_details_summaries",
+        "_features",
+    )
+
+    def __init__(
+        self,
+        source: Source,
+        day: date,
+        strings: Sequence[str | None],
+        *,
+        starts: Iterable[int],
+        ends: Iterable[int],
+        titles: Iterable[int],
+        subtitles: Iterable[int],
+        details_refs: Iterable[int],
+        details_summaries: Iterable[int],
+        features: Iterable[int],
+    ) -> None:
+        """Raises OverflowError/TypeError on values that do not fit their column."""
+        self.source = intern_source(source)
+        self.day = day
+        self._provider_id = ProviderId(
+            str(getattr(source.provider_id, "value", source.provider_id))
+        )
+        # Titles repeat across days and stations; interning shares them between days.
+        self._strings = tuple(sys.intern(s) if isinstance(s, str) else None for s in strings)
+        self._starts = array("H", starts)
+        self._ends = array("H", ends)
+        self._titles = array("I", titles)
+        self._subtitles = array("I", subtitles)
+        self._details_refs = array("I", details_refs)
+        self._details_summaries = array("I", details_summaries)
+        self._features = array("B", features)
+
+    @classmethod
+    def from_items(cls, source: Source, day: date, items: Iterable[ScheduleItem]) -> ScheduleDay:
+        strings: list[str | None] = [None]
+        index: dict[str, int] = {}
+
+        def intern(value: str | None) -> int:
+            if value is None:
+                return 0
+            idx = index.get(value)
+            if idx is None:
+                idx = len(strings)
+                index[value] = idx
+                strings.append(value)
+            return idx
+
+        items = list(items)
+        return cls(
+            source,
+            day,
+            strings,
+            starts=[_minute(it.start_time) for it in items],
+            ends=[_minute(it.end_time) for it in items],
+            titles=[intern(it.title) for it in items],
+            subtitles=[intern(it.subtitle) for it in items],
+            details_refs=[intern(it.details_ref) for it in items],
+            details_summaries=[intern(it.details_summary) for it in items],
+            features=[accessibility_mask(it.accessibility) for it in items],
+        )
+
+    def with_source(self, source: Source) -> ScheduleDay:
+        """The same columns under another source (e.g. a favorites entry)."""
+        out = ScheduleDay.__new__(ScheduleDay)
+        for name in self.__slots__:
+            setattr(out, name, getattr(self, name))
+        out.source = intern_source(source)
+        out._provider_id = ProviderId(str(getattr(source.provider_id, "value", source.provider_id)))
+        return out
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, index: int) -> ScheduleItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ScheduleItem]: ...
+
+    def __getitem__(self, index: int | slice) -> ScheduleItem | list[ScheduleItem]:
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("schedule index out of range")
+        return self._item(index)
+
+    def __iter__(self) -> Iterator[ScheduleItem]:
+        for i in range(len(self)):
+            yield self._item(i)
+
+    def items(self) -> list[ScheduleItem]:
+        s = self._strings
+        times = TIMES_OF_DAY
+        pid, source, day = self._provider_id, self.source, self.day
+        return [
+            ScheduleItem(
+                pid,
+                source,
+                day,
+                times[start] if start != NO_MINUTE else None,
+                times[end] if end != NO_MINUTE else None,
+                s[title] or "",
+                s[subtitle],
+                s[ref],
+                s[summary],
+                _FEATURES_BY_MASK[mask & 7],
+            )
+            for start, end, title, subtitle, ref, summary, mask in zip(
+                self._starts,
+                self._ends,
+                self._titles,
+                self._subtitles,
+                self._details_refs,
+                self._details_summaries,
+                self._features,
+            )
+        ]
+
+    def accessibility_features(self) -> frozenset[AccessibilityFeature]:
+        mask = 0
+        for m in self._features:
+            mask |= m
+        return frozenset(_FEATURES_BY_MASK[mask & 7])
+
+    def _item(self, i: int) -> ScheduleItem:
+        s = self._strings
+        start = self._starts[i]
+        end = self._ends[i]
+        return ScheduleItem(
+            provider_id=self._provider_id,
+            source=self.source,
+            day=self.day,
+            start_time=TIMES_OF_DAY[start] if start != NO_MINUTE else None,
+            end_time=TIMES_OF_DAY[end] if end != NO_MINUTE else None,
+            title=s[self._titles[i]] or "",
+            subtitle=s[self._subtitles[i]],
+            details_ref=s[self._details_refs[i]],
+            details_summary=s[self._details_summaries[i]],
+            accessibility=_FEATURES_BY_MASK[self._features[i] & 7],
+        )
+
+
+def accessibility_mask(features: Iterable[str] | None) -> int:
+    mask = 0
+    for f in features or ():
+        mask |= _FEATURE_BITS.get(f, 0)
+    return mask
+
+
+def accessibility_from_mask(mask: int) -> tuple[AccessibilityFeature, ...]:
+    return _FEATURES_BY_MASK[mask & 7]
+
+
+def _minute(t: time | None) -> int:
+    m = minute_of_day(t)
+    return NO_MINUTE if m is None else m
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Literal
+
+from tvguide_app.core.models import (
+    AccessibilityFeature,
+    ProviderId,
+    ScheduleItem,
+    Source,
+    SourceId,
+    intern_source,
+)
+from tvguide_app.core.schedule_day import accessibility_from_mask, accessibility_mask
+from tvguide_app.core.util import minute_of_day, time_from_minute
+from tvguide_app.core.write_behind import WriteBehindQueue
+
+ScheduleKind = Literal["tv", "radio", "tv_accessibility", "archive"]
+
+_DAY_MINUTES = 24 * 60
+
+_SourceKey = tuple[str, str, str]
+
+
+class ScheduleStore:
+    """
+    Normalized copy of every schedule the cached providers fetch: one row per item,
+    indexed by day and start minute, so questions across stations ("what is on at
+    20:00", "everything with audio description tonight") are one indexed query instead
+    of decoding a cached blob per station-day.
+
+    Minutes are counted from the start of the broadcast day: items listed after
+    midnight get start_min >= 1440, so a day's schedule stays one contiguous range.
+    """
+
+    def __init__(self, path: Path, *, write_behind: bool = False) -> None:
+        self._path = path
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._init_schema()
+        self._source_refs: dict[_SourceKey, int] = {}
+        self._sources_by_ref: dict[int, tuple[str, Source]] = {}
+        self._days: set[tuple[_SourceKey, str]] = set()
+        self._load_days()
+        self._writer = (
+            WriteBehindQueue(self._conn, self._lock, name="schedule-store-writer")
+            if write_behind
+            else None
+        )
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        with self._lock:
+            self._conn.close()
+
+    def clear(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.execute("DELETE FROM schedule_items")
+            self._conn.commit()
+            self._days.clear()
+
+    def prune(self, *, keep_days: int = 30, keep_archive: bool = True) -> int:
+        """Drops station-days older than `keep_days` (archive days are kept by default)."""
+        cutoff = (date.today() - timedelta(days=int(keep_days))).isoformat()
+        self.flush()
+        with self._lock:
+            archive_clause = (
+                "AND source_ref NOT IN (SELECT id FROM schedule_sources WHERE kind = 'archive')"
+                if keep_archive
+                else ""
+            )
+            cur = self._conn.execute(
+                f"DELETE FROM schedule_items WHERE day < ? {archive_clause}", (cutoff,)
+            )
+            self._conn.commit()
+            pruned = int(cur.rowcount or 0)
+        if pruned:
+            self._load_days()
+        return pruned
+
+    def has_day(self, kind: ScheduleKind, source: Source, day: date) -> bool:
+        with self._lock:
+            return (_source_key(kind, source), day.isoformat()) in self._days
+
+    def replace_day(
+        self, kind: ScheduleKind, source: Source, day: date, items: list[ScheduleItem]
+    ) -> None:
+        key = _source_key(kind, source)
+        day_iso = day.isoformat()
+        rows = _rows_for_day(items)
+        with self._lock:
+            self._days.add((key, day_iso))
+        # Remembered only once committed: a rolled-back insert would leave a dangling id.
+        refs: list[int] = []
+
+        def write(conn: sqlite3.Connection) -> None:
+            ref = self._source_ref(conn, kind, key, source)
+            refs.append(ref)
+            title_ids = self._intern_titles(conn, {r[2] for r in rows})
+            conn.execute(
+                "DELETE FROM schedule_items WHERE source_ref = ? AND day = ?", (ref, day_iso)
+            )
+            conn.executemany(
+                """
+                INSERT INTO schedule_items(
+                  source_ref, day, seq, start_min, end_min, until_min, title_id,
+                  subtitle, details_ref, details_summary, features
+                )
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (ref, day_iso, seq, r[0], r[1], r[7], title_ids[r[2]], r[3], r[4], r[5], r[6])
+                    for seq, r in enumerate(rows)
+                ],
+            )
+
+        def done(error: BaseException | None) -> None:
+            with self._lock:
+                if error is not None:
+                    self._days.discard((key, day_iso))
+                elif refs:
+                    self._remember_source(refs[-1], key, str(source.name))
+
+        if self._writer is not None:
+            self._writer.submit(write, on_done=done)
+            return
+        with self._lock:
+            try:
+                write(self._conn)
+                self._conn.commit()
+            except Exception as e:
+                self._conn.rollback()
+                done(e)
+                raise
+            done(None)
+
+    def query(
+        self,
+        kind: ScheduleKind,
+        day: date,
+        *,
+        start_min: int = 0,
+        end_min: int = 2 * _DAY_MINUTES,
+        sources: Iterable[Source] | None = None,
+        features: Iterable[AccessibilityFeature] = (),
+        limit: int = 10_000,
+    ) -> list[ScheduleItem]:
+        """
+        Items of `day` that overlap [start_min, end_min) (minutes of the broadcast day),
+        optionally only for `sources` and only with all of `features`.
+        """
+        self.flush()
+        mask = accessibility_mask(features)
+        with self._lock:
+            where = ["i.day = ?", "i.start_min < ?", "COALESCE(i.until_min, i.start_min + 1) > ?"]
+            params: list[object] = [day.isoformat(), int(end_min), int(start_min)]
+            if sources is not None:
+                refs = [self._source_refs.get(_source_key(kind, s)) for s in sources]
+                refs = [r for r in refs if r is not None]
+                if not refs:
+                    return []
+                where.append(f"i.source_ref IN ({','.join('?' * len(refs))})")
+                params.extend(refs)
+            else:
+                where.append("i.source_ref IN (SELECT id FROM schedule_sources WHERE kind = ?)")
+                params.append(kind)
+            if mask:
+                where.append("(i.features & ?) = ?")
+                params.extend((mask, mask))
+            rows = self._conn.execute(
+                f"""
+                SELECT i.source_ref, i.start_min, i.end_min, t.title,
+                       i.subtitle, i.details_ref, i.details_summary, i.features
+                FROM schedule_items i JOIN schedule_titles t ON t.id = i.title_id
+                WHERE {' AND '.join(where)}
+                ORDER BY i.start_min, i.source_ref
+                LIMIT ?
+                """,
+                (*params, int(limit)),
+            ).fetchall()
+            return [self._item(day, *row) for row in rows]
+
+    def on_air(
+        self,
+        kind: ScheduleKind,
+        when: datetime,
+        *,
+        sources: Iterable[Source] | None = None,
+        features: Iterable[AccessibilityFeature] = (),
+    ) -> list[ScheduleItem]:
+        """What is on at `when`, including programmes that belong to yesterday's broadcast day."""
+        sources = list(sources) if sources is not None else None
+        minute = when.hour * 60 + when.minute
+        day = when.date()
+        items = self.query(
+            kind, day, start_min=minute, end_min=minute + 1, sources=sources, features=features
+        )
+        items += self.query(
+            kind,
+            day - timedelta(days=1),
+            start_min=minute + _DAY_MINUTES,
+            end_min=minute + _DAY_MINUTES + 1,
+            sources=sources,
+            features=features,
+        )
+        return sorted(items, key=lambda it: str(it.source.name).casefold())
+
+    def _item(
+        self,
+        day: date,
+        source_ref: int,
+        start: int | None,
+        end: int | None,
+        title: str,
+        subtitle: str | None,
+        details_ref: str | None,
+        details_summary: str | None,
+        features: int,
+    ) -> ScheduleItem:
+        provider_id, source = self._sources_by_ref[source_ref]
+        return ScheduleItem(
+            provider_id=ProviderId(provider_id),
+            source=source,
+            day=day,
+            start_time=time_from_minute(start),
+            end_time=time_from_minute(end),
+            title=title,
+            subtitle=subtitle,
+            details_ref=details_ref,
+            details_summary=details_summary,
+            accessibility=accessibility_from_mask(features),
+        )
+
+    def _source_ref(
+        self, conn: sqlite3.Connection, kind: str, key: _SourceKey, source: Source
+    ) -> int:
+        ref = self._source_refs.get(key)
+        name = str(source.name)
+        if ref is not None and self._sources_by_ref[ref][1].name == name:
+            return ref
+        conn.execute(
+            """
+            INSERT INTO schedule_sources(kind, provider_id, source_id, name) VALUES(?, ?, ?, ?)
+            ON CONFLICT(kind, provider_id, source_id) DO UPDATE SET name = excluded.name
+            """,
+            (kind, key[1], key[2], name),
+        )
+        ref = int(
+            conn.execute(
+                "SELECT id FROM schedule_sources"
+                " WHERE kind = ? AND provider_id = ? AND source_id = ?",
+                (kind, key[1], key[2]),
+            ).fetchone()[0]
+        )
+        return ref
+
+    @staticmethod
+    def _intern_titles(conn: sqlite3.Connection, titles: set[str]) -> dict[str, int]:
+        # Looked up in the same transaction: ids cached across writes could outlive a rollback.
+        ordered = sorted(titles)
+        conn.executemany(
+            "INSERT OR IGNORE INTO schedule_titles(title) VALUES(?)", [(t,) for t in ordered]
+        )
+        out: dict[str, int] = {}
+        for i in range(0, len(ordered), 500):
+            chunk = ordered[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for title_id, title in conn.execute(
+                f"SELECT id, title FROM schedule_titles WHERE title IN ({placeholders})",
+                chunk,
+            ):
+                out[str(title)] = int(title_id)
+        return out
+
+    def _remember_source(self, ref: int, key: _SourceKey, name: str) -> None:
+        known = self._sources_by_ref.get(ref)
+        if self._source_refs.get(key) == ref and known is not None and known[1].name == name:
+            return
+        self._source_refs[key] = ref
+        self._sources_by_ref[ref] = (
+            key[1],
+            intern_source(Source(provider_id=ProviderId(key[1]), id=SourceId(key[2]), name=name)),
+        )
+
+    def _load_days(self) -> None:
+        with self._lock:
+            for ref, kind, provider_id, source_id, name in self._conn.execute(
+                "SELECT id, kind, provider_id, source_id, name FROM schedule_sources"
+            ):
+                self._remember_source(
+                    int(ref), (str(kind), str(provider_id), str(source_id)), str(name)
+                )
+            keys = {ref: key for key, ref in self._source_refs.items()}
+            self._days = {
+                (keys[int(ref)], str(day))
+                for ref, day in self._conn.execute(
+                    "SELECT DISTINCT source_ref, day FROM schedule_items"
+                )
+                if int(ref) in keys
+            }
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schedule_sources (
+                  id INTEGER PRIMARY KEY,
+                  kind TEXT NOT NULL,
+                  provider_id TEXT NOT NULL,
+                  source_id TEXT NOT NULL,
+                  name TEXT NOT NULL,
+                  UNIQUE(kind, provider_id, source_id)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schedule_titles (
+                  id INTEGER PRIMARY KEY,
+                  title TEXT NOT NULL UNIQUE
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schedule_items (
+                  source_ref INTEGER NOT NULL,
+                  day TEXT NOT NULL,
+                  seq INTEGER NOT NULL,
+                  start_min INTEGER,
+                  end_min INTEGER,
+                  -- end_min if known, else the next item's start: what "on air" queries use.
+                  until_min INTEGER,
+                  title_id INTEGER NOT NULL,
+                  subtitle TEXT,
+                  details_ref TEXT,
+                  details_summary TEXT,
+                  features INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY(source_ref, day, seq)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_schedule_items_day_start
+                ON schedule_items(day, start_min)
+                """
+            )
+            self._conn.commit()
+
+
+def _source_key(kind: str, source: Source) -> _SourceKey:
+    return (
+        kind,
+        str(getattr(source.provider_id, "value", source.provider_id)),
+        str(getattr(source.id, "value", source.id)),
+    )
+
+
+def _rows_for_day(
+    items: list[ScheduleItem],
+) -> list[tuple[int | None, int | None, str, str | None, str | None, str | None, int, int | None]]:
+    rows: list[list] = []
+    offset = 0
+    prev: int | None = None
+    for it in items:
+        start = minute_of_day(it.start_time)
+        if start is not None:
+            # A start earlier than the previous one means the schedule went past midnight.
+            if prev is not None and start + offset < prev:
+                offset += _DAY_MINUTES
+            start += offset
+            prev = start
+        end = minute_of_day(it.end_time)
+        if end is not None and start is not None:
+            end += offset
+            if end <= start:
+                end += _DAY_MINUTES
+        rows.append(
+            [
+                start,
+                end,
+                str(it.title or ""),
+                it.subtitle,
+                it.details_ref,
+                it.details_summary,
+                accessibility_mask(it.accessibility),
+                end,
+            ]
+        )
+
+    # Items without an end run until the next item starts.
+    next_start: int | None = None
+    for row in reversed(rows):
+        if row[7] is None and row[0] is not None and next_start is not None and next_start > row[0]:
+            row[7] = next_start
+        if row[0] is not None:
+            next_start = row[0]
+    return [tuple(r) for r in rows]  # type: ignore[misc]
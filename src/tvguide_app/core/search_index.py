@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Literal
 
 from tvguide_app.core.models import AccessibilityFeature, ScheduleItem
+from tvguide_app.core.write_behind import WriteBehindQueue
 
 
 SearchKind = Literal["tv", "radio", "tv_accessibility", "archive"]
@@ -31,7 +32,7 @@ class SearchResult:
 
 
 class SearchIndex:
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, *, write_behind: bool = False) -> None:
         self._path = path
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.RLock()
@@ -39,12 +40,24 @@ class SearchIndex:
         self._conn.execute("PRAGMA journal_mode=WAL;")
         self._conn.execute("PRAGMA synchronous=NORMAL;")
         self._init_schema()
+        self._writer = (
+            WriteBehindQueue(self._conn, self._lock, name="search-index-writer")
+            if write_behind
+            else None
+        )
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
 
     def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
         with self._lock:
             self._conn.close()
 
     def clear(self) -> None:
+        self.flush()
         with self._lock:
             self._conn.execute("DELETE FROM search_items")
             self._conn.commit()
@@ -58,6 +71,7 @@ class SearchIndex:
         now = int(time_module.time())
         cutoff = now - int(keep_seconds)
         pruned = 0
+        self.flush()
         with self._lock:
             cur = self._conn.execute(
                 "DELETE FROM search_items WHERE kind <> 'archive' AND indexed_at < ?",
@@ -110,8 +124,8 @@ class SearchIndex:
         if not rows:
             return
 
-        with self._lock:
-            self._conn.executemany(
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany(
                 """
                 INSERT INTO search_items(
                   kind, provider_id, source_id, source_name,
@@ -126,6 +140,12 @@ class SearchIndex:
                 """,
                 rows,
             )
+
+        if self._writer is not None:
+            self._writer.submit(write)
+            return
+        with self._lock:
+            write(self._conn)
             self._conn.commit()
 
     def search(self, query: str, *, kinds: set[SearchKind], limit: int = 500) -> list[SearchResult]:
@@ -135,6 +155,9 @@ class SearchIndex:
         if not kinds:
             kinds = {"tv", "radio", "tv_accessibility", "archive"}
 
+        # Make items queued by the write-behind thread visible to this query.
+        self.flush()
+
         q_norm = q.casefold()
         like = f"%{_escape_like(q_norm)}%"
         kind_list = sorted(kinds)
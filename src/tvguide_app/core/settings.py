@@ -68,6 +68,15 @@ class SettingsStore:
             }
             self._save(self._data)
 
+    def get_archive_crawler_enabled(self) -> bool:
+        with self._lock:
+            return bool(self._data.get("archive_crawler_enabled", False))
+
+    def set_archive_crawler_enabled(self, enabled: bool) -> None:
+        with self._lock:
+            self._data["archive_crawler_enabled"] = bool(enabled)
+            self._save(self._data)
+
     def get_hub_install_id(self) -> str | None:
         with self._lock:
             value = self._data.get("hub_install_id")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class ReadConnectionPool:
+    """
+    Up to `size` query-only connections shared by reader threads. In WAL mode readers do
+    not block each other nor the writer, so they do not need the writer's lock.
+    """
+
+    def __init__(self, path: Path, *, size: int = 4) -> None:
+        self._path = path
+        self._size = max(1, int(size))
+        self._idle: list[sqlite3.Connection] = []
+        self._cond = threading.Condition()
+        self._created = 0
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Readers waiting for a connection must not wait forever.
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self._size:
+                    self._created += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._connect()
+        except BaseException:
+            # Give the slot back so a later reader can retry the open.
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._cond:
+            if not self._closed:
+                self._idle.append(conn)
+                self._cond.notify()
+                return
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA query_only=ON;")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
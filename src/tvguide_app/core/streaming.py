@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+from typing import Any, Iterable, Iterator
+
+_JSON_WS = " \t\r\n"
+_JSON_DELIMITERS = _JSON_WS + ",]"
+
+
+def iter_xml_elements(chunks: Iterable[str | bytes], tag: str) -> Iterator[ET.Element]:
+    """
+    Yields each complete `tag` element (namespace-agnostic) while the document is still
+    arriving, e.g. every <programme> of an XMLTV feed. Elements are cleared after the
+    consumer moves on, so memory stays bounded by one element, not the whole tree.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    suffix = "}" + tag
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _event, elem in parser.read_events():
+            if elem.tag == tag or elem.tag.endswith(suffix):
+                yield elem
+                elem.clear()
+    parser.close()
+    for _event, elem in parser.read_events():
+        if elem.tag == tag or elem.tag.endswith(suffix):
+            yield elem
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """Yields the items of a top-level JSON array as soon as each one is complete."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+    it = iter(chunks)
+    eof = False
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        try:
+            chunk = next(it)
+        except StopIteration:
+            eof = True
+            return False
+        # Drop what has been consumed so the buffer does not grow with the document.
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in _JSON_WS:
+            pos += 1
+        if pos >= len(buf):
+            if more():
+                continue
+            if not started:
+                raise ValueError("Empty JSON document.")
+            raise ValueError("Unterminated JSON array.")
+
+        ch = buf[pos]
+        if not started:
+            if ch != "[":
+                raise ValueError("Expected a JSON array.")
+            started = True
+            pos += 1
+            continue
+        if ch == "]":
+            return
+        if ch == ",":
+            pos += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if more():
+                continue
+            raise
+        if end >= len(buf) or buf[end] not in _JSON_DELIMITERS:
+            # A number may have been cut short ("12" of "123", "4" of "4.5").
+            if more():
+                continue
+            if end < len(buf):
+                raise ValueError(f"Unexpected data after JSON value at {end}.")
+        pos = end
+        yield value
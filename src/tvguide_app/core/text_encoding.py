@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import codecs
+import re
+
+from requests.compat import chardet
+
+# Declarations are expected near the top of the document; never scan further.
+SNIFF_BYTES = 4096
+# Statistical detection is the slow path; it only ever sees this much of the body.
+DETECT_BYTES = 64 * 1024
+
+_CHARSET_PARAM_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_XML_DECL_RE = re.compile(rb"^\s*<\?xml[^>]+encoding\s*=\s*[\"']([\w.:-]+)[\"']", re.IGNORECASE)
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def charset_from_content_type(content_type: str | None) -> str | None:
+    m = _CHARSET_PARAM_RE.search(content_type or "")
+    return _normalize(m.group(1)) if m else None
+
+
+def sniff_declared_encoding(content: bytes) -> str | None:
+    """BOM, <meta charset>, <meta http-equiv> or <?xml encoding?> in the first few KB."""
+    for bom, name in _BOMS:
+        if content.startswith(bom):
+            return name
+    head = content[:SNIFF_BYTES]
+    m = _XML_DECL_RE.search(head) or _META_CHARSET_RE.search(head)
+    if m:
+        return _normalize(m.group(1).decode("ascii", errors="ignore"))
+    return None
+
+
+def decode_body(content: bytes, *, content_type: str | None = None, hint: str | None = None) -> str:
+    """
+    Decodes a response body without running charset detection over all of it:
+    header charset, then BOM / declared encoding, then a per-host hint, then strict
+    UTF-8, and only then detection on the first `DETECT_BYTES`.
+    """
+    for encoding in (
+        charset_from_content_type(content_type),
+        sniff_declared_encoding(content),
+        hint,
+    ):
+        if encoding is None:
+            continue
+        try:
+            return content.decode(encoding, errors="replace")
+        except LookupError:
+            continue
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    detected = _normalize((chardet.detect(content[:DETECT_BYTES]) or {}).get("encoding"))
+    try:
+        return content.decode(detected or "utf-8", errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def _normalize(name: str | None) -> str | None:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
@@ -64,7 +64,20 @@ def parse_time_hhmm(text: str) -> time | None:
     mm = int(m.group(2))
     if hh < 0 or hh > 23 or mm < 0 or mm > 59:
         return None
-    return time(hour=hh, minute=mm)
+    return TIMES_OF_DAY[hh * 60 + mm]
+
+
+# One shared instance per minute of day instead of a new time object per schedule item.
+TIMES_OF_DAY = tuple(time(hour=m // 60, minute=m % 60) for m in range(24 * 60))
+
+
+def minute_of_day(t: time | None) -> int | None:
+    return None if t is None else t.hour * 60 + t.minute
+
+
+def time_from_minute(minute: int | None) -> time | None:
+    # Minutes past 24:00 (after-midnight items of a broadcast day) wrap around.
+    return None if minute is None else TIMES_OF_DAY[minute % len(TIMES_OF_DAY)]
 
 
 def title_case_first(text: str) -> str:
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+WriteOp = Callable[[sqlite3.Connection], None]
+# Called once the op is committed (None) or has failed (the exception).
+WriteDone = Callable[[BaseException | None], None]
+
+_STOP = object()
+_SAVEPOINT = "write_behind_op"
+
+
+class _BatchAborted(Exception):
+    """An op failed in a way that ended the whole transaction (e.g. SQLITE_FULL)."""
+
+
+@dataclass(frozen=True)
+class _Write:
+    op: WriteOp
+    on_done: WriteDone | None
+
+
+@dataclass(frozen=True)
+class WriteBehindStats:
+    queued: int
+    batches: int
+    ops: int
+    errors: int
+
+
+class WriteBehindQueue:
+    """
+    Single writer thread that drains queued SQLite writes and commits them in groups
+    (one transaction per `flush_interval_seconds` or `max_batch` operations), instead of
+    one fsync-bound commit per call. Every op runs in its own savepoint, so a failing op
+    is rolled back alone and reported to its `on_done` callback; the rest of the batch
+    still commits.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        lock: threading.RLock,
+        *,
+        flush_interval_seconds: float = 0.05,
+        max_batch: int = 256,
+        name: str = "sqlite-writer",
+    ) -> None:
+        self._conn = conn
+        self._lock = lock
+        self._interval = max(0.0, float(flush_interval_seconds))
+        self._max_batch = max(1, int(max_batch))
+        self._queue: queue.Queue[object] = queue.Queue()
+        self._closed = False
+        self._batches = 0
+        self._ops = 0
+        self._errors = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, op: WriteOp, *, on_done: WriteDone | None = None) -> None:
+        if self._closed:
+            # Late writes after close() (e.g. from a daemon thread) run synchronously.
+            with self._lock:
+                try:
+                    op(self._conn)
+                    self._conn.commit()
+                except Exception as e:  # noqa: BLE001
+                    self._rollback()
+                    if on_done is None:
+                        raise
+                    on_done(e)
+                    return
+            if on_done is not None:
+                on_done(None)
+            return
+        self._queue.put(_Write(op, on_done))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until everything submitted so far is committed."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> WriteBehindStats:
+        return WriteBehindStats(
+            queued=self._queue.qsize(),
+            batches=self._batches,
+            ops=self._ops,
+            errors=self._errors,
+        )
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch: list[_Write] = []
+            barriers: list[threading.Event] = []
+            stop = False
+            item: object = first
+            deadline = time.monotonic() + self._interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    # Barrier: commit what we have right away.
+                    barriers.append(item)
+                    break
+                batch.append(item)  # type: ignore[arg-type]
+                if len(batch) >= self._max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(batch)
+            for ev in barriers:
+                ev.set()
+            if stop:
+                return
+
+    def _commit(self, batch: list[_Write]) -> None:
+        errors: dict[int, BaseException] = {}
+        with self._lock:
+            while True:
+                try:
+                    self._apply(batch, errors)
+                    self._conn.commit()
+                    self._batches += 1
+                except _BatchAborted:
+                    # Start over without the op that broke the transaction.
+                    self._rollback()
+                    continue
+                except Exception as e:  # noqa: BLE001
+                    log.exception("Write-behind commit failed (%d ops)", len(batch))
+                    self._rollback()
+                    for n in range(len(batch)):
+                        errors.setdefault(n, e)
+                break
+            self._ops += len(batch) - len(errors)
+            self._errors += len(errors)
+
+        for n, write in enumerate(batch):
+            if write.on_done is None:
+                continue
+            try:
+                write.on_done(errors.get(n))
+            except Exception:  # noqa: BLE001
+                log.exception("Write-behind callback failed")
+
+    def _apply(self, batch: list[_Write], errors: dict[int, BaseException]) -> None:
+        if not self._conn.in_transaction:
+            # Explicit, so releasing the first savepoint does not commit on its own.
+            self._conn.execute("BEGIN")
+        for n, write in enumerate(batch):
+            if n in errors:
+                continue
+            self._conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+            try:
+                write.op(self._conn)
+            except Exception as e:  # noqa: BLE001
+                errors[n] = e
+                log.error("Write-behind op failed", exc_info=e)
+                if not self._conn.in_transaction:
+                    raise _BatchAborted from e
+                try:
+                    self._conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+                except sqlite3.Error:
+                    raise _BatchAborted from e
+            self._conn.execute(f"RELEASE {_SAVEPOINT}")
+
+    def _rollback(self) -> None:
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
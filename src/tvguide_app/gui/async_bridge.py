@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine
+
+import wx
+
+
+class AsyncBridge:
+    """
+    Runs an asyncio event loop in a daemon thread so the wx main loop can start
+    coroutines and get their results back on the GUI thread via wx.CallAfter.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        on_success: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> Future:
+        fut = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+        def done(f: Future) -> None:
+            if f.cancelled():
+                return
+            exc = f.exception()
+            if exc is None:
+                wx.CallAfter(on_success, f.result())
+            elif isinstance(exc, Exception):
+                wx.CallAfter(on_error, exc)
+
+        fut.add_done_callback(done)
+        return fut
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="asyncio-bridge", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
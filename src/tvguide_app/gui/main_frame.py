@@ -8,10 +8,16 @@ import threading
 import wx
 from platformdirs import user_cache_dir, user_data_dir
 
-from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.archive_crawler import ArchiveCrawler, CrawlProgress
+from tvguide_app.core.archive_index import ArchiveIndex
+from tvguide_app.core.async_http import AsyncHttpClient
+from tvguide_app.core.cache import SqliteCache, StalePolicy
 from tvguide_app.core.favorites import FavoritesStore
 from tvguide_app.core.hub_api import HubClient
 from tvguide_app.core.http import HttpClient
+from tvguide_app.core.http_transport import HttpTransport
+from tvguide_app.core.rate_limit import HostRateLimiter
+from tvguide_app.core.retry import RetryPolicy
 from tvguide_app.core.app_updates import check_for_app_update
 from tvguide_app.core.provider_packs.loader import PackStore
 from tvguide_app.core.provider_packs.service import ProviderPackService
@@ -21,9 +27,11 @@ from tvguide_app.core.providers.fandom_archive import FandomArchiveProvider
 from tvguide_app.core.providers.polskieradio import PolskieRadioProvider
 from tvguide_app.core.providers.teleman import TelemanProvider
 from tvguide_app.core.schedule_cache import CachedArchiveProvider, CachedScheduleProvider
+from tvguide_app.core.schedule_store import ScheduleStore
 from tvguide_app.core.search_index import SearchIndex
 from tvguide_app.core.settings import SettingsStore
 from tvguide_app.gui.accessibility import install_notebook_accessible
+from tvguide_app.gui.async_bridge import AsyncBridge
 from tvguide_app.gui.feedback_dialog import FeedbackDialog
 from tvguide_app.gui.search_tab import SearchTab
 from tvguide_app.gui.schedule_tabs import ArchiveTab, FavoritesTab, RadioTab, TvAccessibilityTab, TvTab
@@ -34,47 +42,107 @@ class MainFrame(wx.Frame):
         super().__init__(None, title="Programista", size=(1100, 700))
 
         cache_path = self._default_cache_path()
-        self._cache = SqliteCache(cache_path)
-        self._cache.prune_expired()
-
-        self._http = HttpClient(self._cache, user_agent="programista/0.1 (+desktop)")
-        self._search_index = SearchIndex(cache_path.with_name("search.sqlite3"))
+        # Warm-up threads write many small entries; batch them on a single writer thread.
+        self._cache = SqliteCache(
+            cache_path,
+            write_behind=True,
+            max_bytes=512 * 1024 * 1024,
+            namespace_quotas={
+                "teleman:": 192 * 1024 * 1024,
+                "fandom:": 256 * 1024 * 1024,
+                "schedule:v2:": 64 * 1024 * 1024,
+                "parsed:": 32 * 1024 * 1024,
+            },
+            # A long session (warm-up plus archive crawl) must not outgrow the limits.
+            enforce_limits_every_bytes=16 * 1024 * 1024,
+        )
+        # Expired pages are kept for a while so they can be revalidated with a 304.
+        self._cache.prune_expired(grace_seconds=14 * 24 * 3600)
+        # Schedules cached in the previous JSON format are never read again.
+        self._cache.invalidate_prefix("schedule:v1:")
+        self._cache.enforce_limits()
+        threading.Thread(target=self._train_cache_dictionaries, daemon=True).start()
+
+        # One limiter for every client, so all traffic to a host shares its budget.
+        self._rate_limiter = HostRateLimiter()
+        self._http = HttpClient(
+            self._cache,
+            user_agent="programista/0.1 (+desktop)",
+            # If a site is down, keep showing what we fetched before instead of an error.
+            stale_policy=StalePolicy(stale_if_error_seconds=14 * 24 * 3600),
+            # Keep-alive connections shared by all worker threads; the warm-up fans out
+            # to Teleman and the archive crawls Fandom, so those get larger pools.
+            transport=HttpTransport(
+                pool_size=4,
+                host_pool_sizes={"www.teleman.pl": 6, "staratelewizja.fandom.com": 6},
+            ),
+            rate_limiter=self._rate_limiter,
+            # The only form POSTs (Polskie Radio schedule/details) are read-only queries.
+            post_retry_policy=RetryPolicy(),
+        )
+        # Event loop for coroutine fan-outs started from the GUI (results come back via
+        # wx.CallAfter).
+        self._async_bridge = AsyncBridge()
+        # Native async fetches for providers that support them (runs on the bridge's loop).
+        self._async_http = AsyncHttpClient(self._http)
+        self._search_index = SearchIndex(cache_path.with_name("search.sqlite3"), write_behind=True)
         self._search_index.prune()
+        # Item-level copy of every fetched schedule, for queries across stations and days.
+        self._schedule_store = ScheduleStore(
+            cache_path.with_name("schedule.sqlite3"), write_behind=True
+        )
+        self._schedule_store.prune()
+        # What the opt-in archive crawler has found (years, months, days, channels).
+        self._archive_index = ArchiveIndex(cache_path.with_name("archive.sqlite3"))
 
         self._providers = ProviderPackService(
             self._http,
             base_url="https://github.com/michaldziwisz/programista-providers/releases/latest/download/",
             store=PackStore(self._default_providers_path()),
             app_version=self._app_version(),
-            fallback_tv=TelemanProvider(self._http),
+            fallback_tv=TelemanProvider(self._http, async_http=self._async_http),
             fallback_tv_accessibility=EmptyScheduleProvider(),
             fallback_radio=PolskieRadioProvider(self._http),
             fallback_archive=FandomArchiveProvider(self._http, year=date.today().year),
         )
         self._providers.load_installed()
 
+        # Show an expired schedule right away and refresh it in the background, rather
+        # than blocking the tab on a slow upstream.
+        schedule_stale_policy = StalePolicy(
+            stale_while_revalidate_seconds=24 * 3600,
+            stale_if_error_seconds=14 * 24 * 3600,
+        )
         self._tv_provider = CachedScheduleProvider(
             self._providers.runtime.tv,
             self._cache,
             kind="tv",
             ttl_seconds=6 * 3600,
+            stale_policy=schedule_stale_policy,
+            schedule_store=self._schedule_store,
         )
         self._tv_accessibility_provider = CachedScheduleProvider(
             self._providers.runtime.tv_accessibility,
             self._cache,
             kind="tv_accessibility",
             ttl_seconds=24 * 3600,
+            stale_policy=schedule_stale_policy,
+            schedule_store=self._schedule_store,
         )
         self._radio_provider = CachedScheduleProvider(
             self._providers.runtime.radio,
             self._cache,
             kind="radio",
             ttl_seconds=24 * 3600,
+            stale_policy=schedule_stale_policy,
+            schedule_store=self._schedule_store,
         )
         self._archive_provider = CachedArchiveProvider(
             self._providers.runtime.archive,
             self._cache,
             ttl_seconds=365 * 24 * 3600,
+            stale_policy=schedule_stale_policy,
+            schedule_store=self._schedule_store,
         )
 
         self._favorites_store = FavoritesStore(self._default_favorites_path())
@@ -88,10 +156,20 @@ class MainFrame(wx.Frame):
 
         self._status_bar = self.CreateStatusBar()
 
+        # Crawls the uncached provider: the schedule cache and store are for what the user
+        # opens, the crawl only feeds the archive index and search.
+        self._archive_crawler = ArchiveCrawler(
+            self._providers.runtime.archive,
+            self._archive_index,
+            search_index=self._search_index,
+            on_progress=lambda progress: wx.CallAfter(self._on_archive_crawl_progress, progress),
+        )
+
         self._hub = HubClient(
             self._settings_store,
             app_version=self._app_version(),
             user_agent=f"programista/{self._app_version()} (+desktop)",
+            rate_limiter=self._rate_limiter,
         )
 
         self._build_menu()
@@ -99,9 +177,14 @@ class MainFrame(wx.Frame):
         self._install_tab_shortcuts()
         self._auto_update_providers()
         self._ensure_hub_api_key()
+        if self._settings_store.get_archive_crawler_enabled():
+            self._archive_crawler.start()
         self.Bind(wx.EVT_CLOSE, self._on_close)
 
     def _on_close(self, evt: wx.CloseEvent) -> None:
+        # The crawl resumes from the last finished month on the next start.
+        self._archive_crawler.stop(timeout=2.0)
+        # close() flushes the write-behind queues, so nothing queued is lost on exit.
         try:
             self._cache.close()
         except Exception:  # noqa: BLE001
@@ -110,6 +193,20 @@ class MainFrame(wx.Frame):
             self._search_index.close()
         except Exception:  # noqa: BLE001
             pass
+        try:
+            self._schedule_store.close()
+        except Exception:  # noqa: BLE001
+            pass
+        try:
+            self._archive_index.close()
+        except Exception:  # noqa: BLE001
+            pass
+        try:
+            self._http.close()
+        except Exception:  # noqa: BLE001
+            pass
+        self._async_bridge.close()
+        self._async_http.close()
         evt.Skip()
 
     def _install_tab_shortcuts(self) -> None:
@@ -193,11 +290,17 @@ class MainFrame(wx.Frame):
         force_item = data_menu.Append(wx.ID_ANY, "Wymuś odświeżenie\tCtrl+R")
         update_providers_item = data_menu.Append(wx.ID_ANY, "Aktualizuj dostawców\tCtrl+U")
         clear_cache_item = data_menu.Append(wx.ID_ANY, "Wyczyść cache")
+        clear_selected_item = data_menu.Append(wx.ID_ANY, "Wyczyść wybrane dane z cache…")
+        data_menu.AppendSeparator()
+        crawl_item = data_menu.AppendCheckItem(wx.ID_ANY, "Indeksuj całe archiwum w tle")
+        crawl_item.Check(self._settings_store.get_archive_crawler_enabled())
 
         self.Bind(wx.EVT_MENU, self._on_refresh, refresh_item)
         self.Bind(wx.EVT_MENU, self._on_force_refresh, force_item)
         self.Bind(wx.EVT_MENU, self._on_update_providers, update_providers_item)
         self.Bind(wx.EVT_MENU, self._on_clear_cache, clear_cache_item)
+        self.Bind(wx.EVT_MENU, self._on_clear_selected_cache, clear_selected_item)
+        self.Bind(wx.EVT_MENU, self._on_toggle_archive_crawler, crawl_item)
 
         menubar.Append(file_menu, "Plik")
         menubar.Append(data_menu, "Dane")
@@ -334,6 +437,7 @@ class MainFrame(wx.Frame):
             self._status_bar,
             settings_store=self._settings_store,
             search_index=self._search_index,
+            async_bridge=self._async_bridge,
         )
         self._radio_tab = RadioTab(
             self._notebook,
@@ -357,12 +461,14 @@ class MainFrame(wx.Frame):
             settings_store=self._settings_store,
             search_index=self._search_index,
             hub=self._hub,
+            archive_index=self._archive_index,
         )
         self._archive_tab = ArchiveTab(
             self._notebook,
             self._archive_provider,
             self._status_bar,
             search_index=self._search_index,
+            archive_index=self._archive_index,
         )
 
         self._notebook.AddPage(self._tv_tab, "Telewizja")
@@ -410,11 +516,78 @@ class MainFrame(wx.Frame):
     def _on_clear_cache(self, _evt: wx.CommandEvent) -> None:
         self._cache.clear()
         self._search_index.clear()
+        self._schedule_store.clear()
+        # The archive index describes what search has; they are cleared together.
+        self._archive_index.clear()
         self._status_bar.SetStatusText("Wyczyszczono cache.")
         tab = self._active_tab()
         if hasattr(tab, "refresh_all"):
             tab.refresh_all(force=True)
 
+    def _on_clear_selected_cache(self, _evt: wx.CommandEvent) -> None:
+        stats = self._cache.namespace_stats()
+        if not stats:
+            self._status_bar.SetStatusText("Cache jest pusty.")
+            return
+        choices = [
+            f"{s.namespace} — {s.entries} wpisów, {_format_bytes(s.bytes)}"
+            + (f" ({s.expired} nieaktualnych)" if s.expired else "")
+            for s in stats
+        ]
+        dlg = wx.MultiChoiceDialog(
+            self,
+            "Zaznacz dane do usunięcia. Pozostałe (np. archiwum) zostaną zachowane.",
+            "Wyczyść wybrane dane z cache",
+            choices,
+        )
+        try:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
+            selected = dlg.GetSelections()
+        finally:
+            dlg.Destroy()
+        if not selected:
+            return
+
+        removed = 0
+        for idx in selected:
+            removed += self._cache.invalidate_namespace(stats[idx].namespace)
+        self._status_bar.SetStatusText(f"Usunięto z cache {removed} wpisów.")
+        tab = self._active_tab()
+        if hasattr(tab, "refresh_all"):
+            tab.refresh_all(force=False)
+
+    def _on_toggle_archive_crawler(self, evt: wx.CommandEvent) -> None:
+        enabled = bool(evt.IsChecked())
+        self._settings_store.set_archive_crawler_enabled(enabled)
+        if enabled:
+            self._archive_crawler.start()
+            self._status_bar.SetStatusText("Indeksowanie archiwum w tle…")
+        else:
+            self._archive_crawler.stop()
+            self._status_bar.SetStatusText("Zatrzymano indeksowanie archiwum.")
+
+    def _on_archive_crawl_progress(self, progress: CrawlProgress) -> None:
+        if progress.error and progress.year and progress.month:
+            self._status_bar.SetStatusText(
+                f"Indeksowanie archiwum: pominięto {progress.year}-{progress.month:02d}"
+                f" ({progress.error})"
+            )
+        elif progress.error:
+            self._status_bar.SetStatusText(f"Indeksowanie archiwum przerwane: {progress.error}")
+        elif progress.finished and progress.skipped:
+            self._status_bar.SetStatusText(
+                f"Zindeksowano archiwum; pominięte miesiące ({progress.skipped})"
+                " zostaną pobrane przy następnym uruchomieniu."
+            )
+        elif progress.finished:
+            self._status_bar.SetStatusText("Zindeksowano całe archiwum.")
+        elif progress.year and progress.month:
+            self._status_bar.SetStatusText(
+                f"Indeksowanie archiwum: {progress.year}-{progress.month:02d}"
+                f" ({progress.months_done}/{progress.months_total})"
+            )
+
     def _on_favorites_changed(self) -> None:
         self._favorites_tab.refresh_all(force=False)
         self._tv_tab.sync_favorites()
@@ -465,6 +638,17 @@ class MainFrame(wx.Frame):
         msg = str(exc) or "Nieznany błąd."
         self._status_bar.SetStatusText(f"Błąd aktualizacji dostawców: {msg}")
 
+    def _train_cache_dictionaries(self) -> None:
+        # Teleman pages share most of their markup, so a trained zstd dictionary compresses
+        # them far better than zstd alone. Trained once, from pages already in the cache.
+        for prefix in ("teleman:station:", "teleman:show:"):
+            if self._cache.has_dictionary(prefix):
+                continue
+            try:
+                self._cache.train_dictionary(prefix)
+            except Exception:  # noqa: BLE001
+                pass
+
     def _run_in_thread(self, work, *, on_success, on_error) -> None:
         def runner() -> None:
             try:
@@ -475,3 +659,9 @@ class MainFrame(wx.Frame):
             wx.CallAfter(on_success, result)
 
         threading.Thread(target=runner, daemon=True).start()
+
+
+def _format_bytes(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB".replace(".", ",")
+    return f"{max(1, size // 1024)} kB" if size else "0 kB"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import sys
 import time
 import threading
@@ -11,6 +11,7 @@ from typing import Any, Callable, Literal
 import wx
 import wx.dataview as dv
 
+from tvguide_app.core.archive_index import ArchiveIndex
 from tvguide_app.core.favorites import FavoriteKind, FavoriteRef, FavoritesStore, decode_favorite_source_id
 from tvguide_app.core.models import ACCESSIBILITY_FEATURE_LABELS, AccessibilityFeature, ScheduleItem, Source
 from tvguide_app.core.providers.archive_base import ArchiveProvider
@@ -18,10 +19,35 @@ from tvguide_app.core.providers.base import ScheduleProvider
 from tvguide_app.core.search_index import SearchIndex, SearchKind
 from tvguide_app.core.settings import SettingsStore, TvAccessibilityFilters
 from tvguide_app.core.util import POLISH_MONTHS_NOMINATIVE
+from tvguide_app.gui.async_bridge import AsyncBridge
 
 
 ViewMode = Literal["by_source", "by_day"]
 
+_STALE_STATUS = "Gotowe (dane z pamięci podręcznej, odświeżanie w tle)."
+_STALE_ERROR_STATUS = "Gotowe (dane z pamięci podręcznej, błąd odświeżania)."
+
+# Schedules fetched at once while building the accessibility index; hosts are paced by the
+# rate limiter.
+_A11Y_WARM_UP_CONCURRENCY = 8
+
+
+def _get_schedule_with_status(
+    provider: ScheduleProvider | ArchiveProvider,
+    source: Source,
+    day: date,
+    *,
+    force_refresh: bool,
+) -> tuple[list[ScheduleItem], str]:
+    # Cached providers report whether the data was served stale; plain providers never are.
+    get_result = getattr(provider, "get_schedule_result", None)
+    if callable(get_result):
+        result = get_result(source, day, force_refresh=force_refresh)
+        if result.refresh_failed:
+            return result.items, _STALE_ERROR_STATUS
+        return result.items, _STALE_STATUS if result.stale else "Gotowe."
+    return provider.get_schedule(source, day, force_refresh=force_refresh), "Gotowe."
+
 
 @dataclass(frozen=True)
 class NodeData:
@@ -655,19 +681,20 @@ class BaseScheduleTab(wx.Panel):
         self._details.SetValue("")
         self._status_bar.SetStatusText(f"Pobieranie: {source.name} {day.isoformat()}…")
 
-        def work() -> list[ScheduleItem]:
-            return self._provider.get_schedule(source, day, force_refresh=force)
+        def work() -> tuple[list[ScheduleItem], str]:
+            return _get_schedule_with_status(self._provider, source, day, force_refresh=force)
 
-        def on_success(items: list[ScheduleItem]) -> None:
+        def on_success(result: tuple[list[ScheduleItem], str]) -> None:
             if token != self._request_token:
                 return
+            items, status = result
             self._show_schedule(items)
             if self._search_index and self._search_kind:
                 try:
                     self._search_index.add_items(self._search_kind, items)
                 except Exception:  # noqa: BLE001
                     pass
-            self._status_bar.SetStatusText("Gotowe.")
+            self._status_bar.SetStatusText(status)
 
         self._run_in_thread(work, on_success=on_success, on_error=self._on_error)
 
@@ -839,9 +866,11 @@ class TvAccessibilityTab(BaseScheduleTab):
         status_bar: wx.StatusBar,
         *,
         settings_store: SettingsStore,
+        async_bridge: AsyncBridge,
         search_index: SearchIndex | None = None,
     ) -> None:
         self._settings_store = settings_store
+        self._async_bridge = async_bridge
         persisted = self._settings_store.get_tv_accessibility_filters()
         self._filter_ad = bool(persisted.ad)
         self._filter_jm = bool(persisted.jm)
@@ -964,9 +993,6 @@ class TvAccessibilityTab(BaseScheduleTab):
         sources = list(self._sources)
         days = list(self._days)
 
-        def work() -> dict[str, frozenset[AccessibilityFeature] | None]:
-            return self._compute_a11y_pair_features(sources, days)
-
         def on_success(pair_features: dict[str, frozenset[AccessibilityFeature] | None]) -> None:
             if token != self._a11y_index_token:
                 return
@@ -984,9 +1010,13 @@ class TvAccessibilityTab(BaseScheduleTab):
             self._view_choice.Enable()
             self._on_error(exc)
 
-        self._run_in_thread(work, on_success=on_success, on_error=on_error)
+        self._async_bridge.submit(
+            self._compute_a11y_pair_features(sources, days),
+            on_success=on_success,
+            on_error=on_error,
+        )
 
-    def _compute_a11y_pair_features(
+    async def _compute_a11y_pair_features(
         self,
         sources: list[Source],
         days: list[date],
@@ -1000,18 +1030,24 @@ class TvAccessibilityTab(BaseScheduleTab):
         for pid in sources_by_provider:
             if callable(list_days_for_provider):
                 try:
-                    allowed_days_by_provider[pid] = set(list_days_for_provider(pid, force_refresh=False))
+                    days_for_pid = await asyncio.to_thread(
+                        list_days_for_provider, pid, force_refresh=False
+                    )
+                    allowed_days_by_provider[pid] = set(days_for_pid)
                 except Exception:  # noqa: BLE001
                     allowed_days_by_provider[pid] = None
             else:
                 allowed_days_by_provider[pid] = None
 
         # Warm up provider caches concurrently (the expensive part is usually fetching/parsing per day).
-        def warm_up(sample_source: Source, day: date) -> None:
-            try:
-                self._provider.get_schedule(sample_source, day, force_refresh=False)
-            except Exception:  # noqa: BLE001
-                return
+        limit = asyncio.Semaphore(_A11Y_WARM_UP_CONCURRENCY)
+
+        async def warm_up(sample_source: Source, day: date) -> None:
+            async with limit:
+                try:
+                    await self._provider.get_schedule_async(sample_source, day, force_refresh=False)
+                except Exception:  # noqa: BLE001
+                    return
 
         warm_tasks: list[tuple[Source, date]] = []
         for pid, srcs in sources_by_provider.items():
@@ -1023,10 +1059,7 @@ class TvAccessibilityTab(BaseScheduleTab):
             for d in warm_days:
                 warm_tasks.append((sample, d))
 
-        with ThreadPoolExecutor(max_workers=4) as ex:
-            futures = [ex.submit(warm_up, src, d) for src, d in warm_tasks]
-            for f in futures:
-                f.result()
+        await asyncio.gather(*(warm_up(src, d) for src, d in warm_tasks))
 
         out: dict[str, frozenset[AccessibilityFeature] | None] = {}
         for src in sources:
@@ -1038,7 +1071,7 @@ class TvAccessibilityTab(BaseScheduleTab):
                     out[key] = frozenset()
                     continue
                 try:
-                    items = self._provider.get_schedule(src, d, force_refresh=False)
+                    items = await self._provider.get_schedule_async(src, d, force_refresh=False)
                 except Exception:  # noqa: BLE001
                     out[key] = None
                     continue
@@ -1281,11 +1314,15 @@ class ArchiveTab(wx.Panel):
         status_bar: wx.StatusBar,
         *,
         search_index: SearchIndex | None = None,
+        archive_index: ArchiveIndex | None = None,
     ) -> None:
         super().__init__(parent, style=wx.TAB_TRAVERSAL)
         self._provider = provider
         self._status_bar = status_bar
         self._search_index = search_index
+        # Filled by the background crawler: crawled parts of the tree show only the
+        # populated nodes and open without a request.
+        self._archive_index = archive_index
         self._request_token = 0
         self._nav_rows: list[ArchiveNavRow] = []
         self._nav_index_by_key: dict[str, int] = {}
@@ -1435,7 +1472,11 @@ class ArchiveTab(wx.Panel):
     def _rebuild_nav(self, *, preserve_key: str | None = None) -> None:
         selected_key = preserve_key or self._get_selected_nav_key()
 
+        index = self._archive_index
         years = self._provider.list_years()
+        if index is not None:
+            populated_years = set(index.years())
+            years = [y for y in years if y in populated_years or not index.is_year_crawled(y)]
         rows: list[ArchiveNavRow] = []
         for y in reversed(years):
             year_key = self._year_key(y)
@@ -1454,7 +1495,13 @@ class ArchiveTab(wx.Panel):
             if not year_expanded:
                 continue
 
-            for month in range(1, 13):
+            months = list(range(1, 13))
+            if index is not None:
+                populated_months = set(index.months(y))
+                months = [
+                    m for m in months if m in populated_months or not index.is_month_crawled(y, m)
+                ]
+            for month in months:
                 month_key = self._month_key(y, month)
                 month_expanded = month_key in self._expanded
                 rows.append(
@@ -1764,6 +1811,11 @@ class ArchiveTab(wx.Panel):
             month_key = self._month_key(data.year, data.month)
             if month_key in self._month_days or month_key in self._loading:
                 return
+            index = self._archive_index
+            if index is not None and index.is_month_crawled(data.year, data.month):
+                self._month_days[month_key] = index.days(data.year, data.month)
+                self._rebuild_nav(preserve_key=month_key)
+                return
             self._loading.add(month_key)
             self._rebuild_nav(preserve_key=month_key)
             self._status_bar.SetStatusText(f"Ładowanie dni: {data.year}-{data.month:02d}…")
@@ -1789,6 +1841,11 @@ class ArchiveTab(wx.Panel):
             day_key = self._day_key(data.day)
             if day_key in self._day_sources or day_key in self._loading:
                 return
+            index = self._archive_index
+            if index is not None and index.is_month_crawled(data.day.year, data.day.month):
+                self._day_sources[day_key] = index.sources(data.day)
+                self._rebuild_nav(preserve_key=day_key)
+                return
             self._loading.add(day_key)
             self._rebuild_nav(preserve_key=day_key)
             self._status_bar.SetStatusText(f"Ładowanie stacji: {data.day.isoformat()}…")
@@ -1825,19 +1882,20 @@ class ArchiveTab(wx.Panel):
             self._details.SetValue("")
         self._status_bar.SetStatusText(f"Pobieranie: {source.name} {day.isoformat()}…")
 
-        def work() -> list[ScheduleItem]:
-            return self._provider.get_schedule(source, day, force_refresh=force)
+        def work() -> tuple[list[ScheduleItem], str]:
+            return _get_schedule_with_status(self._provider, source, day, force_refresh=force)
 
-        def on_success(items: list[ScheduleItem]) -> None:
+        def on_success(result: tuple[list[ScheduleItem], str]) -> None:
             if token != self._request_token:
                 return
+            items, status = result
             self._show_schedule(items)
             if self._search_index:
                 try:
                     self._search_index.add_items("archive", items)
                 except Exception:  # noqa: BLE001
                     pass
-            self._status_bar.SetStatusText("Gotowe.")
+            self._status_bar.SetStatusText(status)
 
         self._run_in_thread(work, on_success=on_success, on_error=self._on_error)
 
@@ -5,6 +5,7 @@ from datetime import date, time
 
 import wx
 
+from tvguide_app.core.archive_index import ArchiveIndex
 from tvguide_app.core.hub_api import HubClient
 from tvguide_app.core.models import ACCESSIBILITY_FEATURE_LABELS, AccessibilityFeature, ProviderId, ScheduleItem, Source, SourceId
 from tvguide_app.core.providers.base import ScheduleProvider
@@ -202,11 +203,13 @@ class SearchTab(BaseScheduleTab):
         settings_store: SettingsStore,
         search_index: SearchIndex,
         hub: HubClient | None = None,
+        archive_index: ArchiveIndex | None = None,
     ) -> None:
         self._status_bar = status_bar
         self._settings_store = settings_store
         self._index = search_index
         self._hub = hub
+        self._archive_index = archive_index
         self._results: list[SearchResult] = []
         self._search_query: str = ""
         self._search_kinds: set[SearchKind] = set()
@@ -414,8 +417,15 @@ class SearchTab(BaseScheduleTab):
         cursor = None if reset else self._hub_cursor
         kinds = set(self._search_kinds)
 
+        # Once every month that has ended was crawled, the local index has every archive programme.
+        archive_is_local = (
+            kinds == {"archive"}
+            and self._archive_index is not None
+            and self._archive_index.is_complete()
+        )
+
         def work() -> tuple[str, list[SearchResult], str | None]:
-            if self._hub:
+            if self._hub and not archive_is_local:
                 try:
                     results = self._hub.search(query, kinds=kinds, limit=page_size, cursor=cursor)
                     return ("online", results, None)
@@ -462,7 +472,7 @@ class SearchTab(BaseScheduleTab):
                 self._hub_cursor = next_cursor
                 self._has_more = has_more
             else:
-                # Local results are limited to what was already browsed/cached.
+                # Local results are limited to what was already browsed/cached/crawled.
                 self._results = results
                 self._hub_cursor = None
                 self._has_more = False
@@ -0,0 +1,191 @@
+import threading
+from datetime import date
+from pathlib import Path
+
+from tvguide_app.core.archive_crawler import ArchiveCrawler, CrawlProgress
+from tvguide_app.core.archive_index import ArchiveIndex
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.providers.archive_base import ArchiveProvider
+from tvguide_app.core.search_index import SearchIndex
+from tvguide_app.core.util import parse_time_hhmm
+
+
+def _source(name: str) -> Source:
+    return Source(provider_id=ProviderId("fandom-archive"), id=SourceId(name), name=name)
+
+
+class _Archive(ArchiveProvider):
+    def __init__(self, schedules: dict[date, dict[str, list[str]]]) -> None:
+        self._schedules = schedules
+        self.schedule_calls: list[tuple[str, date]] = []
+        self.failing_months: set[tuple[int, int]] = set()
+
+    @property
+    def provider_id(self) -> str:
+        return "fandom-archive"
+
+    @property
+    def display_name(self) -> str:
+        return "Archiwum"
+
+    def list_years(self) -> list[int]:
+        return [1984, 1985]
+
+    def list_days_in_month(
+        self, year: int, month: int, *, force_refresh: bool = False
+    ) -> list[date]:
+        if (year, month) in self.failing_months:
+            raise RuntimeError("HTTP 503")
+        return sorted(d for d in self._schedules if (d.year, d.month) == (year, month))
+
+    def list_sources_for_day(self, day: date, *, force_refresh: bool = False) -> list[Source]:
+        return [_source(name) for name in self._schedules.get(day, {})]
+
+    def get_schedule(
+        self,
+        source: Source,
+        day: date,
+        *,
+        force_refresh: bool = False,
+    ) -> list[ScheduleItem]:
+        self.schedule_calls.append((source.name, day))
+        return [
+            ScheduleItem(
+                provider_id=ProviderId(self.provider_id),
+                source=source,
+                day=day,
+                start_time=parse_time_hhmm(f"{19 + n}:30"),
+                end_time=None,
+                title=title,
+                subtitle=None,
+                details_ref=None,
+                details_summary=None,
+            )
+            for n, title in enumerate(self._schedules[day][source.name])
+        ]
+
+
+SCHEDULES = {
+    date(1984, 12, 24): {"TVP 1": ["Dziennik"], "TVP 2": []},
+    date(1985, 3, 1): {"TVP 1": ["Teleranek", "Dziennik"], "TVP 2": ["Studio 2"]},
+    date(1985, 3, 2): {"TVP 2": ["Teatr Telewizji"]},
+    date(1985, 11, 5): {"TVP 1": ["Kobra"]},
+}
+
+
+def test_crawler_builds_index_and_resumes(tmp_path: Path) -> None:
+    archive = _Archive(SCHEDULES)
+    index = ArchiveIndex(tmp_path / "archive.sqlite3")
+    search = SearchIndex(tmp_path / "search.sqlite3")
+    reports: list[CrawlProgress] = []
+
+    def on_progress(progress: CrawlProgress) -> None:
+        reports.append(progress)
+        if progress.year == 1985 and progress.month == 3:
+            crawler.stop()
+
+    crawler = ArchiveCrawler(
+        archive,
+        index,
+        search_index=search,
+        on_progress=on_progress,
+        today=lambda: date(1985, 12, 10),
+    )
+    # Newest months first; the current month (1985-12) is left for later.
+    stopped = crawler.run()
+    assert (stopped.months_done, stopped.months_total, stopped.finished) == (9, 23, False)
+    assert not index.is_complete(date(1985, 12, 10))
+    assert index.months(1985) == [3, 11]
+    assert index.days(1985, 3) == [date(1985, 3, 1), date(1985, 3, 2)]
+    assert [s.name for s in index.sources(date(1985, 3, 1))] == ["TVP 1", "TVP 2"]
+    assert index.is_month_crawled(1985, 4) and not index.is_month_crawled(1985, 2)
+
+    # A new crawler over the reopened index only visits the months that are left.
+    index.close()
+    index = ArchiveIndex(tmp_path / "archive.sqlite3")
+    archive.schedule_calls.clear()
+    crawler = ArchiveCrawler(archive, index, search_index=search, today=lambda: date(1985, 12, 10))
+    final = crawler.run()
+    assert (final.months_done, final.months_total, final.finished) == (14, 14, True)
+    assert archive.schedule_calls == [("TVP 1", date(1984, 12, 24)), ("TVP 2", date(1984, 12, 24))]
+
+    assert index.is_complete(date(1985, 12, 10))
+    # Complete only up to the months that had ended when it was crawled.
+    assert not index.is_complete(date(1986, 1, 2))
+    assert index.years() == [1984, 1985]
+    assert index.is_year_crawled(1984) and not index.is_year_crawled(1985)
+    # Channels without programmes are left out.
+    assert [s.name for s in index.sources(date(1984, 12, 24))] == ["TVP 1"]
+    assert [r.title for r in search.search("dziennik", kinds={"archive"})] == [
+        "Dziennik",
+        "Dziennik",
+    ]
+
+    index.clear()
+    assert index.years() == [] and not index.is_complete(date(1985, 12, 10))
+
+
+def test_failing_month_is_skipped_and_retried_next_run(tmp_path: Path) -> None:
+    archive = _Archive(SCHEDULES)
+    archive.failing_months.add((1985, 3))
+    index = ArchiveIndex(tmp_path / "archive.sqlite3")
+    reports: list[CrawlProgress] = []
+    crawler = ArchiveCrawler(
+        archive,
+        index,
+        on_progress=reports.append,
+        today=lambda: date(1985, 12, 10),
+        retry_delay_seconds=0,
+    )
+
+    first = crawler.run()
+    assert (first.months_done, first.months_total, first.finished, first.skipped) == (
+        22,
+        23,
+        True,
+        1,
+    )
+    assert [(r.year, r.month, r.error) for r in reports if r.error] == [(1985, 3, "HTTP 503")]
+    assert index.months(1985) == [11] and index.months(1984) == [12]
+    assert not index.is_complete(date(1985, 12, 10))
+
+    archive.failing_months.clear()
+    second = crawler.run()
+    assert (second.months_done, second.months_total, second.skipped) == (1, 1, 0)
+    assert index.months(1985) == [3, 11]
+    assert index.is_complete(date(1985, 12, 10))
+
+
+def test_start_right_after_stop_restarts_the_crawl(tmp_path: Path) -> None:
+    archive = _Archive(SCHEDULES)
+    entered = threading.Event()
+    release = threading.Event()
+    finished = threading.Event()
+    get_schedule = archive.get_schedule
+
+    def blocking_get_schedule(source: Source, day: date, *, force_refresh: bool = False):
+        entered.set()
+        release.wait(5)
+        return get_schedule(source, day, force_refresh=force_refresh)
+
+    archive.get_schedule = blocking_get_schedule  # type: ignore[method-assign]
+    index = ArchiveIndex(tmp_path / "archive.sqlite3")
+
+    def on_progress(progress: CrawlProgress) -> None:
+        if progress.finished:
+            finished.set()
+
+    crawler = ArchiveCrawler(
+        archive, index, on_progress=on_progress, today=lambda: date(1985, 12, 10)
+    )
+    assert crawler.start()
+    assert entered.wait(5)
+    crawler.stop()
+    # The old thread is still inside a request; the new start must not be lost.
+    assert crawler.start()
+    assert crawler.running
+    release.set()
+    assert finished.wait(5)
+    crawler.stop(timeout=5)
+    assert not crawler.running
+    assert index.is_complete(date(1985, 12, 10))
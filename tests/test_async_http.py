@@ -0,0 +1,194 @@
+import asyncio
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import requests
+
+from tvguide_app.core.async_http import AsyncHttpClient
+from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.http import HttpClient
+from tvguide_app.core.models import ScheduleItem, Source
+from tvguide_app.core.providers.base import ScheduleProvider
+from tvguide_app.core.rate_limit import HostPolicy, HostRateLimiter
+
+
+class _CountingSession:
+    """Answers every GET with `body` (default: its URL), tracking how many requests overlap."""
+
+    def __init__(self, body: str | None = None) -> None:
+        self._body = body
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = (self._body or url).encode("utf-8")  # noqa: SLF001
+        resp.headers["Content-Type"] = "text/plain; charset=utf-8"
+        resp.url = url
+        return resp
+
+
+def _client(
+    tmp_path: Path,
+    session: _CountingSession,
+    *,
+    max_concurrent: int,
+    memory_budget_bytes: int = 32 * 1024 * 1024,
+) -> AsyncHttpClient:
+    cache = SqliteCache(tmp_path / "cache.sqlite3", memory_budget_bytes=memory_budget_bytes)
+    policy = HostPolicy(requests_per_second=1000.0, burst=1000, max_concurrent=max_concurrent)
+    http = HttpClient(
+        cache,
+        user_agent="tvguide-app-tests/0.0",
+        rate_limiter=HostRateLimiter({"example.com": policy}),
+        sleep=lambda _s: None,
+    )
+    http._get_session = lambda: session  # type: ignore[method-assign]  # noqa: SLF001
+    return AsyncHttpClient(http, max_workers=8)
+
+
+def test_many_coroutines_respect_host_concurrency(tmp_path: Path) -> None:
+    session = _CountingSession()
+    client = _client(tmp_path, session, max_concurrent=2)
+
+    async def main() -> list[str]:
+        return await asyncio.gather(
+            *(
+                client.get_text(f"https://example.com/{i}", cache_key=f"k{i}", ttl_seconds=60)
+                for i in range(40)
+            )
+        )
+
+    try:
+        texts = asyncio.run(main())
+    finally:
+        client.close()
+
+    assert texts == [f"https://example.com/{i}" for i in range(40)]
+    assert session.calls == 40
+    assert session.max_active <= 2
+
+
+def test_fresh_cache_hits_skip_the_network(tmp_path: Path) -> None:
+    session = _CountingSession()
+    client = _client(tmp_path, session, max_concurrent=4)
+
+    async def main() -> tuple[str, str]:
+        first = await client.get_text("https://example.com/a", cache_key="a", ttl_seconds=60)
+        second = await client.get_text("https://example.com/a", cache_key="a", ttl_seconds=60)
+        return first, second
+
+    try:
+        assert asyncio.run(main()) == ("https://example.com/a", "https://example.com/a")
+    finally:
+        client.close()
+    assert session.calls == 1
+
+
+def test_hits_that_need_sqlite_are_not_read_on_the_event_loop(tmp_path: Path) -> None:
+    session = _CountingSession()
+    client = _client(tmp_path, session, max_concurrent=4, memory_budget_bytes=0)
+    client.sync.get_text("https://example.com/a", cache_key="a", ttl_seconds=60)
+
+    assert client.sync.fresh_response("https://example.com/a", "a", memory_only=True) is None
+    assert client.sync.fresh_response("https://example.com/a", "a") is not None
+    try:
+        text = asyncio.run(client.get_text("https://example.com/a", cache_key="a", ttl_seconds=60))
+    finally:
+        client.close()
+    # Answered from the cache, but through the worker pool.
+    assert text == "https://example.com/a"
+    assert session.calls == 1
+
+
+def test_teleman_fetches_natively_through_the_async_client(tmp_path: Path) -> None:
+    from tvguide_app.core.providers.teleman import TelemanProvider
+
+    session = _CountingSession(
+        """
+        <ul class="stationItems">
+          <li id="prog1"><em>15:05</em>
+            <div class="detail"><a href="/tv/Test-1-123">Test 1</a></div></li>
+          <li id="prog2"><em>16:05</em>
+            <div class="detail"><a href="/tv/Test-2-456">Test 2</a></div></li>
+        </ul>
+        """
+    )
+    client = _client(tmp_path, session, max_concurrent=4)
+    provider = TelemanProvider(client.sync, async_http=client)
+    source = Source(provider_id="teleman", id="TVP-1", name="TVP 1")
+
+    async def main() -> list[list[ScheduleItem]]:
+        days = (date(2024, 1, 1), date(2024, 1, 2))
+        return await asyncio.gather(*(provider.get_schedule_async(source, d) for d in days))
+
+    try:
+        first, second = asyncio.run(main())
+    finally:
+        client.close()
+    assert [it.title for it in first] == ["Test 1", "Test 2"]
+    assert second[1].day == date(2024, 1, 2)
+    assert session.calls == 2
+    assert provider.get_schedule(source, date(2024, 1, 1))[0].title == "Test 1"
+    assert session.calls == 2
+
+
+class _SyncOnlyProvider(ScheduleProvider):
+    @property
+    def provider_id(self) -> str:
+        return "sync"
+
+    @property
+    def display_name(self) -> str:
+        return "Sync"
+
+    def list_sources(self, *, force_refresh: bool = False) -> list[Source]:
+        return [Source(provider_id="sync", id="tvp1", name="TVP 1")]
+
+    def list_days(self, *, force_refresh: bool = False) -> list[date]:
+        return [date(2024, 1, 1)]
+
+    def get_schedule(
+        self, source: Source, day: date, *, force_refresh: bool = False
+    ) -> list[ScheduleItem]:
+        return [
+            ScheduleItem(
+                provider_id="sync",
+                source=source,
+                day=day,
+                start_time=None,
+                end_time=None,
+                title=threading.current_thread().name,
+                subtitle=None,
+                details_ref=None,
+                details_summary=None,
+            )
+        ]
+
+    def get_item_details(self, item: ScheduleItem, *, force_refresh: bool = False) -> str:
+        return ""
+
+
+def test_sync_provider_gets_async_methods_through_worker_threads() -> None:
+    provider = _SyncOnlyProvider()
+
+    async def main() -> tuple[list[Source], list[ScheduleItem]]:
+        sources = await provider.list_sources_async()
+        items = await provider.get_schedule_async(sources[0], date(2024, 1, 1))
+        return sources, items
+
+    sources, items = asyncio.run(main())
+    assert [s.id for s in sources] == ["tvp1"]
+    assert items[0].title != threading.current_thread().name
@@ -0,0 +1,460 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tvguide_app.core.cache import SqliteCache
+
+
+def test_cache_roundtrip_and_compression(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.set_text("small", "abc", ttl_seconds=60)
+    big = "x" * 250_000
+    cache.set_text("big", big, ttl_seconds=60)
+    cache.set_json("json", {"a": [1, 2]}, ttl_seconds=60)
+
+    assert cache.get_text("small") == "abc"
+    assert cache.get_text("big") == big
+    assert cache.get_json("json") == {"a": [1, 2]}
+    assert cache.get_text("missing") is None
+
+
+def test_expired_entry_keeps_validators_until_pruned(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.set_text(
+        "k", "body", ttl_seconds=-10, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT"
+    )
+
+    assert cache.get_text("k") is None
+    entry = cache.get_entry("k")
+    assert entry is not None
+    assert entry.is_expired()
+    assert entry.value == "body"
+    assert entry.etag == '"v1"'
+
+    assert cache.touch("k", ttl_seconds=60) is True
+    assert cache.get_text("k") == "body"
+    assert cache.get_entry("k").etag == '"v1"'
+
+    cache.set_text("old", "x", ttl_seconds=-3600)
+    assert cache.prune_expired(grace_seconds=60) == 1
+    assert cache.get_entry("old") is None
+
+
+def test_cache_migrates_legacy_schema(tmp_path: Path) -> None:
+    import sqlite3
+
+    path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+        " fetched_at INTEGER NOT NULL, expires_at INTEGER NOT NULL)"
+    )
+    now = int(time.time())
+    conn.execute("INSERT INTO cache_entries VALUES('k', 'legacy', ?, ?)", (now, now + 60))
+    conn.commit()
+    conn.close()
+
+    cache = SqliteCache(path)
+    assert cache.get_text("k") == "legacy"
+    entry = cache.get_entry("k")
+    assert entry is not None and entry.etag is None
+    assert [(s.namespace, s.entries) for s in cache.namespace_stats()] == [("k", 1)]
+
+
+def test_memory_tier_serves_decoded_json_and_counts_hits(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.set_json("k", {"a": 1}, ttl_seconds=60)
+
+    first = cache.get_json("k")
+    second = cache.get_json("k")
+    assert first == {"a": 1}
+    assert second is first
+    stats = cache.stats()
+    assert stats.memory_hits >= 2
+    assert stats.memory_entries == 1
+
+    # Write-through: a new value replaces the decoded object.
+    cache.set_json("k", {"a": 2}, ttl_seconds=60)
+    assert cache.get_json("k") == {"a": 2}
+
+    cache.clear()
+    assert cache.get_json("k") is None
+    assert cache.stats().memory_entries == 0
+
+
+def test_memory_tier_keeps_decoded_form(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.set_json("k", [1, 2, 3], ttl_seconds=60)
+    calls = []
+
+    def decode(data):
+        calls.append(data)
+        return tuple(data)
+
+    assert cache.get_decoded("k", decode) == (1, 2, 3)
+    assert cache.get_decoded("k", decode) is cache.get_decoded("k", decode)
+    assert len(calls) == 1
+
+    cache.set_json("k", [4], ttl_seconds=60)
+    assert cache.get_decoded("k", decode) == (4,)
+    assert cache.get_decoded("missing", decode) is None
+
+
+def test_memory_tier_respects_byte_budget(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3", memory_budget_bytes=4_000)
+    for i in range(10):
+        cache.set_text(f"k{i}", str(i) * 900, ttl_seconds=60)
+
+    stats = cache.stats()
+    assert stats.memory_bytes <= 4_000
+    assert stats.memory_entries < 10
+    # Evicted entries are still read from SQLite.
+    assert cache.get_text("k0") == "0" * 900
+
+
+def test_memory_tier_can_be_disabled(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3", memory_budget_bytes=0)
+    cache.set_text("k", "v", ttl_seconds=60)
+    assert cache.get_text("k") == "v"
+    assert cache.stats().memory_entries == 0
+
+
+def test_write_behind_reads_pending_writes_and_flushes_on_close(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = SqliteCache(path, memory_budget_bytes=0, write_behind=True)
+    for i in range(50):
+        cache.set_text(f"k{i}", f"v{i}", ttl_seconds=60)
+    # Visible before the writer thread has committed anything.
+    assert cache.get_text("k49") == "v49"
+    assert cache.touch("k0", ttl_seconds=120) is True
+    cache.close()
+
+    reopened = SqliteCache(path)
+    assert reopened.get_text("k0") == "v0"
+    assert reopened.get_text("k49") == "v49"
+
+
+def test_pooled_reads_see_pending_writes_until_the_batch_commits(tmp_path: Path) -> None:
+    # Values this large skip the memory tier, so reads go to the connection pool.
+    cache = SqliteCache(tmp_path / "cache.sqlite3", memory_budget_bytes=4000, write_behind=True)
+    cache.set_text("k", "a" * 5000, ttl_seconds=60)
+    cache.flush()
+
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold_batch_open(_conn: sqlite3.Connection) -> None:
+        entered.set()
+        release.wait(5)
+
+    cache.set_text("k", "b" * 5000, ttl_seconds=60)
+    cache._writer.submit(hold_batch_open)  # noqa: SLF001
+    assert entered.wait(5)
+    # The new row is written but not committed yet.
+    assert cache.get_text("k") == "b" * 5000
+    release.set()
+    cache.flush()
+    assert cache.get_text("k") == "b" * 5000
+    cache.close()
+
+
+def test_reader_during_a_write_cannot_pin_the_old_value(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import tvguide_app.core.cache as cache_module
+
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.set_text("k", "old", ttl_seconds=60)
+    upsert_op = cache_module._upsert_op  # noqa: SLF001
+    read_row = cache._read_row  # noqa: SLF001
+    row_read = threading.Event()
+    release = threading.Event()
+    seen: list[str | None] = []
+
+    def slow_read_row(key: str):
+        row = read_row(key)
+        # Hold the old row until the writer has committed and written through.
+        row_read.set()
+        release.wait(5)
+        return row
+
+    def upsert_with_reader(entry, encoded):
+        write = upsert_op(entry, encoded)
+
+        def op(conn: sqlite3.Connection) -> None:
+            write(conn)
+            cache._read_row = slow_read_row  # noqa: SLF001
+            threading.Thread(target=lambda: seen.append(cache.get_text("k"))).start()
+            assert row_read.wait(5)
+            cache._read_row = read_row  # noqa: SLF001
+
+        return op
+
+    monkeypatch.setattr(cache_module, "_upsert_op", upsert_with_reader)
+    cache.set_text("k", "new", ttl_seconds=60)
+    release.set()
+    deadline = time.monotonic() + 5
+    while not seen and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert seen == ["old"]
+    assert cache.get_text("k") == "new"
+    cache.close()
+
+
+def test_streamed_write_replaces_cached_value_in_write_behind_mode(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3", write_behind=True)
+    cache.set_text("k", "old", ttl_seconds=60)
+    assert cache.get_text("k") == "old"
+
+    writer = cache.stream_writer("k", ttl_seconds=60, etag='"v2"')
+    for chunk in ("<tv>", "new" * 2000, "</tv>"):
+        writer.write(chunk)
+    writer.commit()
+    expected = "<tv>" + "new" * 2000 + "</tv>"
+    # Readable before the writer thread commits it, and never served from the stale copy.
+    assert cache.get_text("k") == expected
+    cache.flush()
+    assert cache.get_text("k") == expected
+    assert cache.get_entry("k").etag == '"v2"'
+    cache.close()
+
+
+def test_concurrent_reads_through_connection_pool(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = SqliteCache(tmp_path / "cache.sqlite3", memory_budget_bytes=0, read_connections=2)
+    for i in range(20):
+        cache.set_text(f"k{i}", f"v{i}", ttl_seconds=60)
+
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        results = list(ex.map(lambda i: cache.get_text(f"k{i % 20}"), range(200)))
+    assert results == [f"v{i % 20}" for i in range(200)]
+    cache.close()
+
+
+def test_enforce_limits_evicts_least_recently_used_per_namespace(tmp_path: Path) -> None:
+    cache = SqliteCache(
+        tmp_path / "cache.sqlite3",
+        max_bytes=8_500,
+        namespace_quotas={"teleman:": 3_000},
+    )
+    for i in range(5):
+        cache.set_text(f"teleman:{i}", "t" * 1_000, ttl_seconds=60)
+    for i in range(5):
+        cache.set_text(f"fandom:{i}", "f" * 1_000, ttl_seconds=60)
+    cache.set_text("fandom:expired", "e" * 1_000, ttl_seconds=-10)
+
+    # Make teleman:0 the most recently used entry.
+    conn = cache._conn  # noqa: SLF001
+    with cache._lock:  # noqa: SLF001
+        conn.execute("UPDATE cache_entries SET accessed_at = accessed_at - 100")
+        conn.commit()
+    assert cache.get_text("teleman:0") is not None
+
+    result = cache.enforce_limits()
+    assert result.entries == 3
+    assert cache.disk_usage("teleman:") == 3_000
+    assert cache.get_entry("teleman:0") is not None
+    assert cache.get_entry("fandom:expired") is None
+    assert cache.disk_usage() == 8_000
+
+    cache2 = SqliteCache(tmp_path / "small.sqlite3", max_bytes=2_500)
+    for i in range(5):
+        cache2.set_text(f"k{i}", "x" * 1_000, ttl_seconds=60)
+    assert cache2.enforce_limits().entries == 3
+    assert cache2.disk_usage() == 2_000
+
+
+def test_limits_are_enforced_during_a_long_session(tmp_path: Path) -> None:
+    import random
+
+    cache = SqliteCache(
+        tmp_path / "cache.sqlite3",
+        write_behind=True,
+        max_bytes=50_000,
+        enforce_limits_every_bytes=10_000,
+    )
+    rnd = random.Random(1)
+    written = 0
+    for i in range(200):
+        value = "".join(rnd.choice("0123456789abcdef") for _ in range(2_000))
+        cache.set_text(f"k{i}", value, ttl_seconds=60)
+        written += len(value)
+        if i % 20 == 19:
+            deadline = time.monotonic() + 5
+            while cache._enforcing:  # noqa: SLF001
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert cache.disk_usage() <= 50_000 + 10_000
+    assert written > 5 * 50_000
+    assert cache.get_text("k199") is not None
+    cache.close()
+
+
+def test_cache_switches_existing_file_to_incremental_vacuum(tmp_path: Path) -> None:
+    import sqlite3
+
+    path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                 " fetched_at INTEGER NOT NULL, expires_at INTEGER NOT NULL)")
+    conn.commit()
+    conn.close()
+
+    cache = SqliteCache(path)
+    with cache._lock:  # noqa: SLF001
+        assert cache._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # noqa: SLF001
+
+
+def test_new_cache_file_returns_deleted_pages(tmp_path: Path) -> None:
+    from tvguide_app.core.cache_codec import ValueCodec
+
+    path = tmp_path / "cache.sqlite3"
+    cache = SqliteCache(path, codec=ValueCodec(min_bytes=1 << 30))
+
+    def pragma(name: str) -> int:
+        with cache._lock:  # noqa: SLF001
+            return cache._conn.execute(f"PRAGMA {name}").fetchone()[0]  # noqa: SLF001
+
+    # Incremental from the first open, without a rebuild on the next one.
+    assert pragma("auto_vacuum") == 2
+    for i in range(40):
+        cache.set_text(f"k{i}", str(i) * 20_000, ttl_seconds=60)
+    pages = pragma("page_count")
+
+    cache.clear()
+    assert pragma("freelist_count") == 0
+    assert pragma("page_count") < pages // 4
+
+
+def _stored_codec(cache: SqliteCache, key: str) -> tuple[str | None, int | None, int]:
+    cache.flush()
+    with cache._lock:  # noqa: SLF001
+        return cache._conn.execute(  # noqa: SLF001
+            "SELECT codec, dict_id, size_bytes FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+
+
+def test_set_bytes_stores_the_body_undecoded(tmp_path: Path) -> None:
+    import json
+
+    data = json.dumps({"items": ["Zażółć"] * 2000}, ensure_ascii=False).encode("utf-8")
+    cache = SqliteCache(tmp_path / "cache.sqlite3", write_behind=True)
+    cache.set_bytes("big", data, ttl_seconds=60, etag='"v1"')
+    cache.set_bytes("small", b"[1]", ttl_seconds=60)
+    assert cache.get_json("big") == json.loads(data)
+    cache.flush()
+    assert cache.get_json("big") == json.loads(data)
+    assert cache.get_json("small") == [1]
+    assert cache.get_entry("big").etag == '"v1"'
+    assert cache.disk_usage() < len(data)
+    cache.close()
+
+
+def test_codec_column_records_how_values_are_stored(tmp_path: Path) -> None:
+    import random
+
+    from tvguide_app.core.cache_codec import ValueCodec, zstd_available
+
+    cache = SqliteCache(tmp_path / "cache.sqlite3", memory_budget_bytes=0)
+    page = "<li class='item'><em>20:00</em> Wiadomości</li>\n" * 500
+    cache.set_text("page", page, ttl_seconds=60)
+    cache.set_text("small", "abc", ttl_seconds=60)
+
+    codec, _, size = _stored_codec(cache, "page")
+    assert codec == ("zstd" if zstd_available() else "zlib")
+    assert size < len(page) // 10
+    assert _stored_codec(cache, "small")[0] == "text"
+    assert cache.get_text("page") == page
+
+    # Compression that saves too little is not kept.
+    rnd = random.Random(1)
+    noise = "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(5_000))
+    picky = SqliteCache(tmp_path / "picky.sqlite3", codec=ValueCodec(min_saving=0.5))
+    picky.set_text("noise", noise, ttl_seconds=60)
+    assert _stored_codec(picky, "noise")[0] == "text"
+    assert picky.get_text("noise") == noise
+
+    zlib_cache = SqliteCache(tmp_path / "zlib.sqlite3", codec=ValueCodec(use_zstd=False))
+    zlib_cache.set_text("page", page, ttl_seconds=60)
+    assert _stored_codec(zlib_cache, "page")[0] == "zlib"
+
+
+def test_legacy_compressed_rows_are_still_readable(tmp_path: Path) -> None:
+    import sqlite3
+    import zlib
+
+    path = tmp_path / "cache.sqlite3"
+    SqliteCache(path).close()
+    conn = sqlite3.connect(path)
+    now = int(time.time())
+    conn.execute(
+        "INSERT INTO cache_entries(key, value, fetched_at, expires_at) VALUES('k', ?, ?, ?)",
+        (zlib.compress("legacy".encode("utf-8")), now, now + 60),
+    )
+    conn.commit()
+    conn.close()
+
+    assert SqliteCache(path).get_text("k") == "legacy"
+
+
+def test_trained_dictionary_is_persisted_and_used(tmp_path: Path) -> None:
+    pytest.importorskip("zstandard")
+    path = tmp_path / "cache.sqlite3"
+    cache = SqliteCache(path, memory_budget_bytes=0)
+    for i in range(60):
+        body = "".join(
+            f"<li><a href='/tv/show-{i}-{j}'>Program {i * j}</a><span>{j:02d}:00</span></li>"
+            for j in range(60)
+        )
+        cache.set_text(f"teleman:station:tvp{i}:2024-01-01", body, ttl_seconds=60)
+
+    dict_id = cache.train_dictionary("teleman:station:", dict_size=4096)
+    assert dict_id is not None
+    assert cache.has_dictionary("teleman:station:")
+    cache.set_text("teleman:station:new", body, ttl_seconds=60)
+    assert _stored_codec(cache, "teleman:station:new")[:2] == ("zstd-dict", dict_id)
+    cache.close()
+
+    reopened = SqliteCache(path)
+    assert reopened.has_dictionary("teleman:station:")
+    assert reopened.get_text("teleman:station:new") == body
+
+
+def test_cache_namespace_groups_keys() -> None:
+    from tvguide_app.core.cache_keys import cache_namespace
+
+    assert cache_namespace("teleman:station:tvp1:2024-01-01") == "teleman:station"
+    assert cache_namespace("pr:multischedule:2024-01-01") == "pr:multischedule"
+    assert cache_namespace("fandom:wikitext:1 stycznia 1990:json") == "fandom:wikitext"
+    assert cache_namespace("schedule:v1:tv:teleman:tvp1:2024-01-01") == "schedule:v1:tv"
+    assert cache_namespace("teleman:home") == "teleman:home"
+    assert cache_namespace("app_update/latest") == "app_update/latest"
+
+
+def test_invalidate_namespace_and_prefix_keep_other_data(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3", write_behind=True)
+    cache.set_text("teleman:station:tvp1:2024-01-01", "a" * 100, ttl_seconds=60)
+    cache.set_text("teleman:station:tvp2:2024-01-01", "b" * 100, ttl_seconds=60)
+    cache.set_text("teleman:show:1", "c", ttl_seconds=-10)
+    cache.set_text("fandom:wikitext:1990", "d" * 50, ttl_seconds=60)
+    cache.set_text("schedule:v1:tv:teleman:tvp1:2024-01-01", "[]", ttl_seconds=60)
+
+    stats = {s.namespace: s for s in cache.namespace_stats()}
+    assert stats["teleman:station"].entries == 2
+    assert stats["teleman:station"].bytes == 200
+    assert stats["teleman:show"].expired == 1
+    assert set(stats) == {"teleman:station", "teleman:show", "fandom:wikitext", "schedule:v1:tv"}
+
+    assert cache.invalidate_prefix("teleman:station:tvp1:") == 1
+    assert cache.get_entry("teleman:station:tvp1:2024-01-01") is None
+    assert cache.get_text("teleman:station:tvp2:2024-01-01") == "b" * 100
+
+    assert cache.invalidate_namespace("teleman") == 2
+    assert cache.invalidate_namespace("schedule:v1:tv") == 1
+    assert [s.namespace for s in cache.namespace_stats()] == ["fandom:wikitext"]
+    assert cache.get_text("fandom:wikitext:1990") == "d" * 50
+    cache.close()
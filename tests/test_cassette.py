@@ -0,0 +1,97 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.cassette import Cassette, CassetteMissError, CassetteTransport, ReplayAdapter
+from tvguide_app.core.http import HttpClient
+from tvguide_app.core.rate_limit import HostRateLimiter
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, body: str) -> None:
+        data = body.encode("cp1250")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=windows-1250")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._reply(f"Źródło {self.path}")
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("ascii")
+        self._reply(f"Formularz {body}")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _http(tmp_path: Path, name: str, transport: CassetteTransport) -> HttpClient:
+    return HttpClient(
+        SqliteCache(tmp_path / f"{name}.sqlite3"),
+        user_agent="t",
+        transport=transport,
+        rate_limiter=HostRateLimiter({}),
+    )
+
+
+def test_recorded_exchanges_replay_offline(tmp_path: Path, server_url: str) -> None:
+    path = tmp_path / "site.cassette.gz"
+    recorder = _http(tmp_path, "rec", CassetteTransport(Cassette(path), mode="record"))
+    assert recorder.get_text(f"{server_url}/a") == "Źródło /a"
+    assert recorder.post_form_text(f"{server_url}/form", {"q": "1"}) == "Formularz q=1"
+    recorder.close()
+
+    cassette = Cassette(path)
+    assert len(cassette) == 2
+    replay = _http(tmp_path, "replay", CassetteTransport(cassette))
+    assert replay.get_response(f"{server_url}/a").text == "Źródło /a"
+    assert replay.post_form_text(f"{server_url}/form", {"q": "1"}) == "Formularz q=1"
+    # Different form data is a different request.
+    with pytest.raises(CassetteMissError):
+        replay.post_form_text(f"{server_url}/form", {"q": "2"})
+    chunks = list(replay.iter_text(f"{server_url}/a", chunk_size=3))
+    assert "".join(chunks) == "Źródło /a"
+
+
+def test_replay_simulates_latency_and_bandwidth(tmp_path: Path, server_url: str) -> None:
+    path = tmp_path / "site.cassette.gz"
+    recorder = _http(tmp_path, "rec", CassetteTransport(Cassette(path), mode="record"))
+    recorder.get_text(f"{server_url}/" + "x" * 992)  # 1000-byte body
+    recorder.close()
+
+    sleeps: list[float] = []
+    adapter = ReplayAdapter(
+        Cassette(path),
+        latency_seconds=0.05,
+        bandwidth_bytes_per_second=10_000,
+        sleep=sleeps.append,
+    )
+    sess = requests.Session()
+    sess.mount("http://", adapter)
+    resp = sess.get(f"{server_url}/" + "x" * 992)
+
+    assert resp.headers["ETag"] == '"v1"'
+    assert len(resp.content) == 1000
+    assert sleeps[0] == 0.05
+    assert sum(sleeps[1:]) == pytest.approx(0.1)
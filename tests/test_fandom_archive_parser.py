@@ -1,6 +1,18 @@
-from datetime import date
-
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.http import HttpClient
+from tvguide_app.core.models import ProviderId, Source, SourceId
 from tvguide_app.core.providers.fandom_archive import (
+    FandomArchiveProvider,
+    FandomDayPage,
     date_to_fandom_page_title_candidates,
     extract_channel_schedule_from_wikitext,
     extract_channels_from_wikitext,
@@ -9,6 +21,8 @@ from tvguide_app.core.providers.fandom_archive import (
     split_schedule_entries,
     split_title_subtitle,
 )
+from tvguide_app.core.providers.fandom_days import FandomDayIndex
+from tvguide_app.core.rate_limit import HostRateLimiter
 
 
 def test_parse_channel_from_category_title() -> None:
@@ -176,3 +190,217 @@ CZWARTEK
     block = extract_channel_schedule_from_wikitext(wikitext, "TVP 1")
     entries = split_schedule_entries(block)
     assert entries[0].startswith("19.25 ")
+
+
+def test_day_page_parses_all_channels_once() -> None:
+    wikitext = """
+=== TVP 1 ===
+16.45 Program dnia<br />17.00 Teleexpress - wydanie główne
+=== TVP 2 ===
+18 10 Studio Sport
+"""
+    page = FandomDayPage(wikitext)
+    assert page.channels == ("TVP 1", "TVP 2")
+    entries = page.all_entries()
+    assert entries["TVP 1"][1] == (
+        time(17, 0),
+        "Teleexpress",
+        "wydanie główne",
+        "Teleexpress - wydanie główne",
+    )
+    assert entries["TVP 2"] == [(time(18, 10), "Studio Sport", None, "Studio Sport")]
+    assert page.entries("Program 1") is entries["TVP 1"]
+
+
+def test_provider_reuses_parsed_day_page() -> None:
+    wikitext = "=== TVP 1 ===\n19.30 Dziennik<br />20.00 Film\n=== TVP 2 ===\n20.00 Teatr"
+    provider = FandomArchiveProvider(None, year=1985)  # type: ignore[arg-type]
+    provider._get_day_wikitext = (  # type: ignore[method-assign]
+        lambda day, *, force_refresh: wikitext
+    )
+    day = date(1985, 3, 1)
+
+    page = provider._get_day_page(day, force_refresh=False)
+    assert provider._get_day_page(day, force_refresh=False) is page
+    assert [s.name for s in provider.list_sources_for_day(day)] == ["TVP 1", "TVP 2"]
+    tvp1 = Source(provider_id=ProviderId("fandom_archive"), id=SourceId("TVP 1"), name="TVP 1")
+    items = provider.get_schedule(tvp1, day)
+    assert [(it.start_time, it.end_time, it.title) for it in items] == [
+        (time(19, 30), time(20, 0), "Dziennik"),
+        (time(20, 0), None, "Film"),
+    ]
+
+
+class _FakeWiki:
+    """A tiny MediaWiki API that returns at most two results per response."""
+
+    def __init__(self, pages: dict[str, str], redirects: dict[str, str]) -> None:
+        self._pages = pages
+        self._redirects = redirects
+        self.log: list[dict] = []
+        self.calls: list[dict[str, list[str]]] = []
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        params = parse_qs(urlsplit(url).query)
+        self.calls.append(params)
+        if params.get("list") == ["allpages"]:
+            data = self._allpages(params)
+        elif params.get("list") == ["logevents"]:
+            data = {"query": {"logevents": self.log}}
+        else:
+            data = self._revisions(params)
+        data["curtimestamp"] = f"2026-10-{len(self.calls):02d}T00:00:00Z"
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = json.dumps(data).encode("utf-8")  # noqa: SLF001
+        resp.encoding = "utf-8"
+        resp.url = url
+        return resp
+
+    def _allpages(self, params: dict[str, list[str]]) -> dict:
+        prefix = params["apprefix"][0]
+        titles = sorted(t for t in (*self._pages, *self._redirects) if t.startswith(prefix))
+        skip = int(params.get("apcontinue", ["0"])[0])
+        data: dict = {"query": {"allpages": [{"title": t} for t in titles[skip : skip + 2]]}}
+        if skip + 2 < len(titles):
+            data["continue"] = {"apcontinue": str(skip + 2), "continue": "-||"}
+        return data
+
+    def _revisions(self, params: dict[str, list[str]]) -> dict:
+        titles = params["titles"][0].split("|")
+        skip = int(params.get("rvcontinue", ["0"])[0])
+        redirects = [{"from": t, "to": self._redirects[t]} for t in titles if t in self._redirects]
+        pages = []
+        for title in dict.fromkeys(self._redirects.get(t, t) for t in titles):
+            if title in self._pages:
+                pages.append({"title": title, "revisions": []})
+            else:
+                pages.append({"title": title, "missing": True})
+        with_content = [p for p in pages if "revisions" in p]
+        for page in with_content[skip : skip + 2]:
+            page["revisions"] = [{"slots": {"main": {"content": self._pages[page["title"]]}}}]
+        data: dict = {"query": {"redirects": redirects, "pages": pages}}
+        if skip + 2 < len(with_content):
+            data["continue"] = {"rvcontinue": str(skip + 2), "continue": "||"}
+        return data
+
+
+def _wiki_provider(tmp_path: Path, wiki: _FakeWiki) -> FandomArchiveProvider:
+    http = HttpClient(
+        SqliteCache(tmp_path / "cache.sqlite3"),
+        user_agent="tvguide-app-tests/0.0",
+        rate_limiter=HostRateLimiter(sleep=lambda _s: None),
+        sleep=lambda _s: None,
+    )
+    http._get_session = lambda: wiki  # type: ignore[method-assign]  # noqa: SLF001
+    return FandomArchiveProvider(http, year=1985)
+
+
+def test_prefetch_month_fills_day_cache_in_batches(tmp_path: Path) -> None:
+    wiki = _FakeWiki(
+        {
+            "01 Marca 1985": "=== TVP 1 ===\n19.30 Dziennik",
+            "2 Marca 1985": "=== TVP 2 ===\n20.00 Teatr",
+            "Ramówka 3 marca 1985": "=== TVP 1 ===\n17.00 Teleranek",
+            "10 marca 1985": "=== TVP 1 ===\n9.00 Film",
+        },
+        {"03 Marca 1985": "Ramówka 3 marca 1985"},
+    )
+    provider = _wiki_provider(tmp_path, wiki)
+
+    days = provider.prefetch_month(1985, 3)
+    assert days == [date(1985, 3, 1), date(1985, 3, 2), date(1985, 3, 3), date(1985, 3, 10)]
+    # 80 title variants in two batches of up to 50, the first one continued.
+    assert len(wiki.calls) == 3
+    assert max(len(c["titles"][0].split("|")) for c in wiki.calls) == 50
+    assert provider._day_index is None  # noqa: SLF001
+
+    assert [s.name for s in provider.list_sources_for_day(date(1985, 3, 2))] == ["TVP 2"]
+    tvp1 = Source(provider_id=ProviderId("fandom-archive"), id=SourceId("TVP 1"), name="TVP 1")
+    assert [it.title for it in provider.get_schedule(tvp1, date(1985, 3, 3))] == ["Teleranek"]
+    assert provider.get_schedule(tvp1, date(1985, 3, 4)) == []
+    assert len(wiki.calls) == 3
+
+    # A day of another month loads that month on first use.
+    assert provider.get_schedule(tvp1, date(1985, 4, 1)) == []
+    assert len(wiki.calls) == 5
+
+
+def test_day_index_round_trip() -> None:
+    days = [date(1960, 1, 1), date(1960, 12, 31), date(1985, 3, 2)]
+    index = FandomDayIndex.from_days(days, timestamp="2026-01-01T00:00:00Z")
+    restored = FandomDayIndex.from_json(json.loads(json.dumps(index.to_json())))
+    assert restored is not None
+    assert restored.years() == [1960, 1985]
+    assert restored.days_in_year(1960) == days[:2]
+    assert restored.days_in_month(1985, 3) == [date(1985, 3, 2)]
+    assert len(restored) == 3 and date(1985, 3, 2) in restored
+    restored.discard(date(1985, 3, 2))
+    assert restored.years() == [1960]
+    assert FandomDayIndex.from_json({"v": 0}) is None
+
+
+def test_day_index_is_enumerated_once_and_updated_from_logs(tmp_path: Path) -> None:
+    wiki = _FakeWiki(
+        {
+            "01 Marca 1985": "",
+            "2 marca 1985": "",
+            "1 Stycznia 1960": "",
+            "1000 lat Polski": "",
+            "15 MARCA 1985": "",
+        },
+        {"3 Marca 1985": "Ramówka 3 marca 1985"},
+    )
+    provider = _wiki_provider(tmp_path, wiki)
+    assert provider.list_years()[0] == 1950
+
+    expected = [date(1985, 3, 1), date(1985, 3, 2), date(1985, 3, 3)]
+    assert provider.list_days_in_month(1985, 3) == expected
+    # One request per title prefix "0".."9", plus one continuation for the three "1" pages.
+    assert len(wiki.calls) == 11
+    assert provider.list_days() == expected
+    assert len(wiki.calls) == 11
+
+    # A new provider (e.g. after a restart) reads the index from the cache.
+    provider = _wiki_provider(tmp_path, wiki)
+    assert provider.list_years() == [1960, 1985]
+    assert provider.list_days_in_month(1960, 1) == [date(1960, 1, 1)]
+    assert len(wiki.calls) == 11
+
+    wiki.log = [
+        {"type": "create", "action": "create", "title": "05 Marca 1985"},
+        {"type": "delete", "action": "delete", "title": "2 marca 1985"},
+        {"type": "move", "action": "move", "title": "1 Stycznia 1960", "params": {
+            "target_title": "01 Stycznia 1960", "suppressredirect": True}},
+    ]
+    days = provider.list_days_in_month(1985, 3, force_refresh=True)
+    assert days == [date(1985, 3, 1), date(1985, 3, 3), date(1985, 3, 5)]
+    assert wiki.calls[-1]["list"] == ["logevents"]
+    assert wiki.calls[-1]["lestart"] == ["2026-10-01T00:00:00Z"]
+    assert provider.list_days_in_month(1960, 1) == [date(1960, 1, 1)]
+    assert len(wiki.calls) == 12
+
+
+def test_day_index_is_built_outside_the_lock_and_shared(tmp_path: Path) -> None:
+    wiki = _FakeWiki({"01 Marca 1985": "", "2 marca 1985": ""}, {})
+    entered = threading.Event()
+    release = threading.Event()
+    get = wiki.get
+
+    def slow_get(url: str, **kwargs) -> requests.Response:
+        entered.set()
+        release.wait(5)
+        return get(url, **kwargs)
+
+    wiki.get = slow_get  # type: ignore[method-assign]
+    provider = _wiki_provider(tmp_path, wiki)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        first = ex.submit(provider.list_days_in_month, 1985, 3)
+        assert entered.wait(5)
+        # The listing is in flight, yet the index lock is free.
+        assert provider._day_index_lock.acquire(blocking=False)  # noqa: SLF001
+        provider._day_index_lock.release()  # noqa: SLF001
+        second = ex.submit(provider.list_days_in_month, 1985, 3)
+        release.set()
+        assert first.result(5) == second.result(5) == [date(1985, 3, 1), date(1985, 3, 2)]
+    assert sum(c.get("list") == ["allpages"] for c in wiki.calls) == 10
@@ -0,0 +1,329 @@
+import io
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from tvguide_app.core.cache import SqliteCache, StalePolicy
+from tvguide_app.core.http import HttpClient
+
+
+def _response(
+    status: int, body: str = "", headers: dict[str, str] | None = None
+) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body.encode("utf-8")  # noqa: SLF001
+    resp.raw = io.BytesIO(resp._content)  # noqa: SLF001
+    resp.headers.update(headers or {})
+    resp.encoding = "utf-8"
+    resp.url = "https://example.com/"
+    return resp
+
+
+class _FakeSession:
+    def __init__(self, responses: list[requests.Response]) -> None:
+        self._responses = list(responses)
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.calls.append(("GET", url, kwargs))
+        return self._responses.pop(0)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        self.calls.append(("POST", url, kwargs))
+        return self._responses.pop(0)
+
+
+def _client(tmp_path: Path, session: _FakeSession) -> tuple[HttpClient, SqliteCache]:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    http = HttpClient(cache, user_agent="tvguide-app-tests/0.0", sleep=lambda _s: None)
+    http._get_session = lambda: session  # type: ignore[method-assign]  # noqa: SLF001
+    return http, cache
+
+
+def test_get_text_revalidates_expired_entry_with_304(tmp_path: Path) -> None:
+    session = _FakeSession(
+        [
+            _response(
+                200, "page", {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+            ),
+            _response(304),
+        ]
+    )
+    http, cache = _client(tmp_path, session)
+
+    assert http.get_text("https://example.com/", cache_key="k", ttl_seconds=60) == "page"
+    # Fresh entry: served from cache without a request.
+    assert http.get_text("https://example.com/", cache_key="k", ttl_seconds=60) == "page"
+    assert len(session.calls) == 1
+
+    cache.touch("k", ttl_seconds=-1)
+    assert http.get_text("https://example.com/", cache_key="k", ttl_seconds=60) == "page"
+    assert len(session.calls) == 2
+    headers = session.calls[1][2]["headers"]
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.get_text("k") == "page"
+
+
+def test_get_text_replaces_changed_body(tmp_path: Path) -> None:
+    session = _FakeSession([_response(200, "v1"), _response(200, "v2")])
+    http, cache = _client(tmp_path, session)
+
+    assert http.get_text("https://example.com/", cache_key="k", ttl_seconds=60) == "v1"
+    assert session.calls[0][2]["headers"] is None
+    assert (
+        http.get_text("https://example.com/", cache_key="k", ttl_seconds=60, force_refresh=True)
+        == "v2"
+    )
+    assert cache.get_text("k") == "v2"
+
+
+class _FailingSession(_FakeSession):
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.calls.append(("GET", url, kwargs))
+        raise requests.ConnectionError("down")
+
+
+def test_get_response_serves_stale_entry_on_error(tmp_path: Path) -> None:
+    session = _FailingSession([])
+    http, cache = _client(tmp_path, session)
+    cache.set_text("k", "old", ttl_seconds=-10)
+
+    resp = http.get_response(
+        "https://example.com/",
+        cache_key="k",
+        ttl_seconds=60,
+        stale_policy=StalePolicy(stale_if_error_seconds=3600),
+    )
+    assert resp.text == "old"
+    assert resp.stale is True
+
+    with pytest.raises(requests.ConnectionError):
+        http.get_text("https://example.com/", cache_key="k", ttl_seconds=60)
+
+
+def test_get_response_stale_while_revalidate_refreshes_in_background(tmp_path: Path) -> None:
+    session = _FakeSession([_response(200, "new")])
+    http, cache = _client(tmp_path, session)
+    cache.set_text("k", "old", ttl_seconds=-10)
+
+    resp = http.get_response(
+        "https://example.com/",
+        cache_key="k",
+        ttl_seconds=60,
+        stale_policy=StalePolicy(stale_while_revalidate_seconds=3600),
+    )
+    assert resp.text == "old"
+    assert resp.stale is True
+
+    deadline = time.monotonic() + 5
+    while cache.get_text("k") != "new" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get_text("k") == "new"
+
+
+class _SlowSession(_FakeSession):
+    def __init__(self, responses: list[requests.Response]) -> None:
+        super().__init__(responses)
+        self.release = threading.Event()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.release.wait(5)
+        return super().get(url, **kwargs)
+
+
+def test_identical_concurrent_requests_are_coalesced(tmp_path: Path) -> None:
+    session = _SlowSession([_response(200, "page")])
+    http, _cache = _client(tmp_path, session)
+
+    results: list[str] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                http.get_text("https://example.com/", cache_key="k", ttl_seconds=60)
+            )
+        )
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while http.coalescing_stats().merged < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    session.release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == ["page"] * 5
+    assert len(session.calls) == 1
+    assert http.coalescing_stats().merged == 4
+
+
+def test_retries_honor_retry_after_and_skip_posts_by_default(tmp_path: Path) -> None:
+    responses = [
+        _response(503, "busy", {"Retry-After": "2"}),
+        _response(500, "oops"),
+        _response(200, "ok"),
+        _response(503, "busy"),
+    ]
+    session = _FakeSession(responses)
+    slept: list[float] = []
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    http = HttpClient(cache, user_agent="t", sleep=slept.append)
+    http._get_session = lambda: session  # type: ignore[method-assign]  # noqa: SLF001
+
+    assert http.get_text("https://example.com/") == "ok"
+    assert len(session.calls) == 3
+    assert slept[0] == 2.0
+    assert 0.0 <= slept[1] <= 1.0
+    # Retried responses hand their connection back to the pool.
+    assert [r.raw.closed for r in responses[:3]] == [True, True, False]
+
+    with pytest.raises(requests.HTTPError):
+        http.post_form_text("https://example.com/form", {"a": "1"})
+    assert len(session.calls) == 4
+
+
+def test_circuit_breaker_fails_fast_and_serves_cached_data(tmp_path: Path) -> None:
+    from tvguide_app.core.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+    session = _FailingSession([])
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    http = HttpClient(
+        cache,
+        user_agent="t",
+        stale_policy=StalePolicy(stale_if_error_seconds=3600),
+        retry_policy=RetryPolicy(max_attempts=2),
+        circuit_breaker=CircuitBreaker(failure_threshold=4, reset_seconds=60),
+        sleep=lambda _s: None,
+    )
+    http._get_session = lambda: session  # type: ignore[method-assign]  # noqa: SLF001
+    cache.set_text("cached", "old", ttl_seconds=-10)
+
+    for i in range(2):
+        with pytest.raises(requests.ConnectionError):
+            http.get_text(f"https://example.com/{i}")
+    assert len(session.calls) == 4
+    assert http.circuit_stats()[0].state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        http.get_text("https://example.com/other")
+    resp = http.get_response("https://example.com/c", cache_key="cached", ttl_seconds=60)
+    assert resp.text == "old" and resp.stale is True
+    # No network calls while the circuit is open.
+    assert len(session.calls) == 4
+    assert http.circuit_stats()[0].rejected == 2
+
+
+def test_get_json_and_per_host_encoding_hint(tmp_path: Path) -> None:
+    page = requests.Response()
+    page.status_code = 200
+    page._content = "Wiadomości".encode("cp1250")  # noqa: SLF001
+    page.headers.update({"Content-Type": "text/html"})
+    page.url = "https://www.example.com/"
+    session = _FakeSession(
+        [_response(200, '{"a": [1, "ł"]}', {"Content-Type": "application/json"}), page]
+    )
+    http, _cache = _client(tmp_path, session)
+
+    first = http.get_json("https://example.com/api", cache_key="j", ttl_seconds=60)
+    assert first == {"a": [1, "ł"]}
+    # Stored as the raw bytes; cached reads share one decoded object.
+    cached = http.get_json("https://example.com/api", cache_key="j", ttl_seconds=60)
+    assert cached == first
+    assert http.get_json("https://example.com/api", cache_key="j", ttl_seconds=60) is cached
+    assert _cache.get_text("j") == '{"a": [1, "ł"]}'
+    assert len(session.calls) == 1
+
+    http.set_encoding_hint("example.com", "cp1250")
+    assert http.get_text("https://www.example.com/") == "Wiadomości"
+
+
+def _streamed(body: bytes, headers: dict[str, str] | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body  # noqa: SLF001
+    resp._content_consumed = True  # noqa: SLF001
+    resp.headers.update(headers or {})
+    resp.url = "https://example.com/feed"
+    return resp
+
+
+def test_iter_text_streams_into_cache_and_replays_it(tmp_path: Path) -> None:
+    body = '<?xml version="1.0" encoding="ISO-8859-2"?><tv>' + "<p>Zażółć</p>" * 5000 + "</tv>"
+    session = _FakeSession([_streamed(body.encode("iso-8859-2")), _streamed(b"partial")])
+    http, cache = _client(tmp_path, session)
+
+    chunks = list(
+        http.iter_text(
+            "https://example.com/feed", cache_key="feed", ttl_seconds=60, chunk_size=1000
+        )
+    )
+    assert len(chunks) > 10
+    assert "".join(chunks) == body
+    assert session.calls[0][2]["stream"] is True
+
+    entry = cache.get_entry("feed")
+    assert entry is not None and entry.value == body
+    from tvguide_app.core.cache import content_hash
+
+    assert entry.content_hash == content_hash(body)
+    assert (
+        "".join(http.iter_text("https://example.com/feed", cache_key="feed", ttl_seconds=60))
+        == body
+    )
+    assert len(session.calls) == 1
+
+    # An abandoned stream is not cached.
+    stream = http.iter_text(
+        "https://example.com/feed", cache_key="other", ttl_seconds=60, chunk_size=2
+    )
+    next(stream)
+    stream.close()
+    assert cache.get_entry("other") is None
+
+
+_parse_calls: list[str] = []
+
+
+def _count_words(text: str) -> dict[str, int]:
+    _parse_calls.append(text)
+    return {"words": len(text.split())}
+
+
+def test_get_parsed_memoizes_by_content(tmp_path: Path) -> None:
+    _parse_calls.clear()
+    session = _FakeSession(
+        [_response(200, "a b c"), _response(200, "a b c"), _response(200, "a b c d")]
+    )
+    http, cache = _client(tmp_path, session)
+
+    def get(**kwargs) -> dict[str, int]:
+        return http.get_parsed(
+            "https://example.com/", _count_words, 1, cache_key="k", ttl_seconds=60, **kwargs
+        )
+
+    assert get() == {"words": 3}
+    assert get() == {"words": 3}
+    # Refetched but unchanged: still not parsed again.
+    assert get(force_refresh=True) == {"words": 3}
+    assert len(_parse_calls) == 1
+    assert get(force_refresh=True) == {"words": 4}
+    assert len(_parse_calls) == 2
+
+    # The memo is on disk too, and a new parser version ignores it.
+    reopened = HttpClient(
+        SqliteCache(tmp_path / "cache.sqlite3"), user_agent="tvguide-app-tests/0.0"
+    )
+    assert reopened.get_parsed(
+        "https://example.com/", _count_words, 1, cache_key="k", ttl_seconds=60
+    ) == {"words": 4}
+    assert len(_parse_calls) == 2
+    assert reopened.get_parsed(
+        "https://example.com/", _count_words, 2, cache_key="k", ttl_seconds=60
+    ) == {"words": 4}
+    assert len(_parse_calls) == 3
@@ -0,0 +1,69 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from tvguide_app.core.cache import SqliteCache
+from tvguide_app.core.http import HttpClient
+from tvguide_app.core.http_transport import HttpTransport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on keep-alive.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = f"path={self.path}".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_short_lived_threads_reuse_pooled_connections(tmp_path: Path, server_url: str) -> None:
+    transport = HttpTransport(pool_size=2)
+    http = HttpClient(SqliteCache(tmp_path / "cache.sqlite3"), user_agent="t", transport=transport)
+
+    # One new thread per fetch, like _run_in_thread in the GUI.
+    for i in range(10):
+        out: list[str] = []
+        t = threading.Thread(target=lambda: out.append(http.get_text(f"{server_url}/{i}")))
+        t.start()
+        t.join(5)
+        assert out == [f"path=/{i}"]
+
+    (stats,) = http.pool_stats()
+    assert stats.host == "http://127.0.0.1"
+    assert stats.requests == 10
+    assert stats.connections == 1
+    assert stats.idle == 1
+    assert stats.maxsize == 2
+    http.close()
+
+
+def test_per_host_pool_sizes(server_url: str) -> None:
+    transport = HttpTransport(
+        pool_size=2, host_pool_sizes={"127.0.0.1:" + server_url.rsplit(":", 1)[1]: 5}
+    )
+    sess = transport.new_session()
+    assert sess.get(server_url + "/x", timeout=5).text == "path=/x"
+    assert [s.maxsize for s in transport.stats()] == [5]
+    transport.close()
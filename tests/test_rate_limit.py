@@ -0,0 +1,63 @@
+import threading
+import time
+
+from tvguide_app.core.rate_limit import HostPolicy, HostRateLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_paces() -> None:
+    now = [0.0]
+    bucket = TokenBucket(2.0, 3, clock=lambda: now[0])
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Callers queue behind each other: 0.5 s, then 1.0 s.
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    now[0] = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_limiter_caps_concurrency_per_host_and_matches_www() -> None:
+    slept: list[float] = []
+    limiter = HostRateLimiter(
+        {"example.com": HostPolicy(requests_per_second=1000.0, burst=100, max_concurrent=2)},
+        sleep=slept.append,
+    )
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work() -> None:
+        nonlocal active, peak
+        with limiter.slot("https://www.example.com/page"):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert peak == 2
+    (stats,) = limiter.stats()
+    assert (stats.host, stats.requests, stats.active, stats.max_concurrent) == (
+        "www.example.com",
+        6,
+        0,
+        2,
+    )
+    assert slept == []
+
+
+def test_limiter_sleeps_once_the_burst_is_spent() -> None:
+    slept: list[float] = []
+    limiter = HostRateLimiter({}, default=HostPolicy(1.0, 2, 4), sleep=slept.append)
+    for _ in range(3):
+        with limiter.slot("https://other.example/"):
+            pass
+    assert len(slept) == 1 and 0.9 < slept[0] <= 1.0
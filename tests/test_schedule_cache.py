@@ -0,0 +1,210 @@
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from tvguide_app.core.cache import SqliteCache, StalePolicy
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.providers.base import ScheduleProvider
+from tvguide_app.core.schedule_cache import CachedScheduleProvider, _schedule_cache_key
+from tvguide_app.core.schedule_store import ScheduleStore
+from tvguide_app.core.util import parse_time_hhmm
+
+
+class _CountingProvider(ScheduleProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fail = False
+        self.title = "Fresh"
+
+    @property
+    def provider_id(self) -> str:
+        return "p"
+
+    @property
+    def display_name(self) -> str:
+        return "P"
+
+    def list_sources(self, *, force_refresh: bool = False) -> list[Source]:
+        return []
+
+    def list_days(self, *, force_refresh: bool = False) -> list[date]:
+        return []
+
+    def get_schedule(
+        self, source: Source, day: date, *, force_refresh: bool = False
+    ) -> list[ScheduleItem]:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [
+            ScheduleItem(
+                provider_id=ProviderId("p"),
+                source=source,
+                day=day,
+                start_time=parse_time_hhmm("20:00"),
+                end_time=parse_time_hhmm("21:00"),
+                title=self.title,
+                subtitle=None,
+                details_ref=None,
+                details_summary=None,
+                accessibility=("N",),
+            )
+        ]
+
+    def get_item_details(self, item: ScheduleItem, *, force_refresh: bool = False) -> str:
+        return ""
+
+
+SOURCE = Source(provider_id=ProviderId("p"), id=SourceId("s1"), name="S1")
+DAY = date(2026, 1, 6)
+
+
+def _expire(cache: SqliteCache) -> None:
+    cache.touch(_schedule_cache_key("tv", SOURCE, DAY), ttl_seconds=-10)
+
+
+def test_cached_schedule_roundtrip(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    delegate = _CountingProvider()
+    provider = CachedScheduleProvider(delegate, cache, kind="tv", ttl_seconds=60)
+
+    first = provider.get_schedule(SOURCE, DAY)
+    second = provider.get_schedule(SOURCE, DAY)
+    assert delegate.calls == 1
+    assert second == first
+
+
+def test_cached_schedule_stale_if_error(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    delegate = _CountingProvider()
+    provider = CachedScheduleProvider(
+        delegate,
+        cache,
+        kind="tv",
+        ttl_seconds=60,
+        stale_policy=StalePolicy(stale_if_error_seconds=3600),
+    )
+    provider.get_schedule(SOURCE, DAY)
+    _expire(cache)
+    delegate.fail = True
+
+    result = provider.get_schedule_result(SOURCE, DAY)
+    assert result.stale is True and result.refresh_failed is True
+    assert [it.title for it in result.items] == ["Fresh"]
+
+    no_stale = CachedScheduleProvider(delegate, cache, kind="tv", ttl_seconds=60)
+    with pytest.raises(RuntimeError):
+        no_stale.get_schedule(SOURCE, DAY)
+
+
+def test_cached_schedule_stale_while_revalidate(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    delegate = _CountingProvider()
+    provider = CachedScheduleProvider(
+        delegate,
+        cache,
+        kind="tv",
+        ttl_seconds=60,
+        stale_policy=StalePolicy(stale_while_revalidate_seconds=3600),
+    )
+    provider.get_schedule(SOURCE, DAY)
+    _expire(cache)
+    delegate.title = "Updated"
+
+    result = provider.get_schedule_result(SOURCE, DAY)
+    assert result.stale is True and result.refresh_failed is False
+    assert result.items[0].title == "Fresh"
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        fresh = provider.get_schedule_result(SOURCE, DAY)
+        if not fresh.stale:
+            break
+        time.sleep(0.01)
+    assert fresh.stale is False
+    assert fresh.items[0].title == "Updated"
+
+
+def test_concurrent_schedule_requests_share_one_fetch(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    delegate = _CountingProvider()
+    release = threading.Event()
+    original = delegate.get_schedule
+
+    def slow_get_schedule(
+        source: Source, day: date, *, force_refresh: bool = False
+    ) -> list[ScheduleItem]:
+        release.wait(5)
+        return original(source, day, force_refresh=force_refresh)
+
+    delegate.get_schedule = slow_get_schedule  # type: ignore[method-assign]
+    provider = CachedScheduleProvider(delegate, cache, kind="tv", ttl_seconds=60)
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = [ex.submit(provider.get_schedule, SOURCE, DAY) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while provider.coalescing_stats().merged < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert delegate.calls == 1
+    assert all(r == results[0] for r in results)
+    assert provider.coalescing_stats().merged == 3
+
+
+def test_forced_refresh_does_not_join_a_plain_fetch(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    delegate = _CountingProvider()
+    entered = threading.Event()
+    release = threading.Event()
+    original = delegate.get_schedule
+
+    def slow_get_schedule(
+        source: Source, day: date, *, force_refresh: bool = False
+    ) -> list[ScheduleItem]:
+        entered.set()
+        if not force_refresh:
+            release.wait(5)
+        return original(source, day, force_refresh=force_refresh)
+
+    delegate.get_schedule = slow_get_schedule  # type: ignore[method-assign]
+    provider = CachedScheduleProvider(delegate, cache, kind="tv", ttl_seconds=60)
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        plain = ex.submit(provider.get_schedule, SOURCE, DAY)
+        assert entered.wait(5)
+        forced = ex.submit(provider.get_schedule, SOURCE, DAY, force_refresh=True)
+        forced.result(timeout=5)
+        release.set()
+        plain.result(timeout=5)
+
+    assert delegate.calls == 2
+    assert provider.coalescing_stats().merged == 0
+
+
+def test_fetched_and_cached_schedules_reach_the_schedule_store(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    delegate = _CountingProvider()
+    store = ScheduleStore(tmp_path / "schedule.sqlite3")
+    provider = CachedScheduleProvider(
+        delegate, cache, kind="tv", ttl_seconds=60, schedule_store=store
+    )
+    provider.get_schedule(SOURCE, DAY)
+    assert [it.title for it in store.query("tv", DAY, features=("N",))] == ["Fresh"]
+
+    # A store created after the schedule was cached is backfilled from the cache.
+    late_store = ScheduleStore(tmp_path / "late.sqlite3")
+    provider = CachedScheduleProvider(
+        delegate, cache, kind="tv", ttl_seconds=60, schedule_store=late_store
+    )
+    provider.get_schedule(SOURCE, DAY)
+    assert delegate.calls == 1
+    assert [it.title for it in late_store.query("tv", DAY, start_min=20 * 60 + 30)] == ["Fresh"]
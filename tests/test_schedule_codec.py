@@ -0,0 +1,88 @@
+import json
+from datetime import date
+
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId, intern_source
+from tvguide_app.core.schedule_codec import decode_schedule, encode_schedule
+from tvguide_app.core.schedule_day import ScheduleDay
+from tvguide_app.core.util import parse_time_hhmm
+
+SOURCE = Source(provider_id=ProviderId("teleman"), id=SourceId("tvp1"), name="TVP 1")
+DAY = date(2024, 1, 1)
+
+
+def _item(start: str | None, title: str, **kwargs) -> ScheduleItem:
+    return ScheduleItem(
+        provider_id=ProviderId("teleman"),
+        source=SOURCE,
+        day=DAY,
+        start_time=parse_time_hhmm(start) if start else None,
+        end_time=kwargs.pop("end", None),
+        title=title,
+        subtitle=kwargs.pop("subtitle", None),
+        details_ref=kwargs.pop("details_ref", None),
+        details_summary=kwargs.pop("details_summary", None),
+        accessibility=kwargs.pop("accessibility", ()),
+    )
+
+
+def test_round_trip_through_json() -> None:
+    items = [
+        _item(
+            "00:00",
+            "Wiadomości",
+            subtitle="",
+            details_ref="/tv/Wiadomosci-1",
+            accessibility=("AD", "N"),
+        ),
+        _item(
+            "23:59",
+            "Wiadomości",
+            end=parse_time_hhmm("00:30"),
+            details_summary="Serwis – wydanie nocne",
+        ),
+        _item(None, "Zakończenie programu", accessibility=("JM",)),
+    ]
+    data = json.loads(json.dumps(encode_schedule(items)))
+    # Each distinct string is stored once.
+    assert data["s"].count("Wiadomości") == 1
+
+    packed = decode_schedule(data, SOURCE, DAY)
+    assert packed is not None
+    assert len(packed) == 3
+    assert packed.items() == items
+    assert packed.accessibility_features() == frozenset({"AD", "JM", "N"})
+
+
+def test_invalid_documents_are_rejected() -> None:
+    valid = encode_schedule([_item("20:00", "Film")])
+    assert decode_schedule([{"title": "v1 list"}], SOURCE, DAY) is None
+    assert decode_schedule({**valid, "v": 1}, SOURCE, DAY) is None
+    assert decode_schedule({**valid, "s": [None]}, SOURCE, DAY) is None
+    assert decode_schedule({**valid, "r": valid["r"][:-1]}, SOURCE, DAY) is None
+    assert decode_schedule({**valid, "r": [-1] * 7}, SOURCE, DAY) is None
+    assert decode_schedule(encode_schedule([]), SOURCE, DAY).items() == []
+
+
+def test_schedule_day_is_a_list_view() -> None:
+    items = [
+        _item("06:00", "Kawa czy herbata?", accessibility=("N",)),
+        _item("20:00", "Film", end=parse_time_hhmm("22:00"), subtitle="odc. 1"),
+    ]
+    copy = Source(provider_id=SOURCE.provider_id, id=SOURCE.id, name=SOURCE.name)
+    day = ScheduleDay.from_items(copy, DAY, items)
+    assert len(day) == 2
+    assert list(day) == day.items() == items
+    assert day[-1] == items[1]
+    assert day[0:1] == items[:1]
+    # Equal sources and minutes of day are shared, not copied per item.
+    assert day[0].source is day[1].source is intern_source(SOURCE)
+    assert day[1].end_time is parse_time_hhmm("22:00")
+
+    favorite = Source(
+        provider_id=ProviderId("favorites"), id=SourceId("tv:teleman:tvp1"), name="TV: TVP 1"
+    )
+    wrapped = day.with_source(favorite)
+    assert [(it.provider_id, it.source, it.title) for it in wrapped] == [
+        ("favorites", favorite, "Kawa czy herbata?"),
+        ("favorites", favorite, "Film"),
+    ]
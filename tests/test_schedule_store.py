@@ -0,0 +1,107 @@
+from datetime import date, datetime
+from pathlib import Path
+
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.schedule_store import ScheduleStore
+from tvguide_app.core.util import parse_time_hhmm
+
+TVP1 = Source(provider_id=ProviderId("teleman"), id=SourceId("tvp1"), name="TVP 1")
+TVN = Source(provider_id=ProviderId("teleman"), id=SourceId("tvn"), name="TVN")
+DAY = date(2026, 1, 6)
+
+
+def _item(source: Source, start: str, title: str, **kwargs) -> ScheduleItem:
+    return ScheduleItem(
+        provider_id=ProviderId("teleman"),
+        source=source,
+        day=DAY,
+        start_time=parse_time_hhmm(start),
+        end_time=parse_time_hhmm(kwargs.pop("end")) if "end" in kwargs else None,
+        title=title,
+        subtitle=kwargs.pop("subtitle", None),
+        details_ref=kwargs.pop("details_ref", None),
+        details_summary=None,
+        accessibility=kwargs.pop("accessibility", ()),
+    )
+
+
+def _fill(store: ScheduleStore) -> None:
+    store.replace_day(
+        "tv",
+        TVP1,
+        DAY,
+        [
+            _item(TVP1, "19:30", "Wiadomości", details_ref="/tv/wiadomosci"),
+            _item(TVP1, "20:05", "Film", accessibility=("AD", "N")),
+            _item(TVP1, "23:40", "Kino nocne"),
+            _item(TVP1, "01:30", "Zakończenie", end="02:00"),
+        ],
+    )
+    store.replace_day(
+        "tv",
+        TVN,
+        DAY,
+        [
+            _item(TVN, "19:00", "Fakty", end="19:45"),
+            _item(TVN, "20:00", "Serial", accessibility=("N",)),
+        ],
+    )
+
+
+def test_queries_across_stations(tmp_path: Path) -> None:
+    store = ScheduleStore(tmp_path / "schedule.sqlite3", write_behind=True)
+    _fill(store)
+
+    at_20 = store.on_air("tv", datetime(2026, 1, 6, 20, 0))
+    assert [(it.source.name, it.title) for it in at_20] == [
+        ("TVN", "Serial"),
+        ("TVP 1", "Wiadomości"),
+    ]
+    assert at_20[1].details_ref == "/tv/wiadomosci"
+    assert at_20[1].start_time == parse_time_hhmm("19:30")
+
+    # Fakty ended at 19:45, so nothing is on TVN at 19:50.
+    assert [it.title for it in store.on_air("tv", datetime(2026, 1, 6, 19, 50))] == ["Wiadomości"]
+    # After midnight the previous broadcast day still applies.
+    assert [it.title for it in store.on_air("tv", datetime(2026, 1, 7, 1, 45))] == ["Zakończenie"]
+
+    evening = store.query("tv", DAY, start_min=20 * 60, end_min=23 * 60, features=("N",))
+    assert [it.title for it in evening] == ["Serial", "Film"]
+    assert [it.title for it in store.query("tv", DAY, sources=[TVN])] == ["Fakty", "Serial"]
+    assert store.query("radio", DAY) == []
+    store.close()
+
+
+def test_replace_day_and_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "schedule.sqlite3"
+    store = ScheduleStore(path)
+    _fill(store)
+    store.replace_day("tv", TVN, DAY, [_item(TVN, "21:00", "Nowy program")])
+    store.close()
+
+    reopened = ScheduleStore(path)
+    assert reopened.has_day("tv", TVN, DAY)
+    assert not reopened.has_day("tv", TVN, date(2026, 1, 7))
+    assert [it.title for it in reopened.query("tv", DAY, sources=[TVN])] == ["Nowy program"]
+    assert len(reopened.query("tv", DAY)) == 5
+    reopened.close()
+
+
+def test_failed_write_does_not_leave_a_cached_source_id(tmp_path: Path) -> None:
+    store = ScheduleStore(tmp_path / "schedule.sqlite3", write_behind=True)
+    intern_titles = store._intern_titles  # noqa: SLF001
+
+    def broken(_conn, _titles):
+        raise RuntimeError("disk full")
+
+    store._intern_titles = broken  # type: ignore[method-assign]  # noqa: SLF001
+    store.replace_day("tv", TVP1, DAY, [_item(TVP1, "19:30", "Wiadomości")])
+    store.flush()
+    assert not store.has_day("tv", TVP1, DAY)
+
+    # TVN now gets the id the rolled-back TVP 1 row had; TVP 1 must not reuse it.
+    store._intern_titles = intern_titles  # type: ignore[method-assign]  # noqa: SLF001
+    _fill(store)
+    assert [it.title for it in store.query("tv", DAY, sources=[TVN])] == ["Fakty", "Serial"]
+    assert store.query("tv", DAY, sources=[TVP1])[0].title == "Wiadomości"
+    store.close()
@@ -0,0 +1,35 @@
+from datetime import date
+from pathlib import Path
+
+from tvguide_app.core.models import ProviderId, ScheduleItem, Source, SourceId
+from tvguide_app.core.search_index import SearchIndex
+from tvguide_app.core.util import parse_time_hhmm
+
+
+def _item(title: str, start: str) -> ScheduleItem:
+    source = Source(provider_id=ProviderId("teleman"), id=SourceId("tvp-1"), name="TVP 1")
+    return ScheduleItem(
+        provider_id=ProviderId("teleman"),
+        source=source,
+        day=date(2026, 1, 6),
+        start_time=parse_time_hhmm(start),
+        end_time=None,
+        title=title,
+        subtitle=None,
+        details_ref=None,
+        details_summary=None,
+    )
+
+
+def test_search_index_write_behind(tmp_path: Path) -> None:
+    path = tmp_path / "search.sqlite3"
+    index = SearchIndex(path, write_behind=True)
+    index.add_items("tv", [_item("Wiadomości", "19:30"), _item("Sport", "20:05")])
+    index.add_items("tv", [_item("Pogoda", "20:00")])
+
+    results = index.search("wiad", kinds={"tv"})
+    assert [r.title for r in results] == ["Wiadomości"]
+    index.close()
+
+    reopened = SearchIndex(path)
+    assert len(reopened.search("o", kinds={"tv"})) == 3
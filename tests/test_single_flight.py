@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from tvguide_app.core.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution_and_its_error() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def slow() -> int:
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    results: list[int] = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    assert started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(4)
+    ]
+    for t in followers:
+        t.start()
+    deadline = time.monotonic() + 5
+    while flight.stats().merged < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert results == [42] * 5
+    assert len(runs) == 1
+    stats = flight.stats()
+    assert (stats.executed, stats.merged, stats.in_flight) == (1, 4, 0)
+
+    def boom() -> int:
+        raise ValueError("x")
+
+    with pytest.raises(ValueError):
+        flight.do("k", boom)
+    # Finished calls are not remembered.
+    assert flight.do("k", lambda: 7) == 7
@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from tvguide_app.core.sqlite_pool import ReadConnectionPool
+
+
+def test_failed_opens_give_their_slot_back(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = ReadConnectionPool(tmp_path / "db.sqlite3", size=1)
+    connect = pool._connect  # noqa: SLF001
+
+    def broken() -> sqlite3.Connection:
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(pool, "_connect", broken)
+    for _ in range(3):
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection():
+                pass
+
+    monkeypatch.setattr(pool, "_connect", connect)
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    pool.close()
+
+
+def test_close_wakes_readers_waiting_for_a_connection(tmp_path: Path) -> None:
+    pool = ReadConnectionPool(tmp_path / "db.sqlite3", size=1)
+    errors: list[BaseException] = []
+
+    def wait_for_connection() -> None:
+        try:
+            with pool.connection():
+                pass
+        except sqlite3.ProgrammingError as e:
+            errors.append(e)
+
+    with pool.connection():
+        waiter = threading.Thread(target=wait_for_connection)
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()
+        pool.close()
+        waiter.join(5)
+    assert not waiter.is_alive()
+    assert len(errors) == 1
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from tvguide_app.core.streaming import iter_json_array, iter_xml_elements
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_iter_json_array_handles_every_chunk_boundary() -> None:
+    items = [{"title": "Wiadomości", "start": "20:00"}, 123, "a,]b", [1, [2]], None, 4.5]
+    doc = " [ " + " , ".join(json.dumps(x, ensure_ascii=False) for x in items) + " ] "
+    for size in range(1, len(doc) + 1):
+        assert list(iter_json_array(_chunks(doc, size))) == items
+
+    assert list(iter_json_array(["[]"])) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(['{"a": 1}']))
+    with pytest.raises(ValueError):
+        list(iter_json_array(["[1, 2"]))
+
+
+def test_iter_json_array_yields_before_the_document_ends() -> None:
+    def feed():
+        yield '[{"a": 1}, '
+        raise AssertionError("read too far")
+
+    assert next(iter_json_array(feed())) == {"a": 1}
+
+
+def test_iter_xml_elements_streams_programmes() -> None:
+    doc = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<tv xmlns="urn:x"><channel id="tvp1"/>'
+        + "".join(
+            f'<programme start="{h:02d}00"><title>Program {h}</title></programme>'
+            for h in range(24)
+        )
+        + "</tv>"
+    )
+    seen = [
+        (el.get("start"), el.findtext("{urn:x}title"))
+        for el in iter_xml_elements(_chunks(doc, 17), "programme")
+    ]
+    assert seen == [(f"{h:02d}00", f"Program {h}") for h in range(24)]
@@ -1,3 +1,5 @@
+import pytest
+
 from tvguide_app.core.providers.teleman import (
     parse_teleman_show_details,
     parse_teleman_station_schedule,
@@ -5,37 +7,80 @@ from tvguide_app.core.providers.teleman import (
 )
 
 
+STATIONS_HTML = """
+<nav id="stations-index">
+  <a href="/program-tv/stacje/TVP-1">TVP 1</a>
+  <a href="/program-tv/stacje/TVP-2">TVP 2</a>
+</nav>
+"""
+
+SCHEDULE_HTML = """
+<ul class="stationItems">
+  <li id="prog1"><em>15:05</em><div class="detail">
+    <a href="/tv/Test-1-123">Test 1</a>
+    <p class="genre">serial</p>
+    <p>Opis 1</p>
+  </div></li>
+  <li id="prog2"><em>16:05</em><div class="detail">
+    <a href="/tv/Test-2-456">Test 2</a>
+    <p class="genre">film</p>
+  </div></li>
+</ul>
+"""
+
+# Markup the two engines could plausibly disagree on.
+TRICKY_HTML = """<?xml version="1.0" encoding="utf-8"?>
+<nav id="stations-index">
+  <a href="/program-tv/stacje/TVN">TVN <!-- logo --><span>HD</span></a>
+  <a href="/program-tv/stacje/TVN">TVN (duplikat)</a>
+  <a href="/program-tv/stacje/">bez slugu</a>
+  <a href="/inne/link">Inne</a>
+</nav>
+<ul class="other"><li id="prog0"><div class="detail"><a href="/x">Nie ta lista</a></div></li></ul>
+<ul class=" stationItems wide">
+  <li id="prog1"><em> 6.30 </em><div class="detail">
+    <a>bez linku</a><a href="">Pusty &amp;amp; link<script>track()</script></a>
+    <p></p><p class="genre x">magazyn<style>.a{}</style></p><p class="genre">drugi</p>
+    <div><p> Opis <b>pogrubiony</b>&nbsp;tekst </p></div>
+  </div></li>
+  <li id="prog2"><em>xx</em><div class="nodetail"><a href="/tv/y">Pominięty</a></div></li>
+  <li id="xprog3"><em>20:00</em><div class="detail"><a href="/tv/z">Zły identyfikator</a></div></li>
+  <li id="prog4"><div class="detail"><p>Tylko opis<ruby>r<rt>rt</rt></ruby></p></div></li>
+</ul>
+"""
+
+
 def test_parse_teleman_stations() -> None:
-    html = """
-    <nav id="stations-index">
-      <a href="/program-tv/stacje/TVP-1">TVP 1</a>
-      <a href="/program-tv/stacje/TVP-2">TVP 2</a>
-    </nav>
-    """
-    stations = parse_teleman_stations(html)
+    stations = parse_teleman_stations(STATIONS_HTML)
     assert ("TVP-1", "TVP 1") in stations
 
 
 def test_parse_teleman_station_schedule() -> None:
-    html = """
-    <ul class="stationItems">
-      <li id="prog1"><em>15:05</em><div class="detail">
-        <a href="/tv/Test-1-123">Test 1</a>
-        <p class="genre">serial</p>
-        <p>Opis 1</p>
-      </div></li>
-      <li id="prog2"><em>16:05</em><div class="detail">
-        <a href="/tv/Test-2-456">Test 2</a>
-        <p class="genre">film</p>
-      </div></li>
-    </ul>
-    """
-    items = parse_teleman_station_schedule(html)
+    items = parse_teleman_station_schedule(SCHEDULE_HTML)
     assert len(items) == 2
     assert items[0].title == "Test 1"
     assert items[0].subtitle == "serial"
 
 
+# The XML declaration in TRICKY_HTML makes BeautifulSoup warn.
+@pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+def test_lxml_engine_matches_soup() -> None:
+    for html in (STATIONS_HTML, SCHEDULE_HTML, TRICKY_HTML, ""):
+        assert parse_teleman_stations(html, engine="lxml") == parse_teleman_stations(
+            html, engine="soup"
+        )
+        fast = [vars(it) for it in parse_teleman_station_schedule(html, engine="lxml")]
+        assert fast == [vars(it) for it in parse_teleman_station_schedule(html, engine="soup")]
+
+    stations = parse_teleman_stations(TRICKY_HTML)
+    assert stations == [("TVN", "TVN HD")]
+    items = parse_teleman_station_schedule(TRICKY_HTML)
+    assert [(it.title, it.subtitle, it.summary, it.details_ref) for it in items] == [
+        ("Pusty & link", "magazyn", "Opis pogrubiony tekst", ""),
+        ("Tylko opis r", None, "Tylko opis r", None),
+    ]
+
+
 def test_parse_teleman_show_details() -> None:
     html = """
     <div class="section"><h2>Opis</h2><p>To jest opis.</p></div>
@@ -0,0 +1,35 @@
+from tvguide_app.core.text_encoding import decode_body, sniff_declared_encoding
+
+PL = "Zażółć gęślą jaźń"
+
+
+def test_header_charset_wins() -> None:
+    assert decode_body(PL.encode("iso-8859-2"), content_type="text/html; charset=ISO-8859-2") == PL
+
+
+def test_declared_encoding_in_document_head() -> None:
+    html = f'<html><head><meta charset="windows-1250"></head><body>{PL}</body></html>'
+    assert decode_body(html.encode("cp1250"), content_type="text/html") == html
+
+    http_equiv = '<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-2">'
+    assert sniff_declared_encoding(http_equiv.encode("ascii")) == "iso8859-2"
+
+    xml = f'<?xml version="1.0" encoding="ISO-8859-2"?><tv>{PL}</tv>'
+    assert decode_body(xml.encode("iso-8859-2")) == xml
+
+    assert decode_body("﻿".encode("utf-8") + PL.encode("utf-8")) == PL
+
+
+def test_meta_tag_beyond_sniff_window_is_ignored() -> None:
+    html = "<html>" + " " * 5000 + '<meta charset="iso-8859-2">'
+    assert sniff_declared_encoding(html.encode("ascii")) is None
+
+
+def test_hint_then_utf8_then_detection() -> None:
+    body = "Program telewizyjny na dziś: Wiadomości, Teleexpress, Pogoda, Sport. " * 50
+    assert decode_body(body.encode("cp1250"), hint="cp1250") == body
+    # Valid UTF-8 needs no detection.
+    assert decode_body(body.encode("utf-8")) == body
+    # Not UTF-8, no declaration: statistical detection on the head still yields text.
+    decoded = decode_body(body.encode("cp1250"))
+    assert "�" not in decoded
@@ -0,0 +1,38 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from tvguide_app.core.write_behind import WriteBehindQueue
+
+
+def test_failing_op_is_rolled_back_alone_and_reported(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "db.sqlite3", check_same_thread=False)
+    conn.execute("CREATE TABLE t (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+    conn.commit()
+    writer = WriteBehindQueue(conn, threading.RLock(), flush_interval_seconds=10.0)
+    results: dict[str, BaseException | None] = {}
+
+    def insert(k: str, v: str | None):
+        def op(c: sqlite3.Connection) -> None:
+            c.execute("INSERT INTO t(k, v) VALUES(?, ?)", (k, "x"))
+            # The second statement fails after the first one succeeded.
+            c.execute("UPDATE t SET v = ? WHERE k = ?", (v, k))
+
+        return op
+
+    for k, v in (("a", "1"), ("b", None), ("c", "3")):
+        writer.submit(insert(k, v), on_done=lambda e, k=k: results.__setitem__(k, e))
+    writer.flush()
+
+    assert conn.execute("SELECT k, v FROM t ORDER BY k").fetchall() == [("a", "1"), ("c", "3")]
+    assert results["a"] is None and results["c"] is None
+    assert isinstance(results["b"], sqlite3.IntegrityError)
+    stats = writer.stats()
+    assert (stats.batches, stats.ops, stats.errors) == (1, 2, 1)
+
+    writer.close()
+    errors: list[BaseException | None] = []
+    writer.submit(insert("d", None), on_done=errors.append)
+    assert isinstance(errors[0], sqlite3.IntegrityError)
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+    conn.close()